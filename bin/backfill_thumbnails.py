@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+#resolve the path to the 'python' directory containing sceneConstructorPackage
+script_dir = Path(__file__).resolve().parent
+package_path = str(script_dir.parent / 'python')
+
+# Add the 'python' directory to sys.path if it's not already there
+if package_path not in sys.path:
+    sys.path.append(package_path)
+
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.publish_journal import PublishJournal
+from sceneConstructorPackage.core.publish_scanner import SKIPPED_DEPARTMENTS
+from sceneConstructorPackage.utils.thumbnailUtils import backfill_meta
+
+
+def iter_meta_files(root: Path):
+    """Every <asset>/<department>/PUBLISH/<version>/*_meta.json under root."""
+    for asset in os.scandir(root):
+        if not asset.is_dir() or asset.name.startswith('.'):
+            continue
+        for department in os.scandir(asset.path):
+            if not department.is_dir() or department.name in SKIPPED_DEPARTMENTS:
+                continue
+            publish_dir = os.path.join(department.path, "PUBLISH")
+            if not os.path.isdir(publish_dir):
+                continue
+            for version in os.scandir(publish_dir):
+                if not version.is_dir():
+                    continue
+                for entry in os.scandir(version.path):
+                    if entry.name.endswith("_meta.json") and not entry.name.startswith('.'):
+                        yield entry.path
+                        break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Write small/medium thumbnails and placeholders for existing publishes."
+    )
+    parser.add_argument('--root', type=Path, default=config.ASSET_PUBLISH_ROOT,
+                        help="publish root to walk (default: ASSET_PUBLISH_ROOT)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                        help="number of worker processes")
+    parser.add_argument('--force', action='store_true',
+                        help="regenerate thumbnails that already exist")
+    args = parser.parse_args(argv)
+
+    meta_files = list(iter_meta_files(args.root))
+    print(f"[INFO] {len(meta_files)} publishes under {args.root}")
+
+    journal = PublishJournal(config.PUBLISH_JOURNAL_PATH)
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+
+    # decoding and scaling is CPU bound, so processes rather than threads
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(backfill_meta, path, args.force): path for path in meta_files}
+        for future in as_completed(futures):
+            try:
+                status, meta = future.result()
+            except Exception as e:
+                print(f"[ERROR] {futures[future]}: {e}")
+                status, meta = 'failed', None
+            counts[status] += 1
+
+            if status == 'done':
+                print(f"[OK] {futures[future]}")
+                # running sessions pick the new meta up from the journal
+                # (<asset>/<department>/PUBLISH/<version>/<meta>: older metas have no name)
+                version_dir = Path(futures[future]).parent
+                try:
+                    journal.append({
+                        "event": "meta",
+                        "name": version_dir.parents[2].name,
+                        "department": version_dir.parents[1].name,
+                        "version": version_dir.name,
+                        "meta": meta,
+                    })
+                except (OSError, TimeoutError) as e:
+                    print(f"[WARN] Could not write publish journal: {e}")
+
+    print(f"[INFO] Thumbnails written: {counts['done']}, skipped: {counts['skipped']}, failed: {counts['failed']}")
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+
+import argparse
+import sys
+from pathlib import Path
+
+#resolve the path to the 'python' directory containing sceneConstructorPackage
+script_dir = Path(__file__).resolve().parent
+package_path = str(script_dir.parent / 'python')
+
+# Add the 'python' directory to sys.path if it's not already there
+if package_path not in sys.path:
+    sys.path.append(package_path)
+
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.utils.thumbnailAtlas import update_atlas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build or incrementally update the per actor type thumbnail atlases."
+    )
+    parser.add_argument('--root', type=Path, default=config.ATLAS_ROOT,
+                        help="where the atlases are written (default: ATLAS_ROOT)")
+    parser.add_argument('--force', action='store_true',
+                        help="repaint every tile instead of only new or changed ones")
+    parser.add_argument('types', nargs='*',
+                        help="actor types to build (default: every type found)")
+    args = parser.parse_args(argv)
+
+    actors_by_type = {}
+    for actor in DataManager().load_actors():
+        actors_by_type.setdefault(actor.get('type'), []).append(actor)
+
+    failed = False
+    for actor_type in args.types or sorted(t for t in actors_by_type if t):
+        if update_atlas(actor_type, actors_by_type.get(actor_type, []), root=args.root, force=args.force) is None:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
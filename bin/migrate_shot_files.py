@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+#resolve the path to the 'python' directory containing sceneConstructorPackage
+script_dir = Path(__file__).resolve().parent
+package_path = str(script_dir.parent / 'python')
+
+# Add the 'python' directory to sys.path if it's not already there
+if package_path not in sys.path:
+    sys.path.append(package_path)
+
+from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.core.shot_refs import (
+    FORMAT_FULL, FORMAT_REFS, compact_shot_data, expand_shot_data, file_format
+)
+from sceneConstructorPackage.core.utils import atomic_write_json
+
+
+def iter_shot_files(data_manager: DataManager, scenes: list):
+    for scene in scenes or data_manager.get_scenes():
+        for shot in data_manager.get_shots_in_scene(scene):
+            path = data_manager.find_shot_json(scene, shot)
+            if path.exists():
+                yield scene, shot, path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rewrite shot JSON files as version references ('refs') or full meta copies ('full'). "
+                    "Run it while nobody is editing the shots."
+    )
+    parser.add_argument('--to', choices=(FORMAT_REFS, FORMAT_FULL), default=FORMAT_REFS,
+                        help="target format (default: refs)")
+    parser.add_argument('--dry-run', action='store_true', help="report the size change without writing")
+    parser.add_argument('scenes', nargs='*', help="scenes to migrate (default: all)")
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager()
+    data_manager.load_actors() # brings the catalog up to date, so references resolve without disk reads
+
+    counts = {'migrated': 0, 'unchanged': 0, 'failed': 0}
+    bytes_before = bytes_after = 0
+    for scene, shot, path in iter_shot_files(data_manager, args.scenes):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[ERROR] Could not read {path}: {e}")
+            counts['failed'] += 1
+            continue
+
+        full = expand_shot_data(data, data_manager.resolve_versions)
+        if args.to == FORMAT_REFS:
+            target = compact_shot_data(full, data_manager.resolve_versions)
+        else:
+            target = full
+        if target == data:
+            counts['unchanged'] += 1
+            continue
+
+        size = os.path.getsize(path)
+        new_size = len(json.dumps(target, indent=4))
+        bytes_before += size
+        bytes_after += new_size
+        print(f"[INFO] {scene}/{shot}: {file_format(data)} -> {args.to}, {size} -> {new_size} bytes")
+        if not args.dry_run:
+            try:
+                atomic_write_json(path, target, indent=4)
+            except OSError as e:
+                print(f"[ERROR] Could not write {path}: {e}")
+                counts['failed'] += 1
+                continue
+        counts['migrated'] += 1
+
+    print(f"[INFO] {'Would migrate' if args.dry_run else 'Migrated'} {counts['migrated']} shots "
+          f"({bytes_before} -> {bytes_after} bytes), unchanged: {counts['unchanged']}, failed: {counts['failed']}")
+    data_manager.save_queue.close()
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
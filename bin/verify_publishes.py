@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+#resolve the path to the 'python' directory containing sceneConstructorPackage
+script_dir = Path(__file__).resolve().parent
+package_path = str(script_dir.parent / 'python')
+
+# Add the 'python' directory to sys.path if it's not already there
+if package_path not in sys.path:
+    sys.path.append(package_path)
+
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.publish_manifest import (
+    STATUS_NO_MANIFEST, STATUS_OK, check_files, has_meta, iter_version_dirs, read_manifest, version_status
+)
+from sceneConstructorPackage.core.publish_pipeline import file_checksum
+
+
+def log(message: str, quiet: bool):
+    # with --json stdout carries the report only
+    print(message, file=sys.stderr if quiet else sys.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check every published version against its manifest (sizes and sha256 digests)."
+    )
+    parser.add_argument('--root', type=Path, default=config.ASSET_PUBLISH_ROOT,
+                        help="publish root to walk (default: ASSET_PUBLISH_ROOT)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                        help="number of hashing processes")
+    parser.add_argument('--fast', action='store_true',
+                        help="compare sizes and mtimes only, without hashing")
+    parser.add_argument('--json', action='store_true',
+                        help="print a JSON report on stdout")
+    args = parser.parse_args(argv)
+
+    # stat pass: cheap, done here; the hashing is handed to the process pool
+    versions = {}
+    hash_jobs = []
+    for version_dir in iter_version_dirs(args.root):
+        manifest = read_manifest(version_dir)
+        problems, to_hash = check_files(version_dir, manifest, args.fast) if manifest else ({}, [])
+        versions[version_dir] = (has_meta(version_dir), manifest, problems)
+        hash_jobs.extend((version_dir, name) for name in to_hash)
+    log(f"[INFO] {len(versions)} versions under {args.root}, {len(hash_jobs)} files to hash", args.json)
+
+    if hash_jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {pool.submit(file_checksum, version_dir / name): (version_dir, name)
+                       for version_dir, name in hash_jobs}
+            for future in as_completed(futures):
+                version_dir, name = futures[future]
+                _, manifest, problems = versions[version_dir]
+                try:
+                    checksum = future.result()
+                except OSError as e:
+                    problems[name] = f"unreadable: {e}"
+                    continue
+                if checksum != manifest["files"][name].get("sha256"):
+                    problems[name] = "checksum mismatch"
+
+    report = []
+    for version_dir in sorted(versions):
+        meta_found, manifest, problems = versions[version_dir]
+        status = version_status(meta_found, manifest, problems)
+        report.append({
+            "asset": version_dir.parents[2].name,
+            "department": version_dir.parents[1].name,
+            "version": version_dir.name,
+            "path": str(version_dir),
+            "status": status,
+            "problems": dict(sorted(problems.items())),
+        })
+        # versions published before manifests existed have nothing to check against: counted below only
+        if status not in (STATUS_OK, STATUS_NO_MANIFEST):
+            log(f"[ERROR] {version_dir}: {status} {problems or ''}", args.json)
+
+    counts = {}
+    for entry in report:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    if args.json:
+        json.dump({"root": str(args.root), "mode": "fast" if args.fast else "full",
+                   "counts": counts, "versions": report}, sys.stdout, indent=2)
+        print()
+    if counts.get(STATUS_NO_MANIFEST):
+        log(f"[INFO] {counts[STATUS_NO_MANIFEST]} versions have no manifest (published before manifests "
+            f"were written) and were not checked", args.json)
+    log("[INFO] " + ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())), args.json)
+
+    # versions published before manifests existed are not failures
+    return 1 if any(entry["status"] not in (STATUS_OK, STATUS_NO_MANIFEST) for entry in report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
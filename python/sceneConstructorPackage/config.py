@@ -25,7 +25,92 @@ ASSET_PUBLISH_ROOT = Path(os.environ.get('ASSET_PUBLISH_ROOT', r'O:\30_assets'))
 # Root for authors/users (used in the publisher UI)
 AUTHORS_ROOT = Path(os.environ.get('AUTHORS_ROOT', r'C:\Users\Dolapo\Desktop\python\static\00_pipeline\userPrefs'))
 
+# Root for per-user local caches (asset catalog, thumbnails...). Keep this on a local disk.
+CACHE_ROOT = Path(os.environ.get('SCENE_CONSTRUCTOR_CACHE', Path.home() / '.sceneConstructor'))
+
+# SQLite catalog of parsed publish metadata for ASSET_PUBLISH_ROOT
+ASSET_CATALOG_PATH = CACHE_ROOT / 'asset_catalog.db'
+
+# Number of threads used to scan ASSET_PUBLISH_ROOT (I/O bound, so more than the CPU count is fine)
+SCAN_WORKERS = int(os.environ.get('SCENE_CONSTRUCTOR_SCAN_WORKERS', 8))
+
+# Append-only log of publishes that running sessions tail instead of rescanning
+PUBLISH_JOURNAL_PATH = ASSET_PUBLISH_ROOT / '.publish_journal.jsonl'
+
+# How often sessions read new journal entries (ms), and how often they still do a
+# full reconciliation scan of ASSET_PUBLISH_ROOT (seconds)
+JOURNAL_POLL_INTERVAL_MS = int(os.environ.get('SCENE_CONSTRUCTOR_JOURNAL_POLL_MS', 5000))
+RECONCILE_INTERVAL = int(os.environ.get('SCENE_CONSTRUCTOR_RECONCILE_INTERVAL', 900))
+
+# Filesystem watcher over SCENE_ROOT and ASSET_PUBLISH_ROOT:
+# 'auto' (native events on local disks, polling on network mounts), 'native', 'poll' or 'off'
+WATCHER_MODE = os.environ.get('SCENE_CONSTRUCTOR_WATCHER', 'auto')
+WATCHER_POLL_INTERVAL_MS = int(os.environ.get('SCENE_CONSTRUCTOR_WATCHER_POLL_MS', 3000))
+WATCHER_DEBOUNCE_MS = 500 # quiet period before a burst of events is handled as one update
+WATCHER_MAX_NATIVE_PATHS = 4000 # above this, polling is used (inotify watch limits)
+
+# Number of parsed shot JSON documents kept in memory
+SHOT_CACHE_SIZE = 64
+
+# Quiet period before queued shot edits are written to disk (ms)
+SHOT_SAVE_DELAY_MS = int(os.environ.get('SCENE_CONSTRUCTOR_SAVE_DELAY_MS', 750))
+
+# 'full' writes a copy of each asset's publish meta into the shot JSON, 'refs' only
+# (name, department, version) resolved against the catalog on load; both formats are read
+SHOT_FILE_FORMAT = os.environ.get('SCENE_CONSTRUCTOR_SHOT_FORMAT', 'full')
+
+# Shot JSON files from this size on (multi-shot files) are read and saved one shot at a time,
+# through an offset index kept in a hidden sidecar; smaller ones are read and written whole
+SHOT_PARTIAL_IO_BYTES = int(os.environ.get('SCENE_CONSTRUCTOR_SHOT_PARTIAL_IO_BYTES', 1024 * 1024))
+
+# Shot saves appended as edit records to <shot json stem>.edits.jsonl instead of rewriting the JSON
+# (off unless SCENE_CONSTRUCTOR_SHOT_EDIT_LOG=1); folded back into the JSON after this many records
+SHOT_EDIT_LOG = os.environ.get('SCENE_CONSTRUCTOR_SHOT_EDIT_LOG', '0') == '1'
+SHOT_EDIT_LOG_COMPACT_RECORDS = int(os.environ.get('SCENE_CONSTRUCTOR_SHOT_LOG_COMPACT', 200))
+
+# Snapshot thumbnails: longest edge in pixels, local disk cache, and in-memory budget (MB)
+THUMBNAIL_SIZE = int(os.environ.get('SCENE_CONSTRUCTOR_THUMBNAIL_SIZE', 512))
+THUMBNAIL_CACHE_DIR = CACHE_ROOT / 'thumbnails'
+THUMBNAIL_DISK_CACHE_MB = int(os.environ.get('SCENE_CONSTRUCTOR_THUMBNAIL_DISK_MB', 512))
+THUMBNAIL_MEMORY_MB = int(os.environ.get('SCENE_CONSTRUCTOR_THUMBNAIL_MEMORY_MB', 64))
+
+# Thumbnails written next to the snapshot at publish time (longest edge in pixels),
+# and the size of the tiny placeholder image embedded in the _meta.json
+THUMBNAIL_SIZES = {'small': 128, 'medium': 512}
+THUMBNAIL_JPEG_QUALITY = 85
+THUMBNAIL_PLACEHOLDER_SIZE = 16
+
+# Per actor type atlas of the latest thumbnails, read by the browser as one file per type
+ATLAS_ROOT = Path(os.environ.get('SCENE_CONSTRUCTOR_ATLAS_ROOT', ASSET_PUBLISH_ROOT / '.atlas'))
+ATLAS_CELL_SIZE = 64 # pixels, tiles are letterboxed into square cells
+ATLAS_COLUMNS = 64
+ATLAS_JPEG_QUALITY = 90
+
+# Quiet period after typing an actor name before its next version is looked up (ms)
+VERSION_DEBOUNCE_MS = 300
+
+# Staged publishes: local export dir, parallel copies to the share, and whether each
+# copy is read back and checksummed before the version is renamed into place
+PUBLISH_SCRATCH_ROOT = CACHE_ROOT / 'publish_scratch'
+PUBLISH_TRANSFER_WORKERS = int(os.environ.get('SCENE_CONSTRUCTOR_PUBLISH_WORKERS', 4))
+PUBLISH_VERIFY_TRANSFER = os.environ.get('SCENE_CONSTRUCTOR_PUBLISH_VERIFY', '1') != '0'
+# a version reservation not refreshed for this long (or held by a dead process) is freed again
+PUBLISH_RESERVATION_STALE_SECONDS = float(os.environ.get('SCENE_CONSTRUCTOR_RESERVATION_STALE', 600))
+
+# Optional content-addressed store: identical publish files are kept once and hard-linked
+# into the version dirs (off unless SCENE_CONSTRUCTOR_PUBLISH_DEDUP=1)
+PUBLISH_DEDUPLICATE = os.environ.get('SCENE_CONSTRUCTOR_PUBLISH_DEDUP', '0') == '1'
+BLOB_STORE_ROOT = Path(os.environ.get('SCENE_CONSTRUCTOR_BLOB_ROOT', ASSET_PUBLISH_ROOT / '.blobs'))
+
+# Local copies of published assets for shot imports (ShotLoaderUI), least recently used evicted first
+ASSET_CACHE_ENABLED = os.environ.get('SCENE_CONSTRUCTOR_ASSET_CACHE', '1') != '0'
+ASSET_CACHE_DIR = Path(os.environ.get('SCENE_CONSTRUCTOR_ASSET_CACHE_DIR', CACHE_ROOT / 'assets'))
+ASSET_CACHE_MAX_GB = float(os.environ.get('SCENE_CONSTRUCTOR_ASSET_CACHE_GB', 20))
+ASSET_CACHE_WORKERS = int(os.environ.get('SCENE_CONSTRUCTOR_ASSET_CACHE_WORKERS', 4))
+ASSET_CACHE_EXTENSIONS = ('.mb', '.ma', '.abc', '.fbx', '.obj')
+
 # Create necessary directories if they don't exist (helpful for first run)
 JSON_PATH_ROOT.mkdir(exist_ok=True)
 AUTHORS_ROOT.mkdir(exist_ok=True)
-ASSET_PUBLISH_ROOT.mkdir(exist_ok=True)
\ No newline at end of file
+ASSET_PUBLISH_ROOT.mkdir(exist_ok=True)
+CACHE_ROOT.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .. import config
+from .publish_pipeline import copy_with_checksum
+
+
+class LocalAssetCache:
+    """
+    Local copies of published asset files, so loading a shot reads each rig from the share
+    only once. Entries are keyed by the sha256 recorded in the publish meta when there is one
+    (no network stat needed), else by source path + size + mtime.
+    Least recently used entries are evicted once the cache grows past max_bytes.
+    Several Maya sessions can share the cache: entries are written through a temp file.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes: int | None = None, workers: int | None = None):
+        self.cache_dir = Path(cache_dir or config.ASSET_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(config.ASSET_CACHE_MAX_GB * 1024 ** 3)
+        self.workers = max(1, workers or config.ASSET_CACHE_WORKERS)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(path: str) -> bool:
+        # formats that pull in files next to them by relative path (USD layers) stay on the share
+        return os.path.splitext(path)[1].lower() in config.ASSET_CACHE_EXTENSIONS
+
+    def entry_path(self, source: str, digest: str | None = None) -> Path | None:
+        """Where source is (or would be) cached; None if its key needs a stat that failed."""
+        if digest:
+            key = f"sha256-{digest}"
+        else:
+            try:
+                st = os.stat(source)
+            except OSError:
+                return None
+            key = f"{os.path.normcase(os.path.abspath(source))}|{st.st_size}|{st.st_mtime_ns}"
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{name}_{os.path.basename(source)}"
+
+    def get(self, source: str, digest: str | None = None) -> str:
+        """
+        The local copy of source, fetched first if needed. Falls back to source itself
+        (not cacheable, or the copy failed), so the result can always be imported.
+        """
+        if not self.is_cacheable(source):
+            return source
+        entry = self.entry_path(source, digest)
+        if entry is None:
+            return source
+
+        if entry.exists():
+            self._touch(entry)
+            return str(entry)
+
+        tmp_path = entry.with_name(f".{entry.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            checksum = copy_with_checksum(source, tmp_path)
+            if digest and checksum != digest:
+                print(f"[WARN] {source} does not match its published checksum, importing it from the share.")
+                return source
+            os.replace(tmp_path, entry)
+            self._touch(entry) # copystat kept the source mtime, the LRU clock is the mtime
+        except OSError as e:
+            print(f"[WARN] Could not cache {source}: {e}")
+            return source
+        finally:
+            if tmp_path.exists():
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        return str(entry)
+
+    def prefetch(self, sources: list, digests: dict | None = None) -> dict:
+        """
+        Fetches several files concurrently (the copies wait on the network, so threads).
+        digests: {source: sha256} where known. Returns {source: local path}, then evicts
+        old entries, never the ones just fetched.
+        """
+        digests = digests or {}
+        unique = list(dict.fromkeys(sources))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(unique))) as pool:
+            local_paths = dict(zip(unique, pool.map(lambda s: self.get(s, digests.get(s)), unique)))
+        self.prune(keep={Path(p) for p in local_paths.values()})
+        return local_paths
+
+    def prune(self, keep=()):
+        """Deletes the least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.is_file() or entry.name.startswith('.'):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+                    total += st.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass # in use by another session (Windows), try again next time
+
+    @staticmethod
+    def _touch(entry: Path):
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
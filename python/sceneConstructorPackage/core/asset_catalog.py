@@ -0,0 +1,310 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from .publish_scanner import PublishScanner, scan_department
+from .version_index import sort_versions
+
+# Bump whenever the table layout changes; older catalogs are rebuilt from scratch.
+SCHEMA_VERSION = 2
+
+
+class AssetCatalog:
+    """
+    Local SQLite cache of the published asset tree.
+    - Stores the parsed *_meta.json records together with the mtimes
+      of the directories they were found in.
+    - refresh() only re-lists directories whose mtime moved since the last scan,
+      using a PublishScanner for the directory I/O.
+
+    Layout mirrors ASSET_PUBLISH_ROOT/[Asset_Name]/[Department]/PUBLISH/[version]/.
+    Adding or removing a department changes the asset dir mtime and adding a
+    version changes the PUBLISH dir mtime, so those two are what we track.
+    """
+
+    def __init__(self, db_path: Path, scanner: PublishScanner | None = None):
+        self.db_path = Path(db_path)
+        self.scanner = scanner or PublishScanner()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    # --- Schema ---
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ("info", "assets", "departments", "versions"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS info (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS assets (
+                    asset TEXT PRIMARY KEY,
+                    mtime REAL
+                );
+                CREATE TABLE IF NOT EXISTS departments (
+                    asset TEXT,
+                    department TEXT,
+                    publish_mtime REAL,
+                    versions TEXT,
+                    latest TEXT,
+                    PRIMARY KEY (asset, department)
+                );
+                CREATE TABLE IF NOT EXISTS versions (
+                    asset TEXT,
+                    department TEXT,
+                    version TEXT,
+                    meta TEXT,
+                    loadable INTEGER,
+                    PRIMARY KEY (asset, department, version)
+                );
+            """)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _bind_root(self, root: Path):
+        """Wipes the catalog if it was built for a different publish root."""
+        row = self._conn.execute("SELECT value FROM info WHERE key = 'root'").fetchone()
+        if row and row['value'] == str(root):
+            return
+        self._conn.execute("DELETE FROM assets")
+        self._conn.execute("DELETE FROM departments")
+        self._conn.execute("DELETE FROM versions")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO info (key, value) VALUES ('root', ?)", (str(root),)
+        )
+
+    # --- Refresh ---
+
+    def refresh(self, root: Path):
+        """
+        Brings the catalog in line with the publish root on disk.
+        Unchanged asset dirs are not listed, and unchanged PUBLISH dirs cost a single stat.
+        The directory I/O runs on the scanner's thread pool; results are applied here.
+        """
+        for _ in self.iter_refresh(root):
+            pass
+
+    def iter_refresh(self, root: Path):
+        """
+        Same as refresh(), but applies each asset as soon as its scan completes
+        and yields that asset's latest loadable meta records.
+        """
+        root = Path(root)
+        with self._lock, self._conn:
+            self._bind_root(root)
+            known = self._known_state()
+
+        on_disk = self.scanner.list_assets(root)
+
+        with self._lock, self._conn:
+            for asset_name in known.keys() - on_disk.keys():
+                self._forget_asset(asset_name)
+
+        for result in self.scanner.iter_scan_assets(root, on_disk, known):
+            with self._lock, self._conn:
+                self._apply_asset_scan(result)
+            yield self.get_actors(result['asset'])
+
+    def _known_state(self) -> dict:
+        """Returns the catalogued state in the shape scan_asset() expects as 'known'."""
+        known = {
+            row['asset']: {'mtime': row['mtime'], 'departments': {}}
+            for row in self._conn.execute("SELECT asset, mtime FROM assets")
+        }
+        rows = self._conn.execute("""
+            SELECT d.asset, d.department, d.publish_mtime, d.latest, v.version IS NOT NULL AS has_meta
+            FROM departments d
+            LEFT JOIN versions v
+              ON v.asset = d.asset AND v.department = d.department AND v.version = d.latest
+        """)
+        for row in rows:
+            asset_state = known.setdefault(row['asset'], {'mtime': None, 'departments': {}})
+            asset_state['departments'][row['department']] = {
+                'publish_mtime': row['publish_mtime'],
+                'latest': row['latest'],
+                'has_meta': bool(row['has_meta']),
+            }
+        return known
+
+    def _apply_asset_scan(self, result: dict):
+        asset_name = result['asset']
+        if result['listed']:
+            known_departments = [
+                row['department'] for row in self._conn.execute(
+                    "SELECT department FROM departments WHERE asset = ?", (asset_name,)
+                )
+            ]
+            for department in set(known_departments) - result['departments'].keys():
+                self._forget_department(asset_name, department)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO assets (asset, mtime) VALUES (?, ?)",
+                (asset_name, result['mtime'])
+            )
+
+        for department, dept_result in result['departments'].items():
+            self._apply_department_scan(asset_name, department, dept_result)
+
+    def _apply_department_scan(self, asset_name: str, department: str, result: dict):
+        if result.get('unchanged'):
+            return
+
+        # Departments without a PUBLISH dir stay known (publish_mtime NULL)
+        # so they are checked again once PUBLISH appears.
+        versions = result['versions']
+        self._conn.execute(
+            "INSERT OR REPLACE INTO departments (asset, department, publish_mtime, versions, latest) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (asset_name, department, result['publish_mtime'], json.dumps(versions), result['latest'])
+        )
+        stale = [
+            row['version'] for row in self._conn.execute(
+                "SELECT version FROM versions WHERE asset = ? AND department = ?",
+                (asset_name, department)
+            )
+            if row['version'] not in versions
+        ]
+        self._conn.executemany(
+            "DELETE FROM versions WHERE asset = ? AND department = ? AND version = ?",
+            [(asset_name, department, version_str) for version_str in stale]
+        )
+
+        if result['meta_read'] and result['meta'] is not None:
+            self._store_meta(asset_name, department, result['latest'], result['meta'], result['loadable'])
+
+    def _forget_asset(self, asset_name: str):
+        for table in ("assets", "departments", "versions"):
+            self._conn.execute(f"DELETE FROM {table} WHERE asset = ?", (asset_name,))
+
+    def _forget_department(self, asset_name: str, department: str):
+        for table in ("departments", "versions"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE asset = ? AND department = ?", (asset_name, department)
+            )
+
+    def _store_meta(self, asset_name: str, department: str, version_str: str, meta_data: dict, loadable: bool):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO versions (asset, department, version, meta, loadable) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (asset_name, department, version_str, json.dumps(meta_data), int(loadable))
+        )
+
+    # --- Queries ---
+
+    def get_actors(self, asset_name: str | None = None) -> list:
+        """Returns the latest loadable meta record of every asset department (optionally of one asset)."""
+        query = """
+            SELECT v.meta FROM departments d
+            JOIN versions v
+              ON v.asset = d.asset AND v.department = d.department AND v.version = d.latest
+            WHERE v.loadable = 1
+        """
+        params = ()
+        if asset_name is not None:
+            query += " AND d.asset = ?"
+            params = (asset_name,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row['meta']) for row in rows]
+
+    def get_versions(self, asset_name: str, department: str) -> list[str] | None:
+        """Returns the cached version list, or None if the department is not catalogued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT versions FROM departments WHERE asset = ? AND department = ?",
+                (asset_name, department)
+            ).fetchone()
+        return json.loads(row['versions']) if row else None
+
+    def get_all_versions(self) -> dict:
+        """Returns {(asset, department): [versions]} for every catalogued department."""
+        with self._lock:
+            rows = self._conn.execute("SELECT asset, department, versions FROM departments").fetchall()
+        return {(row['asset'], row['department']): json.loads(row['versions']) for row in rows}
+
+    def get_version_meta(self, asset_name: str, department: str, version_str: str) -> dict | None:
+        """Returns the cached meta of a version, or None if it is not catalogued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta FROM versions WHERE asset = ? AND department = ? AND version = ?",
+                (asset_name, department, version_str)
+            ).fetchone()
+        return json.loads(row['meta']) if row else None
+
+    def get_version_metas(self, keys: list) -> dict:
+        """
+        Bulk get_version_meta(): {(asset, department, version): meta} for the given
+        keys that are catalogued, in a few queries however many keys there are.
+        """
+        found = {}
+        keys = list(keys)
+        chunk_size = 300 # 3 parameters per key, under SQLite's default limit of 999
+        with self._lock:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                rows = self._conn.execute(
+                    "SELECT asset, department, version, meta FROM versions "
+                    f"WHERE (asset, department, version) IN (VALUES {', '.join(['(?, ?, ?)'] * len(chunk))})",
+                    [value for key in chunk for value in key]
+                ).fetchall()
+                for row in rows:
+                    found[(row['asset'], row['department'], row['version'])] = json.loads(row['meta'])
+        return found
+
+    # --- Updates ---
+
+    def refresh_department(self, root: Path, asset_name: str, department: str):
+        """Re-validates a single asset department against disk."""
+        root = Path(root)
+        with self._lock, self._conn:
+            self._bind_root(root)
+            row = self._conn.execute("""
+                SELECT d.publish_mtime, d.latest, v.version IS NOT NULL AS has_meta
+                FROM departments d
+                LEFT JOIN versions v
+                  ON v.asset = d.asset AND v.department = d.department AND v.version = d.latest
+                WHERE d.asset = ? AND d.department = ?
+            """, (asset_name, department)).fetchone()
+            known = dict(row) if row else None
+            result = scan_department(root / asset_name, department, known)
+            self._apply_department_scan(asset_name, department, result)
+
+    def put_version_meta(self, asset_name: str, department: str, version_str: str,
+                         meta_data: dict, loadable: bool):
+        """Stores meta read outside of refresh() (e.g. an older version picked by the user)."""
+        with self._lock, self._conn:
+            self._store_meta(asset_name, department, version_str, meta_data, loadable)
+
+    def record_publish(self, asset_name: str, department: str, version_str: str,
+                       meta_data: dict, loadable: bool):
+        """
+        Applies a publish reported by the journal without touching disk.
+        publish_mtime is left as is, so the next refresh still re-lists the department.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT publish_mtime, versions FROM departments WHERE asset = ? AND department = ?",
+                (asset_name, department)
+            ).fetchone()
+            versions = json.loads(row['versions']) if row else []
+            if version_str not in versions:
+                versions = sort_versions(versions + [version_str])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO departments (asset, department, publish_mtime, versions, latest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (asset_name, department, row['publish_mtime'] if row else None,
+                 json.dumps(versions), versions[-1])
+            )
+            self._store_meta(asset_name, department, version_str, meta_data, loadable)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
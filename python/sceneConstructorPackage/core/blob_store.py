@@ -0,0 +1,81 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from .. import config
+from .publish_pipeline import copy_with_checksum, file_checksum
+from .utils import delete, write_protect
+
+
+class BlobStore:
+    """
+    Content-addressed storage for publish artifacts: every unique file is kept once,
+    as <root>/<first 2 hex digits>/<sha256>, and version dirs hard-link to it.
+    Blobs are never modified or deleted by publishing, so a link is as good as a copy.
+    Blobs (and so every link to them) are write-protected: saving a published file in
+    place would otherwise change every version sharing its content.
+    Where hard links are not possible (other volume, share without link support) the
+    file is copied instead, still keyed by the same digest in the meta.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or config.BLOB_STORE_ROOT)
+        self._links_supported = True
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str, size: int | None = None) -> bool:
+        try:
+            stat = os.stat(self.blob_path(digest))
+        except OSError:
+            return False
+        return size is None or stat.st_size == size
+
+    def put(self, source, on_bytes=None) -> tuple[str, bool]:
+        """
+        Stores a (local) file. It is hashed first, so a file already in the store
+        is not transferred at all. Returns (digest, stored): stored is False for a duplicate.
+        on_bytes(n) reports transferred bytes; a duplicate reports its whole size at once.
+        """
+        source = Path(source)
+        size = source.stat().st_size
+        digest = file_checksum(source)
+        if self.has(digest, size):
+            if on_bytes is not None:
+                on_bytes(size)
+            return digest, False
+
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob.parent / f".{digest}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            copied = copy_with_checksum(source, tmp_path, on_bytes)
+            if copied != digest or (config.PUBLISH_VERIFY_TRANSFER and file_checksum(tmp_path) != digest):
+                raise OSError(f"Checksum mismatch while storing {source.name} as blob {digest}")
+            write_protect(tmp_path)
+            try:
+                os.replace(tmp_path, blob) # a concurrent publish of the same content writes the same bytes
+            except PermissionError:
+                if not self.has(digest, size): # a read-only blob can't be replaced on Windows
+                    raise
+        finally:
+            if tmp_path.exists():
+                delete(tmp_path) # write-protected by now on Windows
+        return digest, True
+
+    def link(self, digest: str, destination):
+        """Makes destination refer to a stored blob: a hard link, else a copy."""
+        blob = self.blob_path(digest)
+        if self._links_supported:
+            try:
+                os.link(blob, destination)
+                write_protect(destination) # the blob itself, for blobs stored before they were protected
+                return
+            except OSError as e:
+                if not self.has(digest):
+                    raise
+                print(f"[WARN] Could not hard-link publish blobs ({e}), copying them instead.")
+                self._links_supported = False
+        shutil.copy2(blob, destination)
+        write_protect(destination)
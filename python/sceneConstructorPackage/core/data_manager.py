@@ -1,17 +1,65 @@
 import json
 import os
+import sqlite3
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from .. import config
+from .asset_catalog import AssetCatalog
+from .publish_journal import PublishJournal
+from .shot_cache import ShotDocumentCache, file_key
+from .shot_edit_log import SEQ_KEY, ShotEditLog, log_path
+from .scene_index import SceneIndex
+from .save_queue import SaveQueue
+from .shot_file_index import ShotFileIndex
+from .shot_refs import FORMAT_KEY, FORMAT_REFS, compact_shot_data, expand_shot_data
+from .utils import atomic_write_json
+from .publish_scanner import (
+    SKIPPED_DEPARTMENTS, PublishScanner, actors_from_scan, read_version_meta, is_loadable, scan_department
+)
+from .version_index import VersionIndex, parse_version, sort_versions
 
 class DataManager:
     """
     Handles all file I/O operations.
-    - Scans ASSET_PUBLISH_ROOT for Actors.
+    - Scans ASSET_PUBLISH_ROOT for Actors (served from a local AssetCatalog when available).
     - Scans SCENE_ROOT for Scenes and Shots.
     """
 
-    def __init__(self):
-        pass 
+    # every live DataManager in this process, so a publish can update them all
+    _instances = weakref.WeakSet()
+
+    def __init__(self, use_catalog: bool = True, scan_workers: int | None = None):
+        # scan_workers: size of the publish scan thread pool (defaults to config.SCAN_WORKERS)
+        self.scanner = PublishScanner(max_workers=scan_workers)
+        self.version_index = VersionIndex()
+        DataManager._instances.add(self)
+
+        # latest actor records from the last full scan, kept current from the publish journal
+        self.actors = {} # (name, department) -> meta
+        self.journal = PublishJournal(config.PUBLISH_JOURNAL_PATH)
+        self._journal_offset = None # set once a full scan has completed
+        self._last_full_scan = 0.0
+
+        self.shot_cache = ShotDocumentCache(max_entries=config.SHOT_CACHE_SIZE)
+        self.shot_file_index = ShotFileIndex() # one shot at a time out of big multi-shot files
+        self.edit_log = ShotEditLog(self._read_shot_file, self._write_shot_file,
+                                    compact_after=config.SHOT_EDIT_LOG_COMPACT_RECORDS)
+        self._log_keys = {} # shot json path -> file_key of its edit log when last read or written
+        # shot json paths read one shot at a time: their in-memory data is partial and must only
+        # ever be written back key by key, whatever size the file has by then
+        self._partial_paths = set()
+        self.scene_index = SceneIndex(config.SCENE_ROOT) # built on first query
+        # shot saves are coalesced and written off the calling (UI) thread
+        self.save_queue = SaveQueue(self._write_shot_data, delay=config.SHOT_SAVE_DELAY_MS / 1000.0)
+
+        self.catalog = None
+        if use_catalog:
+            try:
+                self.catalog = AssetCatalog(config.ASSET_CATALOG_PATH, scanner=self.scanner)
+            except (sqlite3.Error, OSError) as e:
+                print(f"[WARN] Asset catalog unavailable, falling back to full scans: {e}")
 
 
     def load_actors(self) -> list:
@@ -19,71 +67,193 @@ class DataManager:
         Loads all global Actors by scanning the ASSET_PUBLISH_ROOT.
         Scans for .../Assets/[Asset_Name]/[Department]/PUBLISH/[version]/
         and finds the *_meta.json file.
+        With a catalog only directories whose mtime changed are re-read.
         """
         print("[INFO] Scanning for published assets...")
-        found_assets = []
-        
+        found_assets = list(self.iter_actors())
+        print(f"[INFO] Found {len(found_assets)} published asset departments.")
+        return sorted(found_assets, key=lambda x: (x.get('name', ''), x.get('department', '')))
+
+    def iter_actors(self):
+        """
+        Streaming variant of load_actors().
+        Yields actor meta records as the scan finds them, in no particular order.
+        A completed scan also becomes the base the publish journal is applied to.
+        """
         root = config.ASSET_PUBLISH_ROOT 
         
         if not root.exists():
             print(f"[WARN] Asset publish root does not exist: {root}")
-            return []
+            return
+
+        # journal entries written while we scan are replayed afterwards (applying twice is harmless)
+        journal_offset = self.journal.size()
+        actors = {}
+
+        for actor in self._iter_scan(root):
+            actors[(actor.get('name'), actor.get('department'))] = actor
+            yield actor
+
+        self.actors = actors
+        self._journal_offset = journal_offset
+        self._last_full_scan = time.monotonic()
+
+    def _iter_scan(self, root: Path):
+        if self.catalog is not None:
+            yielded = False
+            try:
+                for actors in self.catalog.iter_refresh(root):
+                    for actor in actors:
+                        yielded = True
+                        yield actor
+                self.version_index.load(self.catalog.get_all_versions())
+                return
+            except (sqlite3.Error, OSError) as e:
+                print(f"[ERROR] Catalog refresh failed: {e}")
+                if yielded:
+                    return
+                print("[INFO] Falling back to a full scan.")
 
         try:
-            for asset_dir in root.iterdir():
-                if not asset_dir.is_dir(): continue
-                asset_name = asset_dir.name
-
-                for dept_dir in asset_dir.iterdir():
-                    if not dept_dir.is_dir() or dept_dir.name in ("WORK", "REF"):
-                        continue
-                    department = dept_dir.name 
-
-                    publish_dir = dept_dir / "PUBLISH"
-                    if not publish_dir.exists(): 
-                        continue
-
-                    versions = [d.name for d in publish_dir.iterdir() if d.is_dir() and d.name.startswith('v')]
-                    if not versions: 
-                        continue
-
-                    latest_version_str = sorted(versions)[-1]
-                    latest_version_dir = publish_dir / latest_version_str
-
-                    meta_files = list(latest_version_dir.glob("*_meta.json"))
-                    if not meta_files:
-                        print(f"[WARN] Skipping {asset_name}/{department}: No _meta.json found in {latest_version_dir}")
-                        continue
-                    
-                    meta_path = meta_files[0] 
-                    
-                    try:
-                        with open(meta_path, 'r') as f:
-                            meta_data = json.load(f)
-                    except Exception as e:
-                        print(f"[ERROR] Could not read {meta_path}: {e}")
-                        continue
-                    
-                    meta_data['name'] = asset_name
-                    
-                    loadable_path_str = meta_data.get('path')
-                    if not loadable_path_str or not Path(loadable_path_str).exists():
-                        print(f"[WARN] Skipping {asset_name}/{department}: 'path' in meta.json is missing or invalid.")
-                        continue
-                        
-                    found_assets.append(meta_data)
-                
-        except Exception as e:
+            for result in self.scanner.iter_scan_assets(root, self.scanner.list_assets(root)):
+                for department, dept_result in result['departments'].items():
+                    if dept_result['publish_mtime'] is not None:
+                        self.version_index.set_versions(result['asset'], department, dept_result['versions'])
+                yield from actors_from_scan(result)
+        except OSError as e:
             print(f"[ERROR] Failed during asset scan: {e}")
-            
-        print(f"[INFO] Found {len(found_assets)} published asset departments.")
-        return sorted(found_assets, key=lambda x: (x.get('name', ''), x.get('department', '')))
+
+    # --- Publish journal ---
+
+    def announce_publish(self, meta: dict):
+        """
+        Called by the publisher once a version is complete.
+        Appends it to the shared publish journal and updates every DataManager in this process.
+        """
+        record = {
+            "event": "publish",
+            "name": meta.get('name'),
+            "department": meta.get('department'),
+            "version": meta.get('version'),
+            "meta": meta,
+        }
+        try:
+            self.journal.append(record)
+        except (OSError, TimeoutError) as e:
+            print(f"[WARN] Could not write publish journal, other sessions will see this on their next scan: {e}")
+        DataManager.notify_published(record['name'], record['department'], record['version'])
+
+    def poll_publish_journal(self) -> list:
+        """
+        Applies publishes appended to the journal since the last poll.
+        Returns the actor records that became the latest version of their department.
+        Nothing is read until a full scan has completed.
+        """
+        if self._journal_offset is None:
+            return []
+
+        records, self._journal_offset, truncated = self.journal.read_since(self._journal_offset)
+        if truncated:
+            print("[WARN] Publish journal was truncated, a full rescan is due.")
+            self._last_full_scan = 0.0
+
+        updated = []
+        for record in records:
+            meta = record.get('meta')
+            # 'meta' records rewrite the meta of an existing version (e.g. thumbnail backfill)
+            if record.get('event') not in ('publish', 'meta') or not meta:
+                continue
+
+            asset_name = record.get('name')
+            department = record.get('department')
+            version_str = record.get('version')
+            if not asset_name or not department or parse_version(version_str) is None:
+                continue
+
+            loadable = is_loadable(meta)
+            self.record_publish(asset_name, department, version_str)
+            if self.catalog is not None:
+                self.catalog.record_publish(asset_name, department, version_str, meta, loadable)
+
+            if not loadable or self.version_index.latest(asset_name, department) != version_str:
+                continue
+            meta = dict(meta, name=asset_name)
+            self.actors[(asset_name, department)] = meta
+            updated.append(meta)
+        return updated
+
+    def list_departments(self, asset_name: str) -> list[str]:
+        """Lists the department dirs of an asset on disk."""
+        asset_dir = config.ASSET_PUBLISH_ROOT / asset_name
+        try:
+            with os.scandir(asset_dir) as it:
+                return [e.name for e in it if e.is_dir() and e.name not in SKIPPED_DEPARTMENTS]
+        except OSError:
+            return []
+
+    def list_new_assets(self) -> list[str]:
+        """Asset dirs on disk that no department of this DataManager knows about yet."""
+        try:
+            on_disk = self.scanner.list_assets(config.ASSET_PUBLISH_ROOT)
+        except OSError:
+            return []
+        known = {asset_name for asset_name, _ in self.version_index.departments()}
+        return sorted(on_disk.keys() - known)
+
+    def refresh_department(self, asset_name: str, department: str) -> tuple[list, dict | None, bool]:
+        """
+        Re-reads a single asset department from disk (used by the watcher).
+        Returns (new_versions, latest actor meta or None, was_known).
+        """
+        known_versions = self.version_index.get_versions(asset_name, department)
+        was_known = bool(known_versions)
+        known_versions = set(known_versions or [])
+
+        meta = None
+        if self.catalog is not None:
+            self.catalog.refresh_department(config.ASSET_PUBLISH_ROOT, asset_name, department)
+            versions = self.catalog.get_versions(asset_name, department) or []
+            for actor in self.catalog.get_actors(asset_name):
+                if actor.get('department') == department:
+                    meta = actor
+        else:
+            result = scan_department(config.ASSET_PUBLISH_ROOT / asset_name, department)
+            versions = result.get('versions', [])
+            if result.get('loadable'):
+                meta = result['meta']
+
+        self.version_index.set_versions(asset_name, department, versions)
+        if meta is not None:
+            self.actors[(asset_name, department)] = meta
+        else:
+            self.actors.pop((asset_name, department), None)
+
+        new_versions = [v for v in self.version_index.get_versions(asset_name, department) if v not in known_versions]
+        return new_versions, meta, was_known
+
+    def reconcile_due(self) -> bool:
+        """True when the periodic full scan (config.RECONCILE_INTERVAL) is due."""
+        return time.monotonic() - self._last_full_scan > config.RECONCILE_INTERVAL
 
     def get_all_versions_for_asset(self, asset_name: str, department: str) -> list[str]:
         """
-        Scans the publish directory for an asset/department and returns
-        a sorted list of all found version strings (e.g., ['v001', 'v002']).
+        Returns a numerically sorted list of all found version strings (e.g., ['v001', 'v002'])
+        for an asset/department. Answered from the in-memory version index when possible,
+        then the catalog, and only then from disk.
         """
+        versions = self.version_index.get_versions(asset_name, department)
+        if versions:
+            return versions
+
+        if self.catalog is not None:
+            versions = self.catalog.get_versions(asset_name, department)
+            if versions is None:
+                self.catalog.refresh_department(config.ASSET_PUBLISH_ROOT, asset_name, department)
+                versions = self.catalog.get_versions(asset_name, department)
+            if versions:
+                self.version_index.set_versions(asset_name, department, versions)
+                return self.version_index.get_versions(asset_name, department)
+
         publish_dir = (
             config.ASSET_PUBLISH_ROOT / 
             asset_name / 
@@ -100,17 +270,43 @@ class DataManager:
                 d.name for d in publish_dir.iterdir() 
                 if d.is_dir() and d.name.startswith('v')
             ]
-            versions.sort()
+            versions = sort_versions(versions)
+            self.version_index.set_versions(asset_name, department, versions)
             return versions
         except Exception as e:
             print(f"[ERROR] Could not list versions for {asset_name}/{department}: {e}")
             return []
 
+    def get_latest_version(self, asset_name: str, department: str) -> str | None:
+        """Returns the newest version string of an asset/department, e.g. 'v012'."""
+        latest = self.version_index.latest(asset_name, department)
+        if latest is None:
+            versions = self.get_all_versions_for_asset(asset_name, department)
+            latest = versions[-1] if versions else None
+        return latest
+
+    def record_publish(self, asset_name: str, department: str, version_str: str):
+        """Updates this DataManager's version index for a version that was just published."""
+        self.version_index.add_version(asset_name, department, version_str)
+
+    @classmethod
+    def notify_published(cls, asset_name: str, department: str, version_str: str):
+        """Publish event: updates the version index of every DataManager in this process."""
+        for data_manager in list(cls._instances):
+            data_manager.record_publish(asset_name, department, version_str)
+
     def get_asset_version_details(self, asset_name: str, department: str, version_str: str) -> dict | None:
         """
         Finds the meta.json for a specific asset version and returns its data.
         Returns None if the version or metadata doesn't exist.
         """
+        if self.catalog is not None:
+            meta_data = self.catalog.get_version_meta(asset_name, department, version_str)
+            if meta_data is not None:
+                if not is_loadable(meta_data):
+                    print(f"[WARN] Invalid path for {asset_name}/{department}/{version_str}: {meta_data.get('path')}")
+                    return None
+                return meta_data
         
         version_dir = (
             config.ASSET_PUBLISH_ROOT / 
@@ -124,70 +320,178 @@ class DataManager:
             print(f"[WARN] Version not found: {version_dir}")
             return None
             
-        meta_files = list(version_dir.glob("*_meta.json"))
-        if not meta_files:
-            print(f"[WARN] No _meta.json found in {version_dir}")
+        meta_data = read_version_meta(version_dir, asset_name)
+        if meta_data is None:
+            print(f"[WARN] No readable _meta.json found in {version_dir}")
             return None
-            
-        meta_path = meta_files[0]
-        
-        try:
-            with open(meta_path, 'r') as f:
-                meta_data = json.load(f)
-            
-            meta_data['name'] = asset_name
-
-            loadable_path_str = meta_data.get('path')
-            if not loadable_path_str or not Path(loadable_path_str).exists():
-                print(f"[WARN] Invalid path in {meta_path}: {loadable_path_str}")
-                return None
-                
-            return meta_data
-        except Exception as e:
-            print(f"[ERROR] Could not read {meta_path}: {e}")
+
+        loadable = is_loadable(meta_data)
+        if self.catalog is not None:
+            self.catalog.put_version_meta(asset_name, department, version_str, meta_data, loadable)
+
+        if not loadable:
+            print(f"[WARN] Invalid path in {version_dir}: {meta_data.get('path')}")
             return None
+            
+        return meta_data
 
     
+    def resolve_versions(self, keys: list) -> dict:
+        """
+        Bulk version lookup for shot references: {(asset, department, version): meta}
+        for the keys found. The catalog answers in one go; versions it does not know
+        are read from disk in parallel (and catalogued on the way).
+        """
+        keys = list(dict.fromkeys(keys))
+        found = self.catalog.get_version_metas(keys) if self.catalog is not None else {}
+        missing = [key for key in keys if key not in found]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.scanner.max_workers, len(missing))) as pool:
+                for key, meta in zip(missing, pool.map(lambda key: self.get_asset_version_details(*key), missing)):
+                    if meta is not None:
+                        found[key] = meta
+        return found
+
     def get_scenes(self):
-        if not config.SCENE_ROOT.exists():
-            return []
-        return sorted([d.name for d in config.SCENE_ROOT.iterdir() if d.is_dir()])
+        return self.scene_index.scenes()
 
     def get_shots_in_scene(self, scene_name: str):
-        scene_path = config.SCENE_ROOT / scene_name
-        if not scene_path.exists():
-            return []
-        return sorted([d.name for d in scene_path.iterdir() if d.is_dir()])
+        return self.scene_index.shots(scene_name)
+
+    def find_shot_json(self, scene_name: str, shot_name: str) -> Path:
+        """
+        Returns the shot's SceneConstructor JSON, or the path it would be saved to.
+        Does not create anything on disk.
+        """
+        info = self.scene_index.shot_info(scene_name, shot_name)
+        if info and info['json_path']:
+            return Path(info['json_path'])
 
-    def load_shot_data(self, scene_name: str, shot_name: str) -> tuple[str, dict]:
         shot_dir = config.SCENE_ROOT / scene_name / shot_name / 'SceneConstructor'
+        return shot_dir / f"{shot_name.lower()}_scene_data.json"
+
+    def load_shot_data(self, scene_name: str, shot_name: str) -> tuple[str, dict]:
+        """
+        Returns (json_path, data) for a shot, served from the shot cache while the
+        file is unchanged. Read-only: the shot folder is created by save_shot_data.
+        A queued save that has not reached the disk yet wins over the file.
+        """
+        if not self.save_queue.is_idle():
+            json_file_path = str(self.find_shot_json(scene_name, shot_name))
+            pending = self.save_queue.pending(json_file_path)
+            if pending is not None:
+                return json_file_path, pending
+
+        cached = self.shot_cache.get(scene_name, shot_name)
+        if cached is not None and file_key(log_path(cached[0])) == self._log_keys.get(cached[0]):
+            return cached
+
+        json_file_path = self.find_shot_json(scene_name, shot_name)
         
-        if not shot_dir.exists():
-            shot_dir.mkdir(parents=True, exist_ok=True) 
-
-        json_file_path = ""
-        for f in shot_dir.iterdir():
-            if f.suffix.lower() == '.json':
-                json_file_path = f
-                break
-        
-        if json_file_path and json_file_path.exists():
+        if json_file_path.exists():
             try:
-                with open(json_file_path, 'r') as json_file:
-                    data = json.load(json_file)
-                    return str(json_file_path), data
+                keys = None
+                if str(json_file_path) in self._partial_paths or self._is_partial_io_file(json_file_path):
+                    self._partial_paths.add(str(json_file_path))
+                    keys = [shot_name.casefold(), FORMAT_KEY, SEQ_KEY]
+                snapshot_key = file_key(json_file_path)
+                data = self._read_shot_file(json_file_path, keys)
+                if config.SHOT_EDIT_LOG or self.edit_log.exists(json_file_path):
+                    data = self.edit_log.load(json_file_path, data, set(keys) if keys else None, snapshot_key)
+                else:
+                    data.pop(SEQ_KEY, None)
+                self._log_keys[str(json_file_path)] = file_key(log_path(json_file_path))
+                self.shot_cache.put(scene_name, shot_name, str(json_file_path), data)
+                return str(json_file_path), data
             except Exception as e:
                 print(f"[ERROR] Failed to load shot JSON {json_file_path}: {e}")
                 return str(json_file_path), {}
         
-        default_path = shot_dir / f"{shot_name.lower()}_scene_data.json"
-        return str(default_path), {}
+        return str(json_file_path), {}
 
     def save_shot_data(self, shot_json_path: str, shot_data: dict):
+        """Writes the shot JSON now, on the calling thread."""
         try:
-            Path(shot_json_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(shot_json_path, "w") as f:
-                json.dump(shot_data, f, indent=4)
-            print(f"[OK] Shots saved to {shot_json_path}")
+            self._write_shot_data(shot_json_path, shot_data)
         except Exception as e:
-            print(f"[ERROR] Could not save Shots JSON: {e}")
\ No newline at end of file
+            print(f"[ERROR] Could not save Shots JSON: {e}")
+
+    def queue_shot_save(self, shot_json_path: str, shot_data: dict, on_done=None):
+        """
+        Queues a background save. Saves to the same file within SHOT_SAVE_DELAY_MS
+        of each other are written once, with the latest data.
+        on_done(path, data, error) is called from the writer thread.
+        """
+        self.save_queue.submit(str(shot_json_path), shot_data, on_done)
+
+    def flush_shot_saves(self, shot_json_path: str | None = None, wait: bool = True) -> bool:
+        """Writes queued shot saves (all, or one file) now. See SaveQueue.flush."""
+        key = str(shot_json_path) if shot_json_path else None
+        return self.save_queue.flush(key, wait=wait)
+
+    def _write_shot_data(self, shot_json_path: str, shot_data: dict):
+        if config.SHOT_EDIT_LOG and os.path.exists(shot_json_path):
+            # only what changed since the last load/save is appended to the shot's edit log
+            count = self.edit_log.save(shot_json_path, shot_data)
+            print(f"[OK] {count} shot edits logged for {shot_json_path}")
+        else:
+            if self.edit_log.exists(shot_json_path):
+                self.edit_log.compact(shot_json_path) # fold in edits to shots not in shot_data
+            self._write_shot_file(shot_json_path, shot_data, partial=str(shot_json_path) in self._partial_paths)
+            if config.SHOT_EDIT_LOG:
+                self.edit_log.remember(shot_json_path, shot_data)
+            print(f"[OK] Shots saved to {shot_json_path}")
+        self._log_keys[str(shot_json_path)] = file_key(log_path(shot_json_path))
+
+        shot_key = self._shot_key_from_path(shot_json_path)
+        if shot_key:
+            self.shot_cache.put(*shot_key, shot_json_path, shot_data)
+            self.scene_index.update_shot(*shot_key)
+
+    def _read_shot_file(self, shot_json_path, keys=None) -> dict:
+        """
+        The shot JSON as full shot data (references expanded). keys limits a big file to those
+        top-level keys (and the format marker, so references still expand); small files are
+        always read whole. A missing file reads as {}.
+        """
+        if not os.path.exists(shot_json_path):
+            return {}
+        if keys is not None and self._is_partial_io_file(shot_json_path):
+            data = self.shot_file_index.read(shot_json_path, list(dict.fromkeys([*keys, FORMAT_KEY])))
+        else:
+            with open(shot_json_path, 'r') as json_file:
+                data = json.load(json_file)
+        return expand_shot_data(data, self.resolve_versions)
+
+    def _write_shot_file(self, shot_json_path, shot_data: dict, partial: bool = False):
+        """
+        Writes shot data to the shot JSON. partial: shot_data only holds some of the file's
+        top-level keys (a partial read); those are replaced and the others kept, so the file is
+        never rewritten from partial data, even once it is smaller than SHOT_PARTIAL_IO_BYTES.
+        """
+        # in memory shot data is always full; the file may hold references only
+        file_data = shot_data
+        if config.SHOT_FILE_FORMAT == FORMAT_REFS:
+            file_data = compact_shot_data(shot_data, self.resolve_versions)
+        if partial and os.path.exists(shot_json_path):
+            self.shot_file_index.replace(shot_json_path, file_data, indent=4)
+        else:
+            atomic_write_json(shot_json_path, file_data, indent=4)
+
+    @staticmethod
+    def _is_partial_io_file(shot_json_path) -> bool:
+        """Big shot files (legacy multi-shot ones) are read and written one shot at a time."""
+        try:
+            return os.path.getsize(shot_json_path) >= config.SHOT_PARTIAL_IO_BYTES
+        except OSError:
+            return False
+
+    def _shot_key_from_path(self, shot_json_path: str) -> tuple[str, str] | None:
+        """SCENE_ROOT/[scene]/[shot]/SceneConstructor/x.json -> (scene, shot)."""
+        try:
+            parts = Path(shot_json_path).relative_to(config.SCENE_ROOT).parts
+        except ValueError:
+            return None
+        if len(parts) != 4:
+            return None
+        return parts[0], parts[1]
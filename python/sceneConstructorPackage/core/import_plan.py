@@ -0,0 +1,197 @@
+import abc
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Maya file types by extension; anything else is left to Maya ("file")
+FILE_TYPES = {
+    '.ma': "mayaAscii",
+    '.mb': "mayaBinary",
+    '.usd': "USD Import",
+    '.usda': "USD Import",
+    '.usdc': "USD Import",
+    '.fbx': "FBX",
+    '.obj': "OBJ",
+    '.abc': "Alembic",
+}
+DEFAULT_FILE_TYPE = "file"
+
+# sets first, so characters and props land in a scene that already has its environment
+TYPE_ORDER = ('set', 'character', 'prop', 'camera')
+
+
+def file_type_for(path: str) -> str:
+    return FILE_TYPES.get(os.path.splitext(path)[1].lower(), DEFAULT_FILE_TYPE)
+
+
+def file_size(path: str) -> int | None:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+class ImportStep:
+    """One cmds.file import: an actor of the shot, its file and the namespace it goes into."""
+
+    def __init__(self, name: str, actor_type: str, path: str, namespace: str, file_type: str, digest: str | None):
+        self.name = name
+        self.actor_type = actor_type
+        self.path = path
+        self.namespace = namespace
+        self.file_type = file_type
+        self.digest = digest
+        self.shared = False # the file is imported by several steps (fetched once)
+
+    def __repr__(self):
+        return f"ImportStep({self.namespace!r}, {self.path!r}, {self.file_type!r})"
+
+
+class ImportPlan:
+    """
+    The imports of a shot, in order, without duplicates. Built by plan_imports(), run by an ImportExecutor.
+    files: {path: {"size": bytes or None, "digest": sha256 or None, "users": number of steps}}
+    skipped: [(actor name, reason)]
+    """
+
+    def __init__(self, shot: str):
+        self.shot = shot
+        self.steps = []
+        self.files = {}
+        self.skipped = []
+
+    @property
+    def total_bytes(self) -> int:
+        """Estimated bytes to read, each file counted once (unknown sizes count as 0)."""
+        return sum(info["size"] or 0 for info in self.files.values())
+
+    def summary(self) -> str:
+        shared = sum(1 for info in self.files.values() if info["users"] > 1)
+        return (f"{len(self.steps)} imports of {len(self.files)} files ({shared} shared), "
+                f"~{self.total_bytes / 1024 ** 2:.1f} MB, {len(self.skipped)} skipped")
+
+
+def plan_imports(shot: str, shot_items: list, size_of=None) -> ImportPlan:
+    """
+    Turns the actor records of a shot into an ImportPlan. Pure Python, no Maya.
+    - Items without a path are skipped; an actor listed twice with the same file is imported once.
+    - Namespaces are <shot>_<actor name>, suffixed _2, _3... when two different files share a name.
+    - Steps are ordered by TYPE_ORDER, keeping the shot order within a type.
+    size_of(path) gives the size estimate of each file once (None: unknown; default: no sizes,
+    pass file_size to stat them).
+    """
+    plan = ImportPlan(shot)
+    seen = set() # (actor name, path)
+    namespaces = set()
+
+    for item in shot_items:
+        name = item.get("name", "UnknownActor")
+        path = item.get("path")
+        if not path:
+            plan.skipped.append((name, "missing path"))
+            continue
+        if (name, path) in seen:
+            plan.skipped.append((name, "duplicate"))
+            continue
+        seen.add((name, path))
+
+        namespace = base = f"{shot}_{name}"
+        suffix = 2
+        while namespace in namespaces:
+            namespace = f"{base}_{suffix}"
+            suffix += 1
+        namespaces.add(namespace)
+
+        digest = (item.get("checksums") or {}).get(os.path.basename(path))
+        step = ImportStep(name, item.get("type", "asset"), path, namespace, file_type_for(path), digest)
+        plan.steps.append(step)
+
+        info = plan.files.get(path)
+        if info is None:
+            plan.files[path] = {"size": size_of(path) if size_of else None, "digest": digest, "users": 1}
+        else:
+            info["users"] += 1
+            info["digest"] = info["digest"] or digest
+
+    rank = {actor_type: i for i, actor_type in enumerate(TYPE_ORDER)}
+    plan.steps.sort(key=lambda step: rank.get(step.actor_type, len(TYPE_ORDER))) # stable
+    for step in plan.steps:
+        step.shared = plan.files[step.path]["users"] > 1
+    return plan
+
+
+class ImportExecutor(abc.ABC):
+    """
+    Runs an ImportPlan: every file is fetched on a thread pool in plan order while the
+    imports run on the calling thread (Maya commands must stay on the main thread), each
+    one as soon as its file is there. Subclasses implement fetch() and import_step().
+    """
+
+    def __init__(self, workers: int = 4):
+        self.workers = max(1, workers)
+
+    def fetch(self, path: str, digest: str | None) -> str:
+        """Makes a file available and returns the path to import. Runs on a worker thread."""
+        return path
+
+    @abc.abstractmethod
+    def import_step(self, step: ImportStep, local_path: str):
+        """Imports one step from its fetched file. Runs on the calling thread."""
+
+    def finish(self, local_paths: dict):
+        """Called once after the run with {path: fetched path}, e.g. to prune a cache."""
+
+    def run(self, plan: ImportPlan) -> dict:
+        """Returns {"imported": [namespaces], "failed": [(namespace, error)]}."""
+        result = {"imported": [], "failed": []}
+        if not plan.steps:
+            return result
+
+        local_paths = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(plan.files))) as pool:
+            futures = {} # submitted in import order, so the first imports wait the least
+            for step in plan.steps:
+                if step.path not in futures:
+                    futures[step.path] = pool.submit(self.fetch, step.path, plan.files[step.path]["digest"])
+            for step in plan.steps:
+                try:
+                    local_path = futures[step.path].result()
+                except Exception as e:
+                    local_path = step.path # fetching failed, the published file is still there
+                    print(f"[WARN] Could not fetch {step.path}: {e}")
+                local_paths[step.path] = local_path
+
+                try:
+                    self.import_step(step, local_path)
+                    result["imported"].append(step.namespace)
+                except Exception as e:
+                    print(f"[ERROR] Failed to import {step.name} from {local_path}: {e}")
+                    result["failed"].append((step.namespace, str(e)))
+
+        self.finish(local_paths)
+        return result
+
+
+class StubImportExecutor(ImportExecutor):
+    """
+    Records what would be imported instead of calling Maya, for benchmarks and dry runs.
+    fetch_seconds / import_seconds simulate the time each fetch and import takes.
+    """
+
+    def __init__(self, workers: int = 4, fetch_seconds: float = 0.0, import_seconds: float = 0.0):
+        super().__init__(workers)
+        self.fetch_seconds = fetch_seconds
+        self.import_seconds = import_seconds
+        self.fetched = []
+        self.imported = []
+
+    def fetch(self, path: str, digest: str | None) -> str:
+        if self.fetch_seconds:
+            time.sleep(self.fetch_seconds)
+        self.fetched.append(path) # list.append is atomic
+        return path
+
+    def import_step(self, step: ImportStep, local_path: str):
+        if self.import_seconds:
+            time.sleep(self.import_seconds)
+        self.imported.append((step.namespace, local_path, step.file_type))
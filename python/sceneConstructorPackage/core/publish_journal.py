@@ -0,0 +1,75 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from .utils import DirectoryLock
+
+
+class PublishJournal:
+    """
+    Append-only JSON-lines log of publishes, stored under ASSET_PUBLISH_ROOT.
+    - Publishers append one line per publish.
+    - Readers remember the byte offset they have read up to and only read what
+      was appended since, which works on SMB/NFS mounts where inotify does not.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+
+    def append(self, record: dict) -> int:
+        """
+        Appends a record and returns the byte offset it was written at.
+        Writers are serialised with a directory lock so lines never interleave.
+        """
+        record = dict(record)
+        record.setdefault("time", datetime.now().isoformat(timespec="seconds"))
+        line = (json.dumps(record, sort_keys=True) + "\n").encode("utf-8")
+
+        with DirectoryLock(self.lock_path):
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        return offset
+
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def read_since(self, offset: int) -> tuple[list, int, bool]:
+        """
+        Reads the records appended after 'offset'.
+        Returns (records, new_offset, truncated). 'truncated' is True if the journal
+        shrank below 'offset' (rotated or replaced), in which case reading restarts
+        from 0 and the caller should reconcile with a full scan.
+        A trailing line without newline is a write in progress and is left for next time.
+        """
+        size = self.size()
+        truncated = size < offset
+        if truncated:
+            offset = 0
+        if size == offset:
+            return [], offset, truncated
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+        except OSError as e:
+            print(f"[ERROR] Could not read publish journal {self.path}: {e}")
+            return [], offset, truncated
+
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"[WARN] Skipping corrupt publish journal line: {line[:80]!r}")
+        return records, offset + end, truncated
@@ -0,0 +1,119 @@
+import json
+import os
+from pathlib import Path
+from .publish_scanner import SKIPPED_DEPARTMENTS
+from .utils import atomic_write_json
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = "_manifest.json"
+
+# verify_version() statuses; everything but 'ok' is a problem
+STATUS_OK = "ok"
+STATUS_INCOMPLETE = "incomplete"   # no meta: the publish never finished
+STATUS_NO_MANIFEST = "no_manifest" # published before manifests existed, nothing to check against
+STATUS_MISSING = "missing"         # files listed in the manifest are gone
+STATUS_DAMAGED = "damaged"         # files differ in size, mtime (fast mode) or digest
+
+
+def manifest_path(version_dir, base_name: str) -> Path:
+    return Path(version_dir) / f"{base_name}{MANIFEST_SUFFIX}"
+
+
+def build_manifest(version_dir, checksums: dict) -> dict:
+    """
+    The manifest of a version dir: size, mtime and sha256 of every file in checksums
+    ({file name: sha256}, as PublishTransaction computes them while copying).
+    """
+    version_dir = Path(version_dir)
+    files = {}
+    for name, checksum in sorted(checksums.items()):
+        stat = os.stat(version_dir / name)
+        files[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": checksum}
+    return {"version": MANIFEST_VERSION, "files": files}
+
+
+def write_manifest(version_dir, base_name: str, checksums: dict) -> dict:
+    manifest = build_manifest(version_dir, checksums)
+    atomic_write_json(manifest_path(version_dir, base_name), manifest, indent=4)
+    return manifest
+
+
+def read_manifest(version_dir) -> dict | None:
+    """The manifest found in a version dir, or None (no or unreadable manifest)."""
+    try:
+        with os.scandir(version_dir) as it:
+            names = [e.name for e in it if e.name.endswith(MANIFEST_SUFFIX) and not e.name.startswith('.')]
+    except OSError:
+        return None
+    if not names:
+        return None
+    try:
+        with open(Path(version_dir) / names[0], 'r') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"[WARN] Could not read manifest in {version_dir}: {e}")
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def has_meta(version_dir) -> bool:
+    try:
+        with os.scandir(version_dir) as it:
+            return any(e.name.endswith("_meta.json") and not e.name.startswith('.') for e in it)
+    except OSError:
+        return False
+
+
+def iter_version_dirs(root):
+    """Every <asset>/<department>/PUBLISH/<version> dir under root (hidden staging/reserved dirs excluded)."""
+    for asset in os.scandir(root):
+        if not asset.is_dir() or asset.name.startswith('.'):
+            continue
+        for department in os.scandir(asset.path):
+            if not department.is_dir() or department.name in SKIPPED_DEPARTMENTS:
+                continue
+            publish_dir = os.path.join(department.path, "PUBLISH")
+            if not os.path.isdir(publish_dir):
+                continue
+            for version in os.scandir(publish_dir):
+                if version.is_dir() and not version.name.startswith('.'):
+                    yield Path(version.path)
+
+
+def check_files(version_dir, manifest: dict, fast: bool = False) -> tuple[dict, list]:
+    """
+    The stat pass of a verification.
+    Returns ({file name: problem}, [files still to hash]); fast mode compares
+    size and mtime only and never asks for a hash.
+    """
+    problems = {}
+    to_hash = []
+    for name, entry in manifest.get("files", {}).items():
+        try:
+            stat = os.stat(Path(version_dir) / name)
+        except FileNotFoundError:
+            problems[name] = "missing"
+            continue
+        except OSError as e:
+            problems[name] = f"unreadable: {e}"
+            continue
+        if stat.st_size != entry.get("size"):
+            problems[name] = f"size {stat.st_size} != {entry.get('size')}"
+        elif fast:
+            if stat.st_mtime_ns != entry.get("mtime_ns"):
+                problems[name] = "modified"
+        else:
+            to_hash.append(name)
+    return problems, to_hash
+
+
+def version_status(has_meta_file: bool, manifest: dict | None, problems: dict) -> str:
+    if not has_meta_file:
+        return STATUS_INCOMPLETE
+    if manifest is None:
+        return STATUS_NO_MANIFEST
+    if any(problem == "missing" for problem in problems.values()):
+        return STATUS_MISSING
+    if problems:
+        return STATUS_DAMAGED
+    return STATUS_OK
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .. import config
+from .publish_manifest import manifest_path, write_manifest
+from .utils import atomic_write_json
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_checksum(path) -> str:
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_with_checksum(source, destination, on_bytes=None) -> str:
+    """
+    Copies a file and returns the sha256 of what was read.
+    on_bytes(n) is called after each chunk, for progress.
+    """
+    digest = hashlib.sha256()
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            dst.write(chunk)
+            if on_bytes is not None:
+                on_bytes(len(chunk))
+        dst.flush()
+        os.fsync(dst.fileno())
+    shutil.copystat(source, destination)
+    return digest.hexdigest()
+
+
+class PublishTransaction:
+    """
+    One publish, staged so the share never holds a half-written version:
+    1. the caller writes every artifact to a local scratch dir (scratch_path()),
+    2. commit() copies them in parallel, with checksums, into a hidden staging dir
+       next to the versions,
+    3. renames the staging dir to vNNN in one step,
+    4. writes the manifest (file sizes, mtimes, digests) and then the meta, last.
+    Meta paths are recorded with final_path(). Holds a VersionReservation, released
+    when the commit is done. On failure the staging dir is removed and the scratch
+    dir is kept, so the export is not lost.
+    With a BlobStore (config.PUBLISH_DEDUPLICATE) files go to the store instead and
+    the staging dir links to them; only content the store lacks is transferred.
+    """
+
+    def __init__(self, reservation, base_name: str, blob_store=None):
+        self.reservation = reservation
+        self.base_name = base_name
+        self.blob_store = blob_store
+        if blob_store is None and config.PUBLISH_DEDUPLICATE:
+            from .blob_store import BlobStore
+            self.blob_store = BlobStore()
+        self.final_dir = reservation.path
+        self.staging_dir = reservation.publish_dir / f".{reservation.version}.staging.{uuid.uuid4().hex[:8]}"
+
+        scratch_root = Path(config.PUBLISH_SCRATCH_ROOT)
+        scratch_root.mkdir(parents=True, exist_ok=True)
+        self.scratch_dir = Path(tempfile.mkdtemp(prefix=f"{base_name}_", dir=scratch_root))
+
+    def scratch_path(self, file_name: str) -> Path:
+        """Where stage 1 writes an artifact."""
+        return self.scratch_dir / file_name
+
+    def final_path(self, file_name: str) -> Path:
+        """Where an artifact ends up once published (what the meta records)."""
+        return self.final_dir / file_name
+
+    @property
+    def meta_path(self) -> Path:
+        return self.final_dir / f"{self.base_name}_meta.json"
+
+    def files(self) -> list[Path]:
+        return sorted(p for p in self.scratch_dir.iterdir() if p.is_file())
+
+    def commit(self, meta: dict, progress=None, workers: int | None = None) -> dict:
+        """
+        Stages 2-4. Blocking, meant for a worker thread.
+        progress(bytes_done, bytes_total) is called from the transfer threads.
+        Returns the meta as written, with the file checksums (sha256, the blob digests
+        when deduplicating) added, and the files that reused a stored blob.
+        """
+        try:
+            checksums, reused = self._transfer(progress, workers or config.PUBLISH_TRANSFER_WORKERS)
+            # the reservation is what keeps vNNN unique; this only catches a version created
+            # without one (os.rename would silently replace an empty dir on POSIX)
+            if self.final_dir.exists():
+                raise FileExistsError(f"{self.final_dir} already exists")
+            os.rename(self.staging_dir, self.final_dir)
+            write_manifest(self.final_dir, self.base_name, checksums)
+            meta = dict(meta, checksums=checksums, manifest=str(manifest_path(self.final_dir, self.base_name)))
+            if self.blob_store is not None:
+                meta["deduplicated"] = reused
+            atomic_write_json(self.meta_path, meta, indent=4)
+        except BaseException:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            print(f"[ERROR] Publish of {self.base_name} failed, the local export is kept in {self.scratch_dir}")
+            raise
+        finally:
+            self.reservation.release()
+
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        return meta
+
+    def abort(self):
+        """Gives the version back and drops the scratch dir (before commit)."""
+        self.reservation.release()
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    def _transfer(self, progress, workers: int) -> tuple[dict, list]:
+        files = self.files()
+        total = sum(p.stat().st_size for p in files)
+        done = 0
+        lock = threading.Lock()
+
+        def on_bytes(n):
+            nonlocal done
+            with lock:
+                done += n
+                current = done
+            if progress is not None:
+                progress(current, total)
+
+        def transfer(source: Path) -> tuple[str, str, bool]:
+            destination = self.staging_dir / source.name
+            if self.blob_store is not None:
+                digest, stored = self.blob_store.put(source, on_bytes)
+                self.blob_store.link(digest, destination)
+                return source.name, digest, not stored
+            checksum = copy_with_checksum(source, destination, on_bytes)
+            if config.PUBLISH_VERIFY_TRANSFER and file_checksum(destination) != checksum:
+                raise OSError(f"Checksum mismatch after copying {source.name} to {self.staging_dir}")
+            return source.name, checksum, False
+
+        self.staging_dir.mkdir()
+        if progress is not None:
+            progress(0, total)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+            results = list(pool.map(transfer, files))
+        checksums = {name: checksum for name, checksum, _ in results}
+        reused = [name for name, _, is_reused in results if is_reused]
+        return checksums, reused
@@ -0,0 +1,205 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from .. import config
+from .version_index import sort_versions
+
+SKIPPED_DEPARTMENTS = ("WORK", "REF")
+
+
+def read_version_meta(version_dir: Path, asset_name: str) -> dict | None:
+    """
+    Reads the *_meta.json of a published version directory.
+    Returns None if there is no readable meta file.
+    """
+    meta_path = None
+    try:
+        with os.scandir(version_dir) as it:
+            for entry in it:
+                if entry.name.endswith("_meta.json") and not entry.name.startswith('.'):
+                    meta_path = entry.path
+                    break
+    except OSError:
+        return None
+
+    if meta_path is None:
+        return None
+
+    try:
+        with open(meta_path, 'r') as f:
+            meta_data = json.load(f)
+    except Exception as e:
+        print(f"[ERROR] Could not read {meta_path}: {e}")
+        return None
+    if not isinstance(meta_data, dict):
+        print(f"[WARN] Skipping {meta_path}: not a JSON object")
+        return None
+
+    meta_data['name'] = asset_name
+    return meta_data
+
+
+def is_loadable(meta_data: dict) -> bool:
+    """True if the meta points at a file that exists on disk."""
+    loadable_path_str = meta_data.get('path')
+    return bool(loadable_path_str) and os.path.exists(loadable_path_str)
+
+
+def _stat_mtime(path) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _list_dirs(path) -> list[str]:
+    """Directory names under path. DirEntry.is_dir() comes from the listing itself, no extra stat."""
+    with os.scandir(path) as it:
+        return [entry.name for entry in it if entry.is_dir()]
+
+
+def scan_department(asset_dir: Path, department: str, known: dict | None = None) -> dict:
+    """
+    Scans [Asset]/[Department]/PUBLISH.
+
+    'known' is the previously catalogued state of the department
+    ({'publish_mtime', 'latest', 'has_meta'}); if PUBLISH has not moved since,
+    the result is {'unchanged': True} and nothing is listed.
+
+    Otherwise returns {'publish_mtime', 'versions', 'latest', 'meta', 'meta_read', 'loadable'},
+    with 'publish_mtime' None when there is no PUBLISH dir.
+    """
+    asset_name = Path(asset_dir).name
+    publish_dir = Path(asset_dir) / department / "PUBLISH"
+    publish_mtime = _stat_mtime(publish_dir)
+
+    if publish_mtime is None:
+        return {'publish_mtime': None, 'versions': [], 'latest': None,
+                'meta': None, 'meta_read': False, 'loadable': False}
+
+    # A version dir is created before its meta is written, so a latest
+    # version without meta is re-checked even if PUBLISH did not move.
+    if known and known.get('publish_mtime') == publish_mtime:
+        if not known.get('latest') or known.get('has_meta'):
+            return {'unchanged': True}
+
+    try:
+        versions = sort_versions(d for d in _list_dirs(publish_dir) if d.startswith('v'))
+    except OSError as e:
+        print(f"[ERROR] Could not list versions for {asset_name}/{department}: {e}")
+        return {'unchanged': True}
+
+    latest = versions[-1] if versions else None
+    result = {'publish_mtime': publish_mtime, 'versions': versions, 'latest': latest,
+              'meta': None, 'meta_read': False, 'loadable': False}
+
+    already_read = known and known.get('latest') == latest and known.get('has_meta')
+    if latest and not already_read:
+        result['meta'] = read_version_meta(publish_dir / latest, asset_name)
+        result['meta_read'] = True
+        if result['meta'] is None:
+            print(f"[WARN] Skipping {asset_name}/{department}: No _meta.json found in {publish_dir / latest}")
+        elif is_loadable(result['meta']):
+            result['loadable'] = True
+        else:
+            print(f"[WARN] Skipping {asset_name}/{department}: 'path' in meta.json is missing or invalid.")
+
+    return result
+
+
+def scan_asset(asset_dir: Path, mtime: float | None = None, known: dict | None = None) -> dict:
+    """
+    Scans one [Asset] directory and all of its departments.
+
+    'known' is the previously catalogued state of the asset ({'mtime', 'departments'});
+    when the asset dir mtime still matches, its departments are not re-listed.
+
+    Returns {'asset', 'mtime', 'listed', 'departments': {department: scan_department(...)}}.
+    """
+    asset_dir = Path(asset_dir)
+    known = known or {}
+    known_departments = known.get('departments', {})
+    if mtime is None:
+        mtime = _stat_mtime(asset_dir)
+
+    result = {'asset': asset_dir.name, 'mtime': mtime, 'listed': False, 'departments': {}}
+
+    if mtime is not None and mtime == known.get('mtime'):
+        departments = list(known_departments)
+    else:
+        try:
+            departments = [d for d in _list_dirs(asset_dir) if d not in SKIPPED_DEPARTMENTS]
+        except OSError as e:
+            print(f"[ERROR] Could not list {asset_dir}: {e}")
+            return result
+        result['listed'] = True
+
+    for department in departments:
+        result['departments'][department] = scan_department(
+            asset_dir, department, known_departments.get(department)
+        )
+    return result
+
+
+class PublishScanner:
+    """
+    Walks ASSET_PUBLISH_ROOT with os.scandir, fanning out across
+    asset directories on a bounded thread pool.
+    The work is dominated by NAS round-trips, so threads overlap the waits.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max(1, max_workers or config.SCAN_WORKERS)
+
+    def list_assets(self, root: Path) -> dict:
+        """Returns {asset_name: mtime} for every asset directory under root."""
+        assets = {}
+        with os.scandir(root) as it:
+            for entry in it:
+                # hidden entries (journal, lock dirs...) are bookkeeping, not assets
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                try:
+                    assets[entry.name] = entry.stat().st_mtime
+                except OSError:
+                    assets[entry.name] = None
+        return assets
+
+    def iter_scan_assets(self, root: Path, assets: dict, known: dict | None = None):
+        """
+        Scans the given {asset_name: mtime} in parallel and yields
+        scan_asset() results in completion order.
+        """
+        root = Path(root)
+        known = known or {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(scan_asset, root / name, mtime, known.get(name))
+                for name, mtime in assets.items()
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Consumer stopped early: drop whatever has not started yet.
+                for future in futures:
+                    future.cancel()
+
+    def scan(self, root: Path) -> list:
+        """
+        Full uncached scan. Returns the latest loadable meta of every
+        asset department, sorted by (name, department).
+        """
+        found_assets = []
+        for result in self.iter_scan_assets(root, self.list_assets(root)):
+            found_assets.extend(actors_from_scan(result))
+        return sorted(found_assets, key=lambda x: (x.get('name', ''), x.get('department', '')))
+
+
+def actors_from_scan(result: dict) -> list:
+    """Returns the loadable latest-version metas contained in a scan_asset() result."""
+    return [
+        dept['meta'] for dept in result['departments'].values()
+        if dept.get('loadable')
+    ]
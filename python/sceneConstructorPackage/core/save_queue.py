@@ -0,0 +1,133 @@
+import copy
+import threading
+import time
+
+
+class SaveQueue:
+    """
+    Coalescing background writer.
+    - submit() only records the latest payload per key; the write happens on a worker
+      thread once the key has been quiet for 'delay' seconds, so a burst of edits
+      becomes one write.
+    - pending() lets readers see a payload that has not been written yet.
+    - flush() writes pending keys now, optionally waiting for them.
+    """
+
+    def __init__(self, writer, delay: float = 0.75):
+        self.writer = writer # writer(key, payload), called on the worker thread
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending = {} # key -> (due_time, payload, on_done)
+        self._in_flight = set()
+        self._closed = False
+        self._thread = None
+
+    def submit(self, key, payload, on_done=None):
+        """
+        Queues 'payload' (copied) to be written under 'key'. Replaces anything still pending.
+        on_done(key, payload, error) is called on the worker thread after the write.
+        """
+        payload = copy.deepcopy(payload)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SaveQueue is closed")
+            self._pending[key] = (time.monotonic() + self.delay, payload, on_done)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def pending(self, key):
+        """Returns a copy of the payload waiting (or being written) for 'key', or None."""
+        with self._cond:
+            entry = self._pending.get(key)
+            return copy.deepcopy(entry[1]) if entry else None
+
+    def is_idle(self) -> bool:
+        with self._cond:
+            return not self._pending and not self._in_flight
+
+    def flush(self, key=None, wait: bool = True, timeout: float | None = None) -> bool:
+        """
+        Makes pending writes (all, or only 'key') due now.
+        With wait=True, blocks until they are written. Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            now = time.monotonic()
+            for k, (due, payload, on_done) in list(self._pending.items()):
+                if key is None or k == key:
+                    self._pending[k] = (min(due, now), payload, on_done)
+            self._cond.notify_all()
+
+            if not wait:
+                return True
+
+            def busy():
+                if key is None:
+                    return bool(self._pending or self._in_flight)
+                return key in self._pending or key in self._in_flight
+
+            while busy():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Writes everything still pending and stops the worker thread."""
+        flushed = self.flush(timeout=timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return flushed
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="SaveQueue", daemon=True)
+            self._thread.start()
+
+    def _next_due(self):
+        """Returns (key, wait_seconds) of the earliest pending write, or (None, None)."""
+        if not self._pending:
+            return None, None
+        key = min(self._pending, key=lambda k: self._pending[k][0])
+        return key, max(0.0, self._pending[key][0] - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    key, wait_for = self._next_due()
+                    if key is not None and wait_for == 0:
+                        break
+                    if key is None and self._closed:
+                        return
+                    self._cond.wait(wait_for)
+
+                _, payload, on_done = self._pending[key]
+                self._in_flight.add(key)
+
+            error = None
+            try:
+                self.writer(key, payload)
+            except Exception as e:
+                error = e
+                print(f"[ERROR] Background save of {key} failed: {e}")
+
+            # before the write counts as finished, so flush() returns after the callback ran
+            if on_done is not None:
+                try:
+                    on_done(key, payload, error)
+                except Exception as e:
+                    print(f"[ERROR] Save callback for {key} failed: {e}")
+
+            with self._cond:
+                # only drop the entry if nothing newer was submitted during the write
+                entry = self._pending.get(key)
+                if entry is not None and entry[1] is payload:
+                    del self._pending[key]
+                self._in_flight.discard(key)
+                self._cond.notify_all()
@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+# Directory mtimes this close to "now" may still change within the same timestamp tick
+# (coarse on SMB/FAT), so they are not trusted and the directory is listed again next time.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _dir_mtime(path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _trusted(mtime_ns: int | None) -> int | None:
+    if mtime_ns is None or time.time_ns() - mtime_ns < _RACY_WINDOW_NS:
+        return None
+    return mtime_ns
+
+
+def _list_dirs(path) -> list[str]:
+    try:
+        with os.scandir(path) as it:
+            return [entry.name for entry in it if entry.is_dir()]
+    except OSError:
+        return []
+
+
+def _scan_shot(shot_dir: str) -> dict:
+    """Finds the shot's SceneConstructor JSON (first *.json) and its size/mtime."""
+    sc_dir = os.path.join(shot_dir, 'SceneConstructor')
+    info = {
+        'mtime': _trusted(_dir_mtime(shot_dir)),
+        'sc_mtime': None,
+        'json_path': None,
+        'json_size': None,
+        'json_mtime': None,
+    }
+    try:
+        with os.scandir(sc_dir) as it:
+            info['sc_mtime'] = _trusted(_dir_mtime(sc_dir))
+            for entry in it:
+                if entry.name.lower().endswith('.json') and entry.is_file():
+                    st = entry.stat()
+                    info['json_path'] = entry.path
+                    info['json_size'] = st.st_size
+                    info['json_mtime'] = st.st_mtime_ns
+                    break
+    except OSError:
+        pass
+    return info
+
+
+class SceneIndex:
+    """
+    In-memory index of SCENE_ROOT: scenes, their shots, and each shot's SceneConstructor JSON.
+    - build() walks the tree once with scandir.
+    - Queries revalidate lazily: a directory is only listed again when its mtime moved,
+      so a dropdown change costs a stat or two instead of an iterdir.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        self._root_mtime = None
+        self._scenes = None # scene -> {'mtime': ns, 'shots': {shot: info}}; None until built
+
+    def build(self):
+        """Full walk of SCENE_ROOT."""
+        root_mtime = _trusted(_dir_mtime(self.root))
+        scenes = {name: self._scan_scene(name) for name in _list_dirs(self.root)}
+        with self._lock:
+            self._root_mtime = root_mtime
+            self._scenes = scenes
+
+    def revalidate(self):
+        """Re-lists only the scene/shot directories whose mtime changed since they were indexed."""
+        with self._lock:
+            self._revalidate_root()
+            for scene_name in list(self._scenes):
+                self._revalidate_scene(scene_name)
+                for shot_name in list(self._scenes[scene_name]['shots']):
+                    self._revalidate_shot(scene_name, shot_name)
+
+    def scenes(self) -> list[str]:
+        with self._lock:
+            self._revalidate_root()
+            return sorted(self._scenes)
+
+    def shots(self, scene_name: str) -> list[str]:
+        with self._lock:
+            self._revalidate_root()
+            if not self._revalidate_scene(scene_name):
+                return []
+            return sorted(self._scenes[scene_name]['shots'])
+
+    def shot_info(self, scene_name: str, shot_name: str) -> dict | None:
+        """
+        Returns a copy of {'json_path', 'json_size', 'json_mtime', ...} for a shot,
+        or None if the shot does not exist.
+        """
+        with self._lock:
+            self._revalidate_root()
+            if not self._revalidate_scene(scene_name):
+                return None
+            if not self._revalidate_shot(scene_name, shot_name):
+                return None
+            return dict(self._scenes[scene_name]['shots'][shot_name])
+
+    def update_shot(self, scene_name: str, shot_name: str):
+        """Re-reads one shot right away, e.g. after saving its JSON."""
+        with self._lock:
+            if self._scenes is None:
+                return
+            scene = self._scenes.get(scene_name)
+            if scene is None:
+                self._scenes[scene_name] = self._scan_scene(scene_name)
+                return
+            shot_dir = self.root / scene_name / shot_name
+            if shot_dir.is_dir():
+                scene['shots'][shot_name] = _scan_shot(str(shot_dir))
+            else:
+                scene['shots'].pop(shot_name, None)
+
+    def _scan_scene(self, scene_name: str) -> dict:
+        scene_dir = self.root / scene_name
+        return {
+            'mtime': _trusted(_dir_mtime(scene_dir)),
+            'shots': {name: _scan_shot(str(scene_dir / name)) for name in _list_dirs(scene_dir)},
+        }
+
+    def _revalidate_root(self):
+        if self._scenes is None:
+            self.build()
+            return
+
+        mtime = _dir_mtime(self.root)
+        if mtime is not None and mtime == self._root_mtime:
+            return
+
+        names = set(_list_dirs(self.root))
+        for scene_name in [s for s in self._scenes if s not in names]:
+            del self._scenes[scene_name]
+        for scene_name in names:
+            if scene_name not in self._scenes:
+                self._scenes[scene_name] = self._scan_scene(scene_name)
+        self._root_mtime = _trusted(mtime)
+
+    def _revalidate_scene(self, scene_name: str) -> bool:
+        scene = self._scenes.get(scene_name)
+        if scene is None:
+            return False
+
+        scene_dir = self.root / scene_name
+        mtime = _dir_mtime(scene_dir)
+        if mtime is None:
+            del self._scenes[scene_name]
+            return False
+        if mtime == scene['mtime']:
+            return True
+
+        names = set(_list_dirs(scene_dir))
+        shots = scene['shots']
+        for shot_name in [s for s in shots if s not in names]:
+            del shots[shot_name]
+        for shot_name in names:
+            if shot_name not in shots:
+                shots[shot_name] = _scan_shot(str(scene_dir / shot_name))
+        scene['mtime'] = _trusted(mtime)
+        return True
+
+    def _revalidate_shot(self, scene_name: str, shot_name: str) -> bool:
+        shots = self._scenes[scene_name]['shots']
+        info = shots.get(shot_name)
+        if info is None:
+            return False
+
+        shot_dir = self.root / scene_name / shot_name
+        mtime = _dir_mtime(shot_dir)
+        if mtime is None:
+            del shots[shot_name]
+            return False
+
+        # the JSON is (re)created inside SceneConstructor/, which moves that dir's mtime
+        sc_mtime = _dir_mtime(shot_dir / 'SceneConstructor')
+        if mtime != info['mtime'] or sc_mtime is None or sc_mtime != info['sc_mtime']:
+            shots[shot_name] = _scan_shot(str(shot_dir))
+            return True
+
+        # in-place edits only move the file itself
+        if info['json_path']:
+            try:
+                st = os.stat(info['json_path'])
+                info['json_size'] = st.st_size
+                info['json_mtime'] = st.st_mtime_ns
+            except OSError:
+                shots[shot_name] = _scan_shot(str(shot_dir))
+        return True
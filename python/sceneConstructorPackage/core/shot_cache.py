@@ -0,0 +1,65 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_key(path) -> tuple | None:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ShotDocumentCache:
+    """
+    LRU cache of parsed shot JSON documents keyed by (scene, shot).
+    - An entry is only served while the file's mtime/size still match what was read.
+    - Documents are copied in and out, so callers can mutate what they get.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # (scene, shot) -> (path, file_key, data)
+
+    def get(self, scene_name: str, shot_name: str) -> tuple[str, dict] | None:
+        """Returns (path, data) if cached and unchanged on disk, else None."""
+        key = (scene_name, shot_name)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        path, cached_key, data = entry
+        if file_key(path) != cached_key:
+            self.invalidate(scene_name, shot_name)
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return path, copy.deepcopy(data)
+
+    def put(self, scene_name: str, shot_name: str, path: str, data: dict):
+        """Stores a document as just read from, or written to, 'path'."""
+        cached_key = file_key(path)
+        if cached_key is None:
+            return
+
+        key = (scene_name, shot_name)
+        with self._lock:
+            self._entries[key] = (str(path), cached_key, copy.deepcopy(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scene_name: str, shot_name: str):
+        with self._lock:
+            self._entries.pop((scene_name, shot_name), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
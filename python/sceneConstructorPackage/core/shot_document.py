@@ -0,0 +1,85 @@
+import copy
+
+
+def item_key(item: dict) -> tuple:
+    """(name, department) identifying an asset department in a shot."""
+    return (item.get('name'), item.get('department'))
+
+
+class ShotDocument:
+    """
+    The asset list of one shot, as stored in its SceneConstructor JSON under the
+    casefolded shot name.
+    - Items are kept in file order and looked up by (name, department) in O(1).
+    - Every edit bumps 'revision' and marks the document dirty until the revision
+      that was saved is confirmed written with mark_clean().
+    - Other top-level keys of the file are kept as they were.
+    """
+
+    def __init__(self, shot_name: str = "", data: dict | None = None):
+        self.shot_name = shot_name
+        self.shot_key = shot_name.casefold()
+        self._extra = {k: v for k, v in (data or {}).items() if k != self.shot_key}
+        self._items = {} # (name, department) -> item, in insertion (file) order
+        for item in (data or {}).get(self.shot_key, []):
+            key = item_key(item)
+            if key in self._items:
+                print(f"[WARN] Duplicate {key[0]} {key[1]} in shot {shot_name}, keeping the first.")
+                continue
+            self._items[key] = dict(item)
+
+        self.revision = 0
+        self._clean_revision = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    @property
+    def dirty(self) -> bool:
+        return self.revision != self._clean_revision
+
+    def items(self) -> list[dict]:
+        """Copies of the items, in file order."""
+        return [dict(item) for item in self._items.values()]
+
+    def get(self, name: str, department: str) -> dict | None:
+        item = self._items.get((name, department))
+        return dict(item) if item is not None else None
+
+    def add(self, item: dict) -> bool:
+        """Appends an item. Returns False if (name, department) is already in the shot."""
+        key = item_key(item)
+        if key in self._items:
+            return False
+        self._items[key] = dict(item)
+        self.revision += 1
+        return True
+
+    def replace(self, item: dict) -> bool:
+        """Replaces the item with the same (name, department), keeping its position."""
+        key = item_key(item)
+        if key not in self._items or self._items[key] == item:
+            return False
+        self._items[key] = dict(item)
+        self.revision += 1
+        return True
+
+    def remove(self, name: str, department: str) -> dict | None:
+        item = self._items.pop((name, department), None)
+        if item is not None:
+            self.revision += 1
+        return item
+
+    def to_dict(self) -> dict:
+        """The full JSON document, ready to be written."""
+        data = copy.deepcopy(self._extra)
+        if self.shot_key:
+            data[self.shot_key] = self.items()
+        return data
+
+    def mark_clean(self, revision: int | None = None):
+        """Marks 'revision' (default: the current one) as written to disk."""
+        self._clean_revision = self.revision if revision is None else revision
@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from .shot_cache import file_key
+from .shot_document import item_key
+from .utils import DirectoryLock
+
+# top-level key of a shot JSON snapshot: the last log record already folded into it
+SEQ_KEY = "edit_log_seq"
+
+
+def log_path(shot_json_path) -> Path:
+    """The edit log beside a shot JSON: x_scene_data.json -> x_scene_data.edits.jsonl"""
+    path = Path(shot_json_path)
+    return path.with_name(f"{path.stem}.edits.jsonl")
+
+
+def _is_item_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def diff_shot_data(old: dict, new: dict) -> list:
+    """
+    The edit records turning old into new shot data (without 'seq'):
+    {"op": "add", "key", "item"}, {"op": "replace", "key", "item"},
+    {"op": "remove", "key", "name", "department"} for the items of a shot list, and
+    {"op": "set", "key", "value"} / {"op": "unset", "key"} for anything else (including
+    a list whose order changed in a way add/remove can't express).
+    """
+    records = []
+    for key, value in new.items():
+        if key == SEQ_KEY:
+            continue
+        old_value = old.get(key)
+        if old_value == value:
+            continue
+        if not (_is_item_list(value) and _is_item_list(old_value)):
+            records.append({"op": "set", "key": key, "value": value})
+            continue
+
+        old_items = {item_key(item): item for item in old_value}
+        new_items = {item_key(item): item for item in value}
+        list_records = [
+            {"op": "remove", "key": key, "name": name, "department": department}
+            for name, department in old_items if (name, department) not in new_items
+        ]
+        for item in value:
+            ik = item_key(item)
+            if ik not in old_items:
+                list_records.append({"op": "add", "key": key, "item": item})
+            elif old_items[ik] != item:
+                list_records.append({"op": "replace", "key": key, "item": item})
+
+        # removes keep the order and adds append, so anything else needs the whole list
+        expected = [ik for ik in old_items if ik in new_items]
+        expected += [item_key(r["item"]) for r in list_records if r["op"] == "add"]
+        if expected == [item_key(item) for item in value] and len(new_items) == len(value):
+            records.extend(list_records)
+        else:
+            records.append({"op": "set", "key": key, "value": value})
+
+    for key in old:
+        if key not in new and key != SEQ_KEY:
+            records.append({"op": "unset", "key": key})
+    return records
+
+
+def apply_edit(data: dict, record: dict):
+    """Applies one edit record to shot data in place. Records are idempotent."""
+    op = record.get("op")
+    key = record.get("key")
+    if op == "set":
+        data[key] = record.get("value")
+    elif op == "unset":
+        data.pop(key, None)
+    elif op in ("add", "replace", "remove"):
+        items = data.setdefault(key, [])
+        if not isinstance(items, list):
+            return
+        if op == "remove":
+            target = (record.get("name"), record.get("department"))
+            data[key] = [item for item in items if item_key(item) != target]
+            return
+        item = record.get("item") or {}
+        for i, existing in enumerate(items):
+            if item_key(existing) == item_key(item):
+                items[i] = dict(item) # an add replayed twice lands here as well
+                return
+        if op == "add":
+            items.append(dict(item))
+
+
+def read_log(path) -> list:
+    """The records of an edit log, oldest first. A torn last line (crash mid-append) is ignored."""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    print(f"[WARN] Skipping unreadable record in {path}")
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def replay(data: dict, records: list, keys=None) -> dict:
+    """
+    Applies the records newer than the snapshot's SEQ_KEY to data (in place) and returns it,
+    without the SEQ_KEY. keys limits replay to those top-level keys (a partially read file).
+    """
+    snapshot_seq = data.pop(SEQ_KEY, 0) or 0
+    for record in records:
+        if record.get("seq", 0) > snapshot_seq and (keys is None or record.get("key") in keys):
+            apply_edit(data, record)
+    return data
+
+
+class ShotEditLog:
+    """
+    Append-only persistence of shot edits: saving appends what changed since the last
+    load/save (add, remove, replace of an asset department...) as JSON lines beside the
+    shot JSON, instead of rewriting the whole file. Loading replays the log onto the
+    snapshot. Once a log holds compact_after records, it is folded into the snapshot on
+    a background thread (snapshot first, marked with the last seq, then the log is removed),
+    so a crash at any point replays correctly.
+    read_snapshot(path, keys) and write_snapshot(path, data, partial) do the JSON file I/O;
+    partial data only replaces its own top-level keys of the file.
+    """
+
+    def __init__(self, read_snapshot, write_snapshot, compact_after: int = 200):
+        self.read_snapshot = read_snapshot
+        self.write_snapshot = write_snapshot
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._bases = {} # shot json path -> shot data the file + log currently hold, as we know it
+        self._snapshot_seqs = {} # shot json path -> (file_key of the snapshot, its SEQ_KEY)
+        self._compacting = set()
+
+    @staticmethod
+    def _file_lock(shot_json_path) -> DirectoryLock:
+        path = Path(shot_json_path)
+        return DirectoryLock(path.with_name(f".{path.name}.log.lock"), timeout=30.0)
+
+    def exists(self, shot_json_path) -> bool:
+        return log_path(shot_json_path).exists()
+
+    def remember(self, shot_json_path, data: dict):
+        """Records data as what the file + log hold (after a load or a full write)."""
+        with self._lock:
+            self._bases[str(shot_json_path)] = json.loads(json.dumps(data))
+
+    def load(self, shot_json_path, snapshot: dict, keys=None, snapshot_key=None) -> dict:
+        """
+        The snapshot with the log replayed onto it. snapshot_key is the file_key() of the
+        shot JSON taken before the snapshot was read: if the file did not change since,
+        its SEQ_KEY is kept, so the first save does not have to read it again.
+        """
+        seq_read = keys is None or SEQ_KEY in keys
+        if snapshot_key is not None and seq_read and snapshot_key == file_key(shot_json_path):
+            self._remember_seq(shot_json_path, snapshot_key, snapshot.get(SEQ_KEY, 0) or 0)
+        data = replay(snapshot, read_log(log_path(shot_json_path)), keys)
+        self.remember(shot_json_path, data)
+        return data
+
+    def _remember_seq(self, shot_json_path, snapshot_key, seq: int):
+        with self._lock:
+            self._snapshot_seqs[str(shot_json_path)] = (snapshot_key, seq)
+
+    def _snapshot_seq(self, shot_json_path) -> int:
+        """The SEQ_KEY of the shot JSON, read only when the file changed since it was last seen."""
+        path = str(shot_json_path)
+        current_key = file_key(path)
+        with self._lock:
+            known = self._snapshot_seqs.get(path)
+        if known is not None and known[0] == current_key:
+            return known[1]
+        seq = self.read_snapshot(path, [SEQ_KEY]).get(SEQ_KEY, 0) or 0
+        if current_key is not None and current_key == file_key(path):
+            self._remember_seq(path, current_key, seq)
+        return seq
+
+    def save(self, shot_json_path, data: dict) -> int:
+        """Appends the edits from the last known state to data. Returns the number of records."""
+        path = str(shot_json_path)
+        with self._lock:
+            base = self._bases.get(path)
+        if base is None:
+            keys = set(data)
+            snapshot_key = file_key(path)
+            base = self.load(path, self.read_snapshot(path, list(keys | {SEQ_KEY})),
+                             keys=keys | {SEQ_KEY}, snapshot_key=snapshot_key)
+            base = {key: value for key, value in base.items() if key in keys}
+
+        records = diff_shot_data(base, data)
+        if records:
+            author = os.environ.get('USERNAME') or os.environ.get('USER', '')
+            with self._file_lock(path):
+                existing = read_log(log_path(path))
+                seq = max((r.get("seq", 0) for r in existing), default=0)
+                if not existing:
+                    seq = max(seq, self._snapshot_seq(path))
+                lines = []
+                for record in records:
+                    seq += 1
+                    lines.append(json.dumps(dict(record, seq=seq, time=time.time(), user=author)))
+                with open(log_path(path), 'a', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                count = len(existing) + len(records)
+            if count >= self.compact_after:
+                self.compact_in_background(path)
+
+        self.remember(path, data)
+        return len(records)
+
+    def history(self, shot_json_path) -> list:
+        """Edit records not yet compacted away, oldest first."""
+        return read_log(log_path(shot_json_path))
+
+    def compact_in_background(self, shot_json_path):
+        path = str(shot_json_path)
+        with self._lock:
+            if path in self._compacting:
+                return
+            self._compacting.add(path)
+
+        def run():
+            try:
+                self.compact(path)
+            except Exception as e:
+                print(f"[ERROR] Could not compact the edit log of {path}: {e}")
+            finally:
+                with self._lock:
+                    self._compacting.discard(path)
+
+        threading.Thread(target=run, name="ShotLogCompaction", daemon=True).start()
+
+    def compact(self, shot_json_path):
+        """Folds the log into the snapshot and removes it."""
+        path = str(shot_json_path)
+        with self._file_lock(path):
+            records = read_log(log_path(path))
+            if not records:
+                return
+            # only the keys the log touches are read and replaced, unless one was removed:
+            # removing a key needs the whole file
+            keys = {record.get("key") for record in records}
+            whole = any(record.get("op") == "unset" for record in records)
+            data = self.read_snapshot(path, None if whole else list(keys | {SEQ_KEY}))
+            snapshot_seq = data.get(SEQ_KEY, 0) or 0
+            data = replay(data, records, None if whole else keys)
+            data[SEQ_KEY] = max([snapshot_seq] + [r.get("seq", 0) for r in records])
+            self.write_snapshot(path, data, partial=not whole)
+            self._remember_seq(path, file_key(path), data[SEQ_KEY])
+            os.remove(log_path(path))
+        print(f"[OK] Compacted {len(records)} shot edits into {path}")
@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from pathlib import Path
+from .shot_cache import file_key
+from .utils import atomic_write_json
+
+INDEX_VERSION = 1
+_COPY_CHUNK = 1024 * 1024
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+def index_path(path) -> Path:
+    """The sidecar holding the offset index of a shot file (hidden, next to it)."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.index")
+
+
+def scan_top_level(data: bytes) -> tuple[dict, int]:
+    """
+    Byte spans of the values of a top-level JSON object: ({key: (start, end)}, offset of
+    the closing brace). Values are walked by the C decoder; raises ValueError if data is
+    not a JSON object.
+    """
+    text = data.decode('utf-8')
+    char_spans = {}
+    pos = _skip(text, 0)
+    if text[pos:pos + 1] != '{':
+        raise ValueError("not a JSON object")
+    pos = _skip(text, pos + 1)
+    while text[pos:pos + 1] != '}':
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _skip(text, pos)
+        if text[pos:pos + 1] != ':':
+            raise ValueError(f"expected ':' at {pos}")
+        start = _skip(text, pos + 1)
+        _, end = _decoder.raw_decode(text, start)
+        char_spans[key] = (start, end)
+        pos = _skip(text, end)
+        if text[pos:pos + 1] == ',':
+            pos = _skip(text, pos + 1)
+        elif text[pos:pos + 1] != '}':
+            raise ValueError(f"expected ',' or '}}' at {pos}")
+
+    if text.isascii():
+        return char_spans, pos
+
+    # character offsets -> byte offsets, encoding each stretch between two offsets once
+    offsets = sorted({offset for span in char_spans.values() for offset in span} | {pos})
+    byte_offsets = {}
+    char_position = byte_position = 0
+    for offset in offsets:
+        byte_position += len(text[char_position:offset].encode('utf-8'))
+        char_position = offset
+        byte_offsets[offset] = byte_position
+    return {key: (byte_offsets[s], byte_offsets[e]) for key, (s, e) in char_spans.items()}, byte_offsets[pos]
+
+
+def _skip(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _dump_value(value, indent: int) -> bytes:
+    # nested one level deep, as json.dump(indent=indent) would write it
+    text = json.dumps(value, indent=indent)
+    if indent:
+        text = text.replace("\n", "\n" + " " * indent)
+    return text.encode('utf-8')
+
+
+class ShotFileIndex:
+    """
+    Offset index of the top-level keys of shot JSON files (shot name -> [items]), so one
+    shot of a big multi-shot file can be read, or replaced, without parsing the others.
+    - The index is kept in memory and in a hidden sidecar (index_path()), valid while the
+      file's mtime and size match. Without a valid one the file is scanned once.
+    - replace() copies the bytes of the other shots through untouched; only the new values
+      are serialized, and the new index is written without a rescan.
+    Files stay plain JSON: json.load and older tools read them as before.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {} # path -> (file_key, spans, closing brace offset)
+
+    def spans(self, path) -> tuple[dict, int]:
+        path = str(path)
+        current_key = file_key(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == current_key:
+            return entry[1], entry[2]
+
+        stored = self._read_sidecar(path, current_key)
+        if stored is not None:
+            spans, end = stored
+        else:
+            with open(path, 'rb') as f:
+                data = f.read()
+            spans, end = scan_top_level(data)
+            if current_key is not None and current_key == file_key(path):
+                self._write_sidecar(path, current_key, spans, end)
+        if current_key is not None:
+            with self._lock:
+                self._entries[path] = (current_key, spans, end)
+        return spans, end
+
+    def keys(self, path) -> list:
+        return list(self.spans(path)[0])
+
+    def read(self, path, keys) -> dict:
+        """{key: value} for the requested top-level keys that are in the file."""
+        spans, _ = self.spans(path)
+        result = {}
+        with open(path, 'rb') as f:
+            for key in keys:
+                if key not in spans:
+                    continue
+                start, end = spans[key]
+                f.seek(start)
+                result[key] = json.loads(f.read(end - start))
+        return result
+
+    def replace(self, path, values: dict, indent: int = 4):
+        """
+        Writes values over their top-level keys (appending keys the file does not have yet),
+        through a temp file and a rename. Keys not in values are copied byte for byte.
+        """
+        path = Path(path)
+        spans, end = self.spans(path)
+        # (start, stop, [(key or None, bytes)]): key marks the bytes that are that key's new value
+        edits = sorted((spans[key][0], spans[key][1], [(key, _dump_value(value, indent))])
+                       for key, value in values.items() if key in spans)
+        new_keys = [key for key in values if key not in spans]
+        if new_keys:
+            if spans:
+                # after the last value: "...last value,\n    "key": value" and the original "\n}" follows
+                insert_at, pieces = max(span[1] for span in spans.values()), [(None, b",\n")]
+            else:
+                insert_at, pieces = end, [(None, b"\n")]
+            for i, key in enumerate(new_keys):
+                prefix = b",\n" if i else b""
+                pieces.append((None, prefix + b" " * indent + json.dumps(key).encode('utf-8') + b": "))
+                pieces.append((key, _dump_value(values[key], indent)))
+            if not spans:
+                pieces.append((None, b"\n"))
+            edits.append((insert_at, insert_at, pieces))
+
+        new_spans = {}
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+                position = 0
+                for start, stop, pieces in edits:
+                    self._copy_spans(spans, position, start, dst.tell() - position, new_spans)
+                    _copy_range(src, dst, position, start)
+                    for key, piece in pieces:
+                        if key is not None:
+                            new_spans[key] = (dst.tell(), dst.tell() + len(piece))
+                        dst.write(piece)
+                    position = stop
+                self._copy_spans(spans, position, None, dst.tell() - position, new_spans)
+                new_end = end + dst.tell() - position
+                _copy_range(src, dst, position, None)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+        new_key = file_key(path)
+        ordered = {key: new_spans[key] for key in sorted(new_spans, key=lambda k: new_spans[k][0])}
+        with self._lock:
+            self._entries[str(path)] = (new_key, ordered, new_end)
+        self._write_sidecar(str(path), new_key, ordered, new_end)
+
+    @staticmethod
+    def _copy_spans(spans: dict, start: int, stop: int | None, shift: int, new_spans: dict):
+        # spans of keys copied unchanged from [start, stop) of the old file, moved by shift
+        for key, (s, e) in spans.items():
+            if s >= start and (stop is None or e <= stop) and key not in new_spans:
+                new_spans[key] = (s + shift, e + shift)
+
+    def forget(self, path):
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+    @staticmethod
+    def _read_sidecar(path: str, current_key) -> tuple[dict, int] | None:
+        if current_key is None:
+            return None
+        try:
+            with open(index_path(path), 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get('version') != INDEX_VERSION or stored.get('file_key') != list(current_key):
+            return None
+        return {key: tuple(span) for key, span in stored['spans'].items()}, stored['end']
+
+    @staticmethod
+    def _write_sidecar(path: str, current_key, spans: dict, end: int):
+        # only a speed-up: a missing or stale sidecar means one more scan
+        try:
+            atomic_write_json(index_path(path), {
+                'version': INDEX_VERSION, 'file_key': list(current_key), 'end': end,
+                'spans': {key: list(span) for key, span in spans.items()},
+            }, indent=None)
+        except OSError as e:
+            print(f"[WARN] Could not write shot file index for {path}: {e}")
+
+
+def _copy_range(src, dst, start: int, stop: int | None):
+    src.seek(start)
+    remaining = None if stop is None else stop - start
+    while remaining is None or remaining > 0:
+        chunk = src.read(_COPY_CHUNK if remaining is None else min(_COPY_CHUNK, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
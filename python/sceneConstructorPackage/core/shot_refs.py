@@ -0,0 +1,85 @@
+"""
+Compact shot files: shot items stored as (name, department, version) references
+instead of full copies of the publish meta, resolved in bulk when the file is read.
+
+    {"format": "refs", "sh010": [{"name": "chair", "department": "MDL", "version": "v003"}, ...]}
+
+A reference may carry extra keys: anything the item had that differs from the meta
+it resolves to (shot-level overrides, which win over the meta when reading). Items that
+could not be resolved when saving are written in full, which reads back the same way.
+Files without the "format" marker are the original full format and load unchanged.
+"""
+
+FORMAT_KEY = "format"
+FORMAT_REFS = "refs"
+FORMAT_FULL = "full"
+REFERENCE_KEYS = ("name", "department", "version")
+
+
+def ref_key(item: dict) -> tuple:
+    return (item.get("name"), item.get("department"), item.get("version"))
+
+
+def is_reference(item) -> bool:
+    return isinstance(item, dict) and all(item.get(k) for k in REFERENCE_KEYS)
+
+
+def file_format(data: dict) -> str:
+    return data.get(FORMAT_KEY, FORMAT_FULL) if isinstance(data, dict) else FORMAT_FULL
+
+
+def _item_lists(data: dict):
+    """(key, items) of every shot list in a shot file (top-level lists of item dicts)."""
+    for key, value in data.items():
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            yield key, value
+
+
+def expand_shot_data(data: dict, resolve) -> dict:
+    """
+    The full form of a shot file: references replaced by their meta (plus overrides).
+    resolve(keys) -> {(name, department, version): meta}, called once for the whole file.
+    Unresolvable references are kept as they are, so saving does not lose them.
+    Full-format data is returned as is.
+    """
+    if file_format(data) != FORMAT_REFS:
+        return data
+
+    keys = [ref_key(item) for _, items in _item_lists(data) for item in items if is_reference(item)]
+    metas = resolve(list(dict.fromkeys(keys))) if keys else {}
+
+    expanded = {k: v for k, v in data.items() if k != FORMAT_KEY}
+    for list_key, items in _item_lists(data):
+        expanded_items = []
+        for item in items:
+            meta = metas.get(ref_key(item)) if is_reference(item) else None
+            if meta is None and "path" not in item:
+                print(f"[WARN] Could not resolve {item.get('name')} {item.get('department')} {item.get('version')}, "
+                      f"keeping the reference.")
+            expanded_items.append(dict(meta, **item) if meta is not None else dict(item))
+        expanded[list_key] = expanded_items
+    return expanded
+
+
+def compact_shot_data(data: dict, resolve) -> dict:
+    """
+    The compact form of full shot data: each item becomes a reference plus whatever
+    differs from its published meta. Items whose version can't be resolved stay full.
+    """
+    keys = [ref_key(item) for _, items in _item_lists(data) for item in items if is_reference(item)]
+    metas = resolve(list(dict.fromkeys(keys))) if keys else {}
+
+    compact = {k: v for k, v in data.items() if k != FORMAT_KEY}
+    compact[FORMAT_KEY] = FORMAT_REFS
+    for list_key, items in _item_lists(data):
+        compact_items = []
+        for item in items:
+            meta = metas.get(ref_key(item))
+            if meta is None:
+                compact_items.append(item)
+                continue
+            reference = {k: item[k] for k in REFERENCE_KEYS}
+            reference.update({k: v for k, v in item.items() if k not in reference and meta.get(k, object()) != v})
+            compact_items.append(reference)
+        compact[list_key] = compact_items
+    return compact
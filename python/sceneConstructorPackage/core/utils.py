@@ -9,6 +9,10 @@ import platform
 import subprocess
 import re
 import unicodedata
+import time
+import json
+import socket
+import threading
 
 from ..external import fileseq
 
@@ -303,4 +307,166 @@ def remove_key(data, key):
     elif isinstance(data, list):
         return [remove_key(item, key) for item in data]
     else:
-        return data
\ No newline at end of file
+        return data
+
+
+class DirectoryLock(object):
+    """Cross-process lock built on an exclusive mkdir.
+
+    mkdir is atomic on local disks as well as SMB/NFS shares, where
+    fcntl/msvcrt style locks are not reliable. The holder writes an owner file
+    (host and pid) into the lock directory and touches it while holding the lock,
+    so a long hold (an atlas rebuild, a log compaction...) never looks stale.
+
+    Args:
+        lock_path (str or Path): The directory used as the lock.
+        timeout (float): Seconds to wait for the lock before raising TimeoutError.
+        stale_after (float): Seconds without a heartbeat after which a lock is
+            considered left behind by a crashed process and is broken. A lock
+            held by a dead process of this host is broken right away.
+    """
+
+    OWNER_FILE = "owner"
+
+    def __init__(self, lock_path, timeout=10.0, stale_after=120.0):
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._heartbeat_stop = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while not self.try_acquire():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire lock: {self.lock_path}")
+            time.sleep(0.05)
+
+    def try_acquire(self):
+        """Takes the lock if it is free (or stale) without waiting. Returns True if it is now held."""
+        try:
+            os.mkdir(self.lock_path)
+        except FileExistsError:
+            if not self.break_if_stale():
+                return False
+            try:
+                os.mkdir(self.lock_path)
+            except FileExistsError:
+                return False
+
+        try:
+            with open(self.lock_path / self.OWNER_FILE, "w") as f:
+                json.dump({"host": socket.gethostname(), "pid": os.getpid(),
+                           "user": os.environ.get("USERNAME") or os.environ.get("USER", ""),
+                           "time": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+        except OSError as exc:
+            LOG.warning(f"Could not write lock owner {self.lock_path}: {exc}")
+        self._heartbeat_stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._heartbeat_stop,),
+                         name="DirectoryLockHeartbeat", daemon=True).start()
+        return True
+
+    def release(self):
+        if self._heartbeat_stop is not None:
+            self._heartbeat_stop.set()
+            self._heartbeat_stop = None
+        try:
+            os.remove(self.lock_path / self.OWNER_FILE)
+        except OSError:
+            pass
+        try:
+            os.rmdir(self.lock_path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            LOG.warning(f"Could not release lock {self.lock_path}: {exc}")
+
+    def _heartbeat(self, stop):
+        owner_path = self.lock_path / self.OWNER_FILE
+        while not stop.wait(max(self.stale_after / 4.0, 0.05)):
+            try:
+                os.utime(owner_path)
+            except OSError:
+                pass
+
+    def break_if_stale(self):
+        """Removes the lock if its holder is gone. Returns True if it was broken (or is not there)."""
+        owner_path = self.lock_path / self.OWNER_FILE
+        try:
+            age = time.time() - owner_path.stat().st_mtime
+        except OSError:
+            # no owner file (yet): the holder is between mkdir and writing it
+            try:
+                age = time.time() - self.lock_path.stat().st_mtime
+            except OSError:
+                return True
+        if age <= self.stale_after and not self._owner_is_dead(owner_path):
+            return False
+        LOG.warning(f"Breaking stale lock: {self.lock_path}")
+        try:
+            os.remove(owner_path)
+        except OSError:
+            pass
+        try:
+            os.rmdir(self.lock_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _owner_is_dead(owner_path):
+        """True only if the owner is a process of this host that no longer runs."""
+        if CURRENT_PLATFORM == "Windows": # os.kill would terminate the process there
+            return False
+        try:
+            with open(owner_path, "r") as f:
+                owner = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if owner.get("host") != socket.gethostname() or not isinstance(owner.get("pid"), int):
+            return False
+        try:
+            os.kill(owner["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def atomic_write_json(file_path, data, indent=4):
+    """Write data as JSON through a temp file and a rename.
+
+    Readers (and a crash mid-write) only ever see the old or the new file,
+    never a half-written one. The temp file lives next to the target so the
+    rename stays on the same filesystem.
+
+    Args:
+        file_path (str or Path): The JSON file to write.
+        data: JSON-serializable data.
+        indent (int): Indentation passed to json.dump.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # unique per thread too: the save queue and a log compaction may write the same file
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from pathlib import Path
+from .. import config
+from .utils import DirectoryLock
+from .version_index import parse_version
+
+# hidden marker dirs next to the versions: ignored by scans, counted by the allocator
+RESERVATION_PREFIX = "."
+RESERVATION_SUFFIX = ".reserved"
+
+# a PUBLISH dir modified this recently may still change within the same mtime tick
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _version_number(dir_name: str) -> int | None:
+    """vNNN, or a .vNNN.reserved marker -> NNN."""
+    if dir_name.startswith(RESERVATION_PREFIX) and dir_name.endswith(RESERVATION_SUFFIX):
+        dir_name = dir_name[len(RESERVATION_PREFIX):-len(RESERVATION_SUFFIX)]
+    return parse_version(dir_name)
+
+
+class VersionReservation:
+    """
+    A version number held for one publish, as an exclusive marker dir.
+    Release it once the version dir exists (or the publish was abandoned).
+    The marker is a DirectoryLock, so one left behind by a crashed publish goes stale
+    and its number is handed out again.
+    """
+
+    def __init__(self, publish_dir: Path, number: int):
+        self.publish_dir = publish_dir
+        self.number = number
+        self.version = f"v{number:03d}"
+        self.path = publish_dir / self.version # where the publish goes
+        self.marker = publish_dir / f"{RESERVATION_PREFIX}{self.version}{RESERVATION_SUFFIX}"
+        self.lock = DirectoryLock(self.marker, stale_after=config.PUBLISH_RESERVATION_STALE_SECONDS)
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+class VersionAllocator:
+    """
+    Hands out publish version numbers per (asset, department).
+    - next_version() is answered from a cached max version; PUBLISH is only listed again
+      when its mtime moved, so asking on every keystroke costs one stat.
+    - reserve() takes the next free number with an exclusive mkdir of a hidden marker dir
+      (atomic on local disks and SMB/NFS shares), so two publishers never get the same vNNN.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or config.ASSET_PUBLISH_ROOT)
+        self._cache = {} # (asset, department) -> (PUBLISH mtime_ns, max version number)
+        self._lock = threading.Lock()
+
+    def publish_dir(self, asset_name: str, department: str) -> Path:
+        return self.root / asset_name / department / "PUBLISH"
+
+    def max_version(self, asset_name: str, department: str) -> int:
+        """Highest published or reserved version number, 0 if there is none."""
+        publish_dir = self.publish_dir(asset_name, department)
+        try:
+            mtime_ns = os.stat(publish_dir).st_mtime_ns
+        except OSError:
+            return 0
+
+        key = (asset_name, department)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        numbers = []
+        reserved = False
+        try:
+            with os.scandir(publish_dir) as it:
+                for entry in it:
+                    number = _version_number(entry.name) if entry.is_dir() else None
+                    if number is None:
+                        continue
+                    if entry.name.startswith(RESERVATION_PREFIX):
+                        if VersionReservation(publish_dir, number).lock.break_if_stale():
+                            continue # left behind by a crashed publish
+                        reserved = True
+                    numbers.append(number)
+        except OSError as e:
+            print(f"[WARN] Could not list versions of {asset_name}/{department}: {e}")
+            return cached[1] if cached else 0
+        max_number = max(numbers, default=0)
+
+        # a live reservation may still go stale without PUBLISH changing, so it is not cached
+        if not reserved and time.time_ns() - mtime_ns >= _RACY_WINDOW_NS:
+            with self._lock:
+                self._cache[key] = (mtime_ns, max_number)
+        return max_number
+
+    def next_version(self, asset_name: str, department: str) -> int:
+        return self.max_version(asset_name, department) + 1
+
+    def reserve(self, asset_name: str, department: str, minimum: int = 1,
+                max_attempts: int = 100) -> VersionReservation:
+        """
+        Reserves the first free version >= max(minimum, next_version()).
+        Raises FileExistsError if max_attempts numbers in a row were taken.
+        """
+        publish_dir = self.publish_dir(asset_name, department)
+        publish_dir.mkdir(parents=True, exist_ok=True)
+
+        number = max(minimum, self.next_version(asset_name, department))
+        for _ in range(max_attempts):
+            reservation = VersionReservation(publish_dir, number)
+            if not reservation.path.exists() and reservation.lock.try_acquire():
+                if not reservation.path.exists():
+                    self.forget(asset_name, department)
+                    return reservation
+                reservation.release() # published without reserving, meanwhile
+            number += 1
+
+        raise FileExistsError(f"No free version for {asset_name}/{department} after {max_attempts} attempts.")
+
+    def forget(self, asset_name: str, department: str):
+        """Drops the cached max version, e.g. after publishing."""
+        with self._lock:
+            self._cache.pop((asset_name, department), None)
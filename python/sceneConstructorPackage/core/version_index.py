@@ -0,0 +1,76 @@
+import re
+import threading
+
+VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+def parse_version(version_str: str) -> int | None:
+    """'v012' -> 12. Returns None for names that are not vNNN."""
+    match = VERSION_PATTERN.match(version_str or "")
+    return int(match.group(1)) if match else None
+
+
+def sort_versions(versions) -> list[str]:
+    """
+    Sorts version strings numerically (v999 < v1000).
+    Names that do not parse sort first, so the last entry is always the newest real version.
+    """
+    def key(version_str):
+        num = parse_version(version_str)
+        return (num is not None, num if num is not None else 0, version_str)
+    return sorted(versions, key=key)
+
+
+class VersionIndex:
+    """
+    In-memory index of published versions per (asset, department).
+    - Versions are kept numerically sorted, so latest() is a dict lookup.
+    - Filled from scans/the catalog, and updated directly by publish events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {} # (asset, department) -> sorted list of version strings
+
+    def set_versions(self, asset_name: str, department: str, versions):
+        with self._lock:
+            self._versions[(asset_name, department)] = sort_versions(versions)
+
+    def load(self, versions_by_department: dict):
+        """Bulk replace from {(asset, department): [versions]}."""
+        index = {key: sort_versions(versions) for key, versions in versions_by_department.items()}
+        with self._lock:
+            self._versions = index
+
+    def add_version(self, asset_name: str, department: str, version_str: str):
+        """Records a new publish. Keeps the list sorted without re-listing anything."""
+        key = (asset_name, department)
+        with self._lock:
+            versions = self._versions.get(key, [])
+            if version_str not in versions:
+                self._versions[key] = sort_versions(versions + [version_str])
+
+    def invalidate(self, asset_name: str, department: str | None = None):
+        """Drops the cached versions of an asset (or of one of its departments)."""
+        with self._lock:
+            if department is not None:
+                self._versions.pop((asset_name, department), None)
+                return
+            for key in [k for k in self._versions if k[0] == asset_name]:
+                del self._versions[key]
+
+    def get_versions(self, asset_name: str, department: str) -> list[str] | None:
+        """Returns a copy of the sorted versions, or None if the department is not indexed."""
+        with self._lock:
+            versions = self._versions.get((asset_name, department))
+            return list(versions) if versions is not None else None
+
+    def departments(self) -> list[tuple[str, str]]:
+        """Returns every indexed (asset, department)."""
+        with self._lock:
+            return list(self._versions)
+
+    def latest(self, asset_name: str, department: str) -> str | None:
+        with self._lock:
+            versions = self._versions.get((asset_name, department))
+            return versions[-1] if versions else None
@@ -1,11 +1,19 @@
+import bisect
 import os
 import json
+import shutil
 import tempfile
 from datetime import datetime
+from pathlib import Path
 from PySide6 import QtWidgets, QtCore, QtGui
 import maya.cmds as cmds
 
 from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.core.publish_pipeline import PublishTransaction
+from sceneConstructorPackage.core.version_allocator import VersionAllocator
+from sceneConstructorPackage.core.version_index import parse_version
+from sceneConstructorPackage.utils.thumbnailAtlas import update_atlas_tile
+from sceneConstructorPackage.utils.thumbnailUtils import write_thumbnails
 from .. import config
 
 # close existing window if re-run
@@ -17,12 +25,51 @@ try:
 except:
     pass
 
+class PublishThread(QtCore.QThread):
+    """
+    Runs the share-side stages of a publish (transfer, rename, meta) off the UI thread,
+    then journals it and repaints its atlas tile.
+    """
+
+    progress = QtCore.Signal(int, int) # bytes transferred, total bytes
+    published = QtCore.Signal(dict) # meta as written
+    failed = QtCore.Signal(str)
+
+    def __init__(self, transaction, meta, data_manager, parent=None):
+        super().__init__(parent)
+        self.transaction = transaction
+        self.meta = meta
+        self.data_manager = data_manager
+
+    def run(self):
+        try:
+            meta = self.transaction.commit(self.meta, progress=self.progress.emit)
+        except Exception as e:
+            self.failed.emit(
+                f"Could not publish {self.transaction.base_name}: {e}\n"
+                f"The local export is kept in {self.transaction.scratch_dir}"
+            )
+            return
+
+        # journal the publish so other sessions pick it up without rescanning
+        self.data_manager.announce_publish(meta)
+
+        # repaint this actor's tile in its type's thumbnail atlas
+        try:
+            update_atlas_tile(meta)
+        except (OSError, TimeoutError) as e:
+            print(f"[WARN] Could not update the thumbnail atlas, it is fixed by the next atlas build: {e}")
+
+        self.published.emit(meta)
+
+
 class ActorPublisherUI(QtWidgets.QMainWindow):
     def __init__(self, parent=None):
         super(ActorPublisherUI, self).__init__(parent)
 
         self.setObjectName("ActorPublishWindow")
         self.data_manager = DataManager()
+        self.version_allocator = VersionAllocator()
         
         self.asset_publish_root = config.ASSET_PUBLISH_ROOT 
         self.authors_root = config.AUTHORS_ROOT
@@ -32,6 +79,17 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
         self.setMinimumHeight(400)
 
         self.snapshot_path = None
+        self._publish_threads = {} # PublishThread -> (bytes done, bytes total)
+        self._type_items = {} # update tree items, see refresh_update_tree()
+        self._asset_items = {}
+        self._dept_items = {}
+
+        # typing an actor name asks for its next version once the keystrokes settle
+        self._version_timer = QtCore.QTimer(self)
+        self._version_timer.setSingleShot(True)
+        self._version_timer.setInterval(config.VERSION_DEBOUNCE_MS)
+        self._version_timer.timeout.connect(self.auto_set_version)
+
         self.build_ui()
         self.auto_set_version()
         self.refresh_snapshot()
@@ -59,8 +117,12 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
         self.update_asset_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
         self.update_asset_tree.itemSelectionChanged.connect(self._on_update_asset_selected)
         
+        update_refresh_button = QtWidgets.QPushButton("Refresh Assets")
+        update_refresh_button.clicked.connect(self.refresh_update_tree)
+        
         update_left_layout.addWidget(update_left_label)
         update_left_layout.addWidget(self.update_asset_tree)
+        update_left_layout.addWidget(update_refresh_button)
         
         # --- Right side: Publish Info ---
         update_right_layout = QtWidgets.QVBoxLayout()
@@ -78,7 +140,7 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
         update_version_label = QtWidgets.QLabel("New Version:")
         self.update_version_spinbox = QtWidgets.QSpinBox()
         self.update_version_spinbox.setMinimum(1)
-        self.update_version_spinbox.setMaximum(999)
+        self.update_version_spinbox.setMaximum(9999)
         self.update_version_spinbox.setValue(1) 
 
         update_author_row.addWidget(update_author_label)
@@ -147,7 +209,7 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
         version_label = QtWidgets.QLabel("Version:")
         self.version_spinbox = QtWidgets.QSpinBox()
         self.version_spinbox.setMinimum(1)
-        self.version_spinbox.setMaximum(999)
+        self.version_spinbox.setMaximum(9999)
         self.version_spinbox.setValue(1) 
 
         author_row.addWidget(author_label)
@@ -190,17 +252,29 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
 
         main_layout.addWidget(self.tab_widget, 2)
         main_layout.addLayout(right_layout, 1)
+
+        # transfer progress of background publishes
+        self.publish_progress = QtWidgets.QProgressBar()
+        self.publish_progress.setMaximumWidth(200)
+        self.publish_progress.setTextVisible(False)
+        self.publish_progress.hide()
+        self.statusBar().addPermanentWidget(self.publish_progress)
         
         # --- Connect signals ---
-        self.actor_name_line.textChanged.connect(self.auto_set_version)
-        self.dept_dropdown.currentTextChanged.connect(self.auto_set_version)
+        self.actor_name_line.textChanged.connect(self._version_timer.start)
+        self.dept_dropdown.currentTextChanged.connect(self._version_timer.start)
     
     def refresh_update_tree(self):
-        """Loads all actors from the data manager and populates the update tree."""
+        """
+        Reloads all actors from the data manager into the update tree (on demand, and on open).
+        Collapsed groups and the selected department are kept.
+        """
         
         print("Refreshing asset tree...")
-        self.update_asset_tree.clear()
-        
+        collapsed_types = {key for key, item in self._type_items.items() if not item.isExpanded()}
+        collapsed_assets = {key for key, item in self._asset_items.items() if not item.isExpanded()}
+        selected_key = self._selected_update_key()
+
         try:
             #load  actors using the DataManager
             all_actors = self.data_manager.load_actors()
@@ -208,45 +282,123 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
             print(f"Failed to load actors: {e}")
             return
 
-        category_items = {} #group by type
-        asset_name_items = {} #group by asset name
+        self.update_asset_tree.setUpdatesEnabled(False)
+        self.update_asset_tree.clear()
+        self._type_items = {} # type -> item
+        self._asset_items = {} # (type, asset name) -> item
+        self._dept_items = {} # (asset name, department) -> item
 
         for actor_data in all_actors:
-            actor_type = actor_data.get('type', 'unknown')
-            asset_name = actor_data.get('name', 'Unknown')
-            department = actor_data.get('department', 'unknown')
-
-            #get/create type 
-            parent_category = category_items.get(actor_type)
-            if not parent_category:
-                parent_category = QtWidgets.QTreeWidgetItem([actor_type.capitalize()])
-                self.update_asset_tree.addTopLevelItem(parent_category)
-                category_items[actor_type] = parent_category
-
-            #get/create asset name
-            asset_key = (actor_type, asset_name)
-            parent_asset_item = asset_name_items.get(asset_key)
-            if not parent_asset_item:
-                parent_asset_item = QtWidgets.QTreeWidgetItem([asset_name])
-                #store minimal data on the asset group
-                parent_asset_item.setData(0, QtCore.Qt.UserRole, {"is_group": True, "name": asset_name})
-                parent_category.addChild(parent_asset_item)
-                asset_name_items[asset_key] = parent_asset_item
-            
-            #add department item 
-            version_str = actor_data.get('version', 'N/A')
-            dept_item_name = f"{department.upper()} ({version_str})"
-            dept_item = QtWidgets.QTreeWidgetItem([dept_item_name])
-            
-            #store the full data dict on this item
-            dept_item.setData(0, QtCore.Qt.UserRole, actor_data) 
-            parent_asset_item.addChild(dept_item)
+            self._upsert_update_tree_item(actor_data, keep_sorted=False)
 
         self.update_asset_tree.expandAll()
+        for key in collapsed_types & self._type_items.keys():
+            self._type_items[key].setExpanded(False)
+        for key in collapsed_assets & self._asset_items.keys():
+            self._asset_items[key].setExpanded(False)
+        if selected_key in self._dept_items:
+            self.update_asset_tree.setCurrentItem(self._dept_items[selected_key])
+        self.update_asset_tree.setUpdatesEnabled(True)
         print(f"Found and added {len(all_actors)} asset departments.")
 
+    def _upsert_update_tree_item(self, actor_data: dict, keep_sorted: bool = True):
+        """
+        Adds or updates the (type, asset, department) item of one actor in place.
+        With keep_sorted, new items go to their sorted position and new groups are expanded;
+        a full refresh appends in the (already sorted) load order instead.
+        """
+        actor_type = actor_data.get('type', 'unknown')
+        asset_name = actor_data.get('name', 'Unknown')
+        department = actor_data.get('department', 'unknown')
+        asset_key = (actor_type, asset_name)
+        dept_key = (asset_name, department)
+
+        dept_item = self._dept_items.get(dept_key)
+        if dept_item is not None:
+            shown = dept_item.data(0, QtCore.Qt.UserRole) or {}
+            # publishes of one department can finish out of order
+            if (parse_version(shown.get('version', '')) or 0) > (parse_version(actor_data.get('version', '')) or 0):
+                return
+        if dept_item is not None and dept_item.parent() is not self._asset_items.get(asset_key):
+            self._remove_update_tree_item(dept_key) # its type changed: move it
+            dept_item = None
+
+        #get/create type 
+        parent_category = self._type_items.get(actor_type)
+        if not parent_category:
+            parent_category = QtWidgets.QTreeWidgetItem([actor_type.capitalize()])
+            self._insert_tree_item(None, parent_category, keep_sorted)
+            self._type_items[actor_type] = parent_category
+
+        #get/create asset name
+        parent_asset_item = self._asset_items.get(asset_key)
+        if not parent_asset_item:
+            parent_asset_item = QtWidgets.QTreeWidgetItem([asset_name])
+            #store minimal data on the asset group
+            parent_asset_item.setData(0, QtCore.Qt.UserRole, {"is_group": True, "name": asset_name})
+            self._insert_tree_item(parent_category, parent_asset_item, keep_sorted)
+            self._asset_items[asset_key] = parent_asset_item
+
+        #add or update department item 
+        version_str = actor_data.get('version', 'N/A')
+        dept_item_name = f"{department.upper()} ({version_str})"
+        if dept_item is None:
+            dept_item = QtWidgets.QTreeWidgetItem([dept_item_name])
+            self._insert_tree_item(parent_asset_item, dept_item, keep_sorted)
+            self._dept_items[dept_key] = dept_item
+        else:
+            dept_item.setText(0, dept_item_name)
+        
+        #store the full data dict on this item
+        dept_item.setData(0, QtCore.Qt.UserRole, actor_data) 
+
+        if keep_sorted:
+            parent_category.setExpanded(True)
+            parent_asset_item.setExpanded(True)
+
+    def _insert_tree_item(self, parent, item, keep_sorted: bool):
+        """Appends item under parent (None: top level), or inserts it at its sorted position."""
+        if parent is None:
+            count, child, insert = (self.update_asset_tree.topLevelItemCount(),
+                                    self.update_asset_tree.topLevelItem,
+                                    self.update_asset_tree.insertTopLevelItem)
+        else:
+            count, child, insert = parent.childCount(), parent.child, parent.insertChild
+
+        row = count
+        if keep_sorted:
+            row = bisect.bisect_right([child(i).text(0) for i in range(count)], item.text(0))
+        insert(row, item)
+
+    def _remove_update_tree_item(self, dept_key: tuple):
+        """Removes a department item, and the asset/type groups it leaves empty."""
+        dept_item = self._dept_items.pop(dept_key, None)
+        if dept_item is None:
+            return
+        asset_item = dept_item.parent()
+        asset_item.removeChild(dept_item)
+        if asset_item.childCount():
+            return
+
+        type_item = asset_item.parent()
+        type_item.removeChild(asset_item)
+        self._asset_items = {k: v for k, v in self._asset_items.items() if v is not asset_item}
+        if not type_item.childCount():
+            self.update_asset_tree.takeTopLevelItem(self.update_asset_tree.indexOfTopLevelItem(type_item))
+            self._type_items = {k: v for k, v in self._type_items.items() if v is not type_item}
+
+    def _selected_update_key(self) -> tuple | None:
+        selected_items = self.update_asset_tree.selectedItems()
+        if not selected_items:
+            return None
+        actor_data = selected_items[0].data(0, QtCore.Qt.UserRole)
+        if not actor_data or actor_data.get("is_group"):
+            return None
+        return (actor_data.get('name'), actor_data.get('department'))
+
     def auto_set_version(self):
-        #scans the specific actor/dept folder for the next version
+        #next version of the specific actor/dept (cached, the folder is only re-listed when it changed)
+        self._version_timer.stop()
         actor_name = self.actor_name_line.text().strip()
         department = self.dept_dropdown.currentText()
         
@@ -254,26 +406,7 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
             self.version_spinbox.setValue(1)
             return
 
-        publish_dir = self.asset_publish_root / actor_name / department / "PUBLISH"
-        
-        if not publish_dir.exists():
-            self.version_spinbox.setValue(1)
-            return
-            
-        max_version = 0
-        try:
-            for version_dir in publish_dir.iterdir():
-                if version_dir.is_dir() and version_dir.name.startswith('v'):
-                    try:
-                        num = int(version_dir.name[1:])
-                        max_version = max(max_version, num)
-                    except ValueError:
-                        pass
-        except Exception as e:
-            print(f"Could not auto-set version: {e}")
-
-        self.version_spinbox.setValue(max_version + 1)
-        
+        self.version_spinbox.setValue(self.version_allocator.next_version(actor_name, department))
 
     def capture_snapshot(self):
 
@@ -419,85 +552,164 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Publish Error", "Please enter or select an Actor Name.")
             return
 
-        #DEFINE DIRECTORY AND BASE NAME
-        output_dir = self.asset_publish_root / actor_name / department / "PUBLISH" / version_str 
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
+        if not (cmds.ls(selection=True) or []):
+            QtWidgets.QMessageBox.warning(self, "Publish Error", "Nothing selected to publish.")
+            return
+
+        #RESERVE THE VERSION, so a publish running elsewhere can't take the same number
+        try:
+            reservation = self.version_allocator.reserve(actor_name, department, minimum=version_num)
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Publish Failed", f"Could not reserve a version: {e}")
+            return
+        if reservation.number != version_num:
+            print(f"[INFO] {version_str} is taken, publishing {actor_name} {department} as {reservation.version}.")
+            version_num = reservation.number
+            version_str = reservation.version
+
         #Consistent Base Name ---
         base_name = f"{actor_name}_{department.lower()}_{version_str}"
         # e.g., "Bob_rig_v001"
 
-
-        #SAVE SNAPSHOT
-        snapshot_dest = output_dir / f"{base_name}_snapshot.png" 
-        if self.snapshot_path and os.path.exists(self.snapshot_path):
-            try:
-                # Use copy2 from shutil for a more robust copy
-                import shutil
-                shutil.copy2(self.snapshot_path, str(snapshot_dest))
-            except Exception as e:
-                print(f"[WARN] Could not copy snapshot: {e}")
-                snapshot_dest = Path() # Set to empty path if copy fails
-
-        # 3. EXPORT ASSET
-        file_ext = "usd"
-        file_type = "USD Export"
-        if department == "RIG":
-            file_ext = "ma"
-            file_type = "mayaAscii"
-        elif department == "GEO":
-            # Assuming GEO might also be Maya, or Alembic/USD
-            # This logic can be expanded
-            file_ext = "ma"
-            file_type = "mayaAscii"
+        # from here on, anything going wrong must give the reservation back, or its marker
+        # would hold the version number forever
+        transaction = thread = None
+        try:
+            # 1. EXPORT TO LOCAL SCRATCH: nothing is written to the share until the transfer stage
+            transaction = PublishTransaction(reservation, base_name)
+            output_dir = transaction.final_dir
+
+            #SAVE SNAPSHOT
+            snapshot_name = f"{base_name}_snapshot.png"
+            has_snapshot = False
+            if self.snapshot_path and os.path.exists(self.snapshot_path):
+                try:
+                    # Use copy2 from shutil for a more robust copy
+                    shutil.copy2(self.snapshot_path, str(transaction.scratch_path(snapshot_name)))
+                    has_snapshot = True
+                except Exception as e:
+                    print(f"[WARN] Could not copy snapshot: {e}")
+
+            # small/medium thumbnails and a tiny placeholder, so browsers never open the full playblast
+            thumbnail_fields = {}
+            if has_snapshot:
+                thumbnail_fields = write_thumbnails(
+                    transaction.scratch_path(snapshot_name), transaction.scratch_dir, base_name, recorded_dir=output_dir
+                )
+
+            # EXPORT ASSET
+            file_ext = "usd"
+            file_type = "USD Export"
+            if department == "RIG":
+                file_ext = "ma"
+                file_type = "mayaAscii"
+            elif department == "GEO":
+                # Assuming GEO might also be Maya, or Alembic/USD
+                # This logic can be expanded
+                file_ext = "ma"
+                file_type = "mayaAscii"
             
-        publish_path = output_dir / f"{base_name}.{file_ext}"
+            publish_name = f"{base_name}.{file_ext}"
         
-        selected = cmds.ls(selection=True) or []
-        if not selected:
-            QtWidgets.QMessageBox.warning(self, "Publish Error", "Nothing selected to publish.")
-            return
-            
-        try:
-            cmds.file(
-                str(publish_path),
-                force=True,
-                options=";", 
-                type=file_type,
-                exportSelected=True
-            )
+            try:
+                cmds.file(
+                    str(transaction.scratch_path(publish_name)),
+                    force=True,
+                    options=";", 
+                    type=file_type,
+                    exportSelected=True
+                )
+            except Exception as e:
+                transaction.abort()
+                QtWidgets.QMessageBox.critical(self, "Publish Failed", f"Failed to export Maya file: {e}")
+                return
+
+            # METADATA, written by the transaction once everything else is in place
+            now = datetime.now()
+            meta = {
+                "author": author,
+                "type": actor_logical_type,
+                "name": actor_name,  # <--- THIS IS THE FIX
+                "department": department,
+                "date-published": now.strftime("%y-%m-%d"),
+                "time-published": now.strftime("%H:%M"),
+                "version": version_str,
+                "note": note,
+                "path": str(transaction.final_path(publish_name)),     
+                "snapshot": str(transaction.final_path(snapshot_name)) if has_snapshot else ""
+            }
+            meta.update(thumbnail_fields)
+
+            # 2-4. TRANSFER, RENAME INTO PLACE AND WRITE META in the background; the artist carries on
+            thread = PublishThread(transaction, meta, self.data_manager)
+            thread.progress.connect(self._on_publish_progress)
+            thread.published.connect(self._on_published)
+            thread.failed.connect(self._on_publish_failed)
+            thread.finished.connect(lambda: self._forget_publish_thread(thread))
+            self._publish_threads[thread] = (0, 0)
+            thread.start()
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Publish Failed", f"Failed to export Maya file: {e}")
+            self._publish_threads.pop(thread, None)
+            if transaction is not None:
+                transaction.abort()
+            else:
+                reservation.release()
+            QtWidgets.QMessageBox.critical(self, "Publish Failed", f"Could not publish {actor_name} {department}: {e}")
             return
+        self._update_publish_status(f"Publishing {actor_name} {department} {version_str}...")
 
-
-        # 4. WRITE METADATA
-        now = datetime.now()
-        meta = {
-            "author": author,
-            "type": actor_logical_type,
-            "name": actor_name,  # <--- THIS IS THE FIX
-            "department": department,
-            "date-published": now.strftime("%y-%m-%d"),
-            "time-published": now.strftime("%H:%M"),
-            "version": version_str,
-            "note": note,
-            "path": str(publish_path),     
-            "snapshot": str(snapshot_dest) if snapshot_dest.exists() else ""
-        }
-        json_path = output_dir / f"{base_name}_meta.json"
-        with open(json_path, 'w') as f:
-            json.dump(meta, f, indent=4)
-            
-        QtWidgets.QMessageBox.information(self, "Publish Complete", f"Published to {output_dir}")
-        
-        # Refresh and increment version for the correct tab
+        # the version is taken, so the next one can be prepared right away
         if current_tab_index == 0:
             self.update_version_spinbox.setValue(version_num + 1)
-            self.refresh_update_tree() # Refresh the tree to show new version
         else:
             self.version_spinbox.setValue(version_num + 1)
-        
+
+    # --- Background publish ---
+
+    @QtCore.Slot(int, int)
+    def _on_publish_progress(self, done: int, total: int):
+        thread = self.sender()
+        if thread in self._publish_threads:
+            self._publish_threads[thread] = (done, total)
+            self._update_publish_status()
+
+    @QtCore.Slot(dict)
+    def _on_published(self, meta: dict):
+        message = f"Published {meta.get('name')} {meta.get('department')} {meta.get('version')}"
+        print(f"[OK] {message} to {Path(meta.get('path', '')).parent}")
+        self.statusBar().showMessage(message, 10000)
+        # show the new version in place, a full rescan only happens on "Refresh Assets"
+        self._upsert_update_tree_item(meta)
+
+    @QtCore.Slot(str)
+    def _on_publish_failed(self, message: str):
+        QtWidgets.QMessageBox.critical(self, "Publish Failed", message)
+
+    def _forget_publish_thread(self, thread):
+        self._publish_threads.pop(thread, None)
+        thread.deleteLater()
+        self._update_publish_status()
+
+    def _update_publish_status(self, message: str = ""):
+        """Shows the combined progress of the publishes still transferring."""
+        if not self._publish_threads:
+            self.publish_progress.hide()
+            return
+        done = sum(d for d, _ in self._publish_threads.values())
+        total = sum(t for _, t in self._publish_threads.values())
+        self.publish_progress.setRange(0, 1000 if total else 0) # busy until the sizes are known
+        self.publish_progress.setValue(int(1000 * done / total) if total else 0)
+        self.publish_progress.show()
+        if message:
+            self.statusBar().showMessage(message)
+
+    def closeEvent(self, event):
+        if self._publish_threads:
+            print(f"[INFO] Waiting for {len(self._publish_threads)} publish(es) to finish transferring...")
+            for thread in list(self._publish_threads):
+                thread.wait()
+        super(ActorPublisherUI, self).closeEvent(event)
+
     def _on_update_asset_selected(self, *args):
         """Called when an asset is selected in the 'Update Existing' tree."""
         
@@ -518,17 +730,10 @@ class ActorPublisherUI(QtWidgets.QMainWindow):
         #valid asset, enable button
         self.update_publish_button.setEnabled(True)
 
-        #auto-set the next version
-        #get the current version string 
-        current_version_str = actor_data.get('version', 'v000')
-        try:
-            #convert to integer
-            current_version_num = int(current_version_str[1:])
-            #set the spinbox to the *next* version
-            self.update_version_spinbox.setValue(current_version_num + 1)
-        except:
-            #fallback if version string is formatted strangely
-            self.update_version_spinbox.setValue(1)
+        #auto-set the next version (the tree may be older than the share, so ask the allocator)
+        self.update_version_spinbox.setValue(
+            self.version_allocator.next_version(actor_data.get('name'), actor_data.get('department'))
+        )
         
         #auto-set author from last publish
         last_author = actor_data.get('author')
@@ -0,0 +1,432 @@
+# Path: python/sceneConstructorPackage/ui/actor_tree_model.py
+
+import bisect
+from PySide6 import QtCore
+
+# attribute rows shown under each asset department, in this order
+ATTRIBUTE_KEYS = ('version', 'path')
+
+
+class _Node:
+    """A type, asset or department row. Attribute rows have no node, they are read from the record."""
+
+    __slots__ = ('kind', 'name', 'parent', 'children', 'fetched', 'sorted')
+
+    def __init__(self, kind, name, parent, sorted_children=False):
+        self.kind = kind # 'root', 'type', 'asset' or 'dept'
+        self.name = name
+        self.parent = parent
+        self.children = [] if kind != 'dept' else None
+        self.fetched = 0 # children exposed to the view so far
+        self.sorted = sorted_children
+
+
+class _ChildNames:
+    """Sequence view over a node's child names, so bisect can search it in place."""
+
+    def __init__(self, node):
+        self.node = node
+
+    def __len__(self):
+        return len(self.node.children)
+
+    def __getitem__(self, index):
+        return self.node.children[index].name
+
+
+class ActorTreeModel(QtCore.QAbstractItemModel):
+    """
+    Tree model over actor records (published asset departments), grouped
+    type -> asset -> department -> attribute rows.
+    - Records are the meta dicts themselves; the tree only keeps one small node per
+      type/asset/department, and attribute rows are computed on demand.
+    - Type groups hand their assets to the view in fetch_batch chunks
+      (canFetchMore/fetchMore), so a large catalog costs the view only what is scrolled to.
+    - Pass fetch_batch=None to expose everything at once (small trees like a shot).
+    - decoration_provider(records) may return an icon/pixmap for an asset row, given the
+      records of its departments; call refresh_decorations() when what it returns changes.
+    """
+
+    versionEdited = QtCore.Signal(dict, str) # record, new version text (editable_versions only)
+
+    def __init__(self, actor_types, headers=('Asset', 'Info'), keep_sorted=True,
+                 editable_versions=False, fetch_batch=500, parent=None):
+        super().__init__(parent)
+        self.actor_types = list(actor_types)
+        self.headers = list(headers)
+        self.keep_sorted = keep_sorted
+        self.editable_versions = editable_versions
+        self.fetch_batch = fetch_batch
+        self._fetching = False
+        self.decoration_provider = None
+        self._reset_nodes()
+
+    # --- Record API ---
+
+    def clear(self):
+        self.beginResetModel()
+        self._reset_nodes()
+        self.endResetModel()
+
+    def set_records(self, records):
+        """Replaces all records in one reset."""
+        self.beginResetModel()
+        self._reset_nodes()
+
+        # group first and sort each level once, instead of a bisect insert per record
+        for record in records:
+            if record.get('type') in self._type_nodes:
+                self._records[self._key(record)] = record # a later duplicate wins, like upsert()
+
+        groups = {} # type -> asset -> [records]
+        for key, record in self._records.items():
+            groups.setdefault(record['type'], {}).setdefault(key[0], []).append(record)
+
+        for type_name, assets in groups.items():
+            type_node = self._type_nodes[type_name]
+            asset_names = sorted(assets) if self.keep_sorted else list(assets)
+            for asset_name in asset_names:
+                asset_records = assets[asset_name]
+                if self.keep_sorted:
+                    asset_records = sorted(asset_records, key=lambda r: self._key(r)[1])
+                asset_node = _Node('asset', asset_name, type_node, sorted_children=self.keep_sorted)
+                for record in asset_records:
+                    key = self._key(record)
+                    dept_node = _Node('dept', key[1], asset_node)
+                    asset_node.children.append(dept_node)
+                    self._dept_nodes[key] = dept_node
+                type_node.children.append(asset_node)
+                self._asset_nodes[(type_name, asset_name)] = asset_node
+            self._set_initial_fetch(type_node)
+        self.endResetModel()
+
+    def add_records(self, records):
+        for record in records:
+            self._insert(record, notify=True)
+
+    def upsert(self, record: dict):
+        """Adds a record, or updates the rows of the one with the same (name, department)."""
+        key = self._key(record)
+        old = self._records.get(key)
+        if old is None:
+            self._insert(record, notify=True)
+            return
+        if old.get('type') != record.get('type') or self._attribute_keys(old) != self._attribute_keys(record):
+            self.remove(*key) # moves group, or gains/loses attribute rows
+            self._insert(record, notify=True)
+            return
+
+        self._records[key] = record
+        dept_index = self.index_for(*key, fetch=False)
+        if not dept_index.isValid():
+            return
+        self.dataChanged.emit(dept_index, dept_index.siblingAtColumn(1))
+        rows = len(self._attribute_keys(record))
+        if rows:
+            self.dataChanged.emit(self.index(0, 0, dept_index), self.index(rows - 1, 1, dept_index))
+
+    def remove(self, asset_name: str, department: str):
+        key = (asset_name, department)
+        dept_node = self._dept_nodes.pop(key, None)
+        if dept_node is None:
+            return
+        record = self._records[key]
+
+        # the record is dropped only after the row is gone: the view still reads it while removing
+        asset_node = dept_node.parent
+        self._remove_child(asset_node, dept_node)
+        del self._records[key]
+        if not asset_node.children:
+            self._remove_child(asset_node.parent, asset_node)
+            del self._asset_nodes[(record.get('type'), asset_name)]
+
+    def record(self, asset_name: str, department: str) -> dict | None:
+        return self._records.get((asset_name, department))
+
+    def records(self) -> list[dict]:
+        return list(self._records.values())
+
+    def refresh_decorations(self, type_name: str):
+        """Asks the view to re-read the asset icons of a type group."""
+        type_node = self._type_nodes.get(type_name)
+        if type_node is None or not type_node.fetched:
+            return
+        type_index = self._index_of(type_node)
+        self.dataChanged.emit(self.index(0, 0, type_index), self.index(type_node.fetched - 1, 0, type_index),
+                              [QtCore.Qt.DecorationRole])
+
+    def index_for(self, asset_name: str, department: str, fetch: bool = True) -> QtCore.QModelIndex:
+        """
+        Index of an asset department row. With fetch=True, rows up to it are exposed
+        to the view first so it can be selected/scrolled to.
+        """
+        dept_node = self._dept_nodes.get((asset_name, department))
+        if dept_node is None:
+            return QtCore.QModelIndex()
+
+        for node in (dept_node.parent, dept_node):
+            row = self._row(node)
+            if row >= node.parent.fetched:
+                if not fetch:
+                    return QtCore.QModelIndex()
+                self._fetch(node.parent, row + 1 - node.parent.fetched)
+        return self._index_of(dept_node)
+
+    def type_index(self, type_name: str) -> QtCore.QModelIndex:
+        node = self._type_nodes.get(type_name)
+        return self._index_of(node) if node else QtCore.QModelIndex()
+
+    def index_kind(self, index: QtCore.QModelIndex) -> str | None:
+        """'type', 'asset', 'dept' or 'attr'."""
+        if not index.isValid():
+            return None
+        parent_node = index.internalPointer()
+        return 'attr' if parent_node.kind == 'dept' else parent_node.children[index.row()].kind
+
+    def attribute_key(self, index: QtCore.QModelIndex) -> str | None:
+        """'version'/'path' for attribute rows, else None."""
+        if self.index_kind(index) != 'attr':
+            return None
+        record = self._dept_record(index.internalPointer())
+        return self._attribute_keys(record)[index.row()]
+
+    def actor_data(self, index: QtCore.QModelIndex) -> dict | None:
+        """
+        The record behind a department row or one of its attribute rows,
+        a group dict for asset rows, None for type rows.
+        """
+        kind = self.index_kind(index)
+        if kind == 'attr':
+            return self._dept_record(index.internalPointer())
+        if kind == 'dept':
+            return self._dept_record(index.internalPointer().children[index.row()])
+        if kind == 'asset':
+            return {"is_group": True, "name": index.internalPointer().children[index.row()].name}
+        return None
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        # the internal pointer is the parent node; attribute rows need no node of their own
+        return self.createIndex(row, column, self._node(parent))
+
+    def parent(self, index=QtCore.QModelIndex()):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent_node = index.internalPointer()
+        if parent_node is self._root:
+            return QtCore.QModelIndex()
+        return self._index_of(parent_node)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self._node(parent)
+        if node is None:
+            return 0 # attribute row
+        if node.kind == 'dept':
+            return len(self._attribute_keys(self._dept_record(node)))
+        return node.fetched
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.headers)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return False
+        node = self._node(parent)
+        if node is None:
+            return False
+        if node.kind == 'dept':
+            return bool(self._attribute_keys(self._dept_record(node)))
+        return bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node is not None and node.kind != 'dept' and node.fetched < len(node.children)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node is not None and node.kind != 'dept':
+            self._fetch(node, self.fetch_batch or len(node.children))
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        parent_node = index.internalPointer()
+
+        if parent_node.kind == 'dept':
+            record = self._dept_record(parent_node)
+            key = self._attribute_keys(record)[index.row()]
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+                return key if index.column() == 0 else str(record.get(key))
+            if role == QtCore.Qt.UserRole:
+                return record
+            return None
+
+        node = parent_node.children[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return node.name if index.column() == 0 else ""
+        if role == QtCore.Qt.UserRole:
+            if node.kind == 'dept':
+                return self._dept_record(node)
+            if node.kind == 'asset':
+                return {"is_group": True, "name": node.name}
+        if role == QtCore.Qt.DecorationRole and node.kind == 'asset' and index.column() == 0:
+            if self.decoration_provider is not None:
+                return self.decoration_provider([self._dept_record(child) for child in node.children])
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole or self.attribute_key(index) != 'version' or index.column() != 1:
+            return False
+        record = self._dept_record(index.internalPointer())
+        if str(value) != str(record.get('version')):
+            # the owner validates the version and calls upsert() if it exists
+            self.versionEdited.emit(record, str(value))
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.editable_versions and index.column() == 1 and self.attribute_key(index) == 'version':
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole and section < len(self.headers):
+            return self.headers[section]
+        return None
+
+    # --- Internals ---
+
+    def _reset_nodes(self):
+        self._root = _Node('root', None, None)
+        self._type_nodes = {}
+        for type_name in self.actor_types:
+            type_node = _Node('type', type_name, self._root, sorted_children=self.keep_sorted)
+            self._root.children.append(type_node)
+            self._type_nodes[type_name] = type_node
+        self._root.fetched = len(self._root.children)
+
+        self._asset_nodes = {} # (type, asset) -> node
+        self._dept_nodes = {} # (asset, department) -> node
+        self._records = {} # (asset, department) -> record
+
+    def _set_initial_fetch(self, type_node):
+        batch = self.fetch_batch or len(type_node.children)
+        type_node.fetched = min(batch, len(type_node.children))
+        for asset_node in type_node.children:
+            asset_node.fetched = len(asset_node.children) # a handful of departments
+
+    def _node(self, index):
+        """Node behind an index (root for an invalid index), None for attribute rows."""
+        if not index.isValid():
+            return self._root
+        parent_node = index.internalPointer()
+        if parent_node.kind == 'dept':
+            return None
+        return parent_node.children[index.row()]
+
+    def _dept_record(self, dept_node):
+        return self._records[(dept_node.parent.name, dept_node.name)]
+
+    @staticmethod
+    def _key(record) -> tuple:
+        return (record.get('name'), record.get('department', 'unknown'))
+
+    @staticmethod
+    def _attribute_keys(record) -> tuple:
+        return tuple(key for key in ATTRIBUTE_KEYS if record.get(key) is not None)
+
+    @staticmethod
+    def _row(node) -> int:
+        siblings = node.parent.children
+        if node.parent.sorted:
+            row = bisect.bisect_left(_ChildNames(node.parent), node.name)
+            if row < len(siblings) and siblings[row] is node:
+                return row
+        return siblings.index(node)
+
+    def _index_of(self, node):
+        return self.createIndex(self._row(node), 0, node.parent)
+
+    def _parent_index(self, node):
+        return QtCore.QModelIndex() if node is self._root else self._index_of(node)
+
+    def _fetch(self, node, count):
+        count = min(count, len(node.children) - node.fetched)
+        if count <= 0 or self._fetching:
+            return # nothing left, or asked again from inside our own insert signals
+        self._fetching = True
+        try:
+            self.beginInsertRows(self._parent_index(node), node.fetched, node.fetched + count - 1)
+            node.fetched += count
+            self.endInsertRows()
+        finally:
+            self._fetching = False
+
+    def _is_exposed(self, node) -> bool:
+        """True if the view has been given this node's row (and its ancestors')."""
+        while node is not self._root:
+            if self._row(node) >= node.parent.fetched:
+                return False
+            node = node.parent
+        return True
+
+    def _insert_child(self, parent_node, child, notify):
+        if parent_node.sorted:
+            row = bisect.bisect_right(_ChildNames(parent_node), child.name)
+        else:
+            row = len(parent_node.children)
+
+        # rows inside what has been fetched are exposed right away, and so are rows appended
+        # to a fully fetched group until it holds a fetch batch; the rest arrive with fetchMore
+        fetched = row < parent_node.fetched or (
+            parent_node.fetched == len(parent_node.children)
+            and (parent_node.kind != 'type' or not self.fetch_batch or parent_node.fetched < self.fetch_batch)
+        )
+        announce = fetched and notify and self._is_exposed(parent_node)
+        if announce:
+            self.beginInsertRows(self._parent_index(parent_node), row, row)
+        parent_node.children.insert(row, child)
+        if fetched:
+            parent_node.fetched += 1
+        if announce:
+            self.endInsertRows()
+
+    def _remove_child(self, parent_node, child):
+        row = self._row(child)
+        fetched = row < parent_node.fetched
+        announce = fetched and self._is_exposed(parent_node)
+        if announce:
+            self.beginRemoveRows(self._parent_index(parent_node), row, row)
+        del parent_node.children[row]
+        if fetched:
+            parent_node.fetched -= 1
+        if announce:
+            self.endRemoveRows()
+
+    def _insert(self, record: dict, notify: bool):
+        type_node = self._type_nodes.get(record.get('type'))
+        if type_node is None:
+            return # unknown type, not shown (as before)
+
+        key = self._key(record)
+        asset_name, department = key
+        if key in self._records:
+            self.remove(*key)
+
+        asset_node = self._asset_nodes.get((type_node.name, asset_name))
+        if asset_node is None:
+            asset_node = _Node('asset', asset_name, type_node, sorted_children=self.keep_sorted)
+            self._asset_nodes[(type_node.name, asset_name)] = asset_node
+            self._insert_child(type_node, asset_node, notify)
+
+        dept_node = _Node('dept', department, asset_node)
+        self._records[key] = record
+        self._dept_nodes[key] = dept_node
+        self._insert_child(asset_node, dept_node, notify)
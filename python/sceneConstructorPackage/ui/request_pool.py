@@ -0,0 +1,116 @@
+# Path: python/sceneConstructorPackage/ui/request_pool.py
+
+import itertools
+from PySide6 import QtCore
+
+
+class _Request(QtCore.QRunnable):
+    """Runs one call on the pool and hands (result, error) back to the RequestPool."""
+
+    def __init__(self, pool, request_id, fn, args, kwargs):
+        super().__init__()
+        self.pool = pool
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        if self.pool.is_stale(self.request_id):
+            self.pool._finished.emit(self.request_id, None, "")
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+            error = ""
+        except Exception as e:
+            result = None
+            error = str(e) or e.__class__.__name__
+        self.pool._finished.emit(self.request_id, result, error)
+
+
+class RequestPool(QtCore.QObject):
+    """
+    Runs blocking calls (DataManager I/O) on a QThreadPool and delivers results on the GUI thread.
+    - Requests go to a named channel; a new request on a channel makes the previous one stale:
+      if it has not started it returns without doing its I/O, and if it has its result is dropped.
+    - busyChanged(bool) reports whether anything is still running or queued; requests submitted
+      with background=True (periodic polls) don't count.
+    """
+
+    busyChanged = QtCore.Signal(bool)
+
+    _finished = QtCore.Signal(int, object, str) # request id, result, error (emitted from workers)
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._requests = {} # id -> (channel, on_result, on_error, background); runnables are owned by the pool
+        self._latest = {} # channel -> latest request id
+        self._finished.connect(self._on_finished)
+
+    def submit(self, channel: str, fn, *args, on_result=None, on_error=None, background=False, **kwargs) -> int:
+        """
+        Runs fn(*args, **kwargs) on the pool. on_result(result) / on_error(message) are called on
+        the GUI thread, unless a newer request was submitted on the same channel meanwhile.
+        """
+        self.cancel(channel)
+
+        request_id = next(self._ids)
+        runnable = _Request(self, request_id, fn, args, kwargs)
+        was_busy = self.is_busy()
+        self._requests[request_id] = (channel, on_result, on_error, background)
+        self._latest[channel] = request_id
+        self._pool.start(runnable)
+        if not was_busy and not background:
+            self.busyChanged.emit(True)
+        return request_id
+
+    def cancel(self, channel: str):
+        """Makes the channel's queued or running request stale."""
+        self._latest.pop(channel, None)
+
+    def cancel_all(self):
+        for channel in list(self._latest):
+            self.cancel(channel)
+
+    def is_stale(self, request_id: int) -> bool:
+        """True once a newer request replaced this one (safe to call from workers)."""
+        entry = self._requests.get(request_id)
+        return entry is None or self._latest.get(entry[0]) != request_id
+
+    def is_pending(self, channel: str) -> bool:
+        """True while the channel has a request that is queued, running or not yet delivered."""
+        return channel in self._latest
+
+    def is_busy(self) -> bool:
+        return any(not entry[3] for entry in self._requests.values())
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Blocks until running requests are done (used on shutdown)."""
+        return self._pool.waitForDone(msecs)
+
+    @QtCore.Slot(int, object, str)
+    def _on_finished(self, request_id: int, result, error: str):
+        if request_id not in self._requests:
+            return
+        stale = self.is_stale(request_id)
+        channel, on_result, on_error, _ = self._requests[request_id]
+        if self._latest.get(channel) == request_id:
+            del self._latest[channel]
+        self._forget(request_id)
+
+        if stale:
+            return
+        if error:
+            print(f"[ERROR] Background request '{channel}' failed: {error}")
+            if on_error is not None:
+                on_error(error)
+        elif on_result is not None:
+            on_result(result)
+
+    def _forget(self, request_id: int):
+        entry = self._requests.pop(request_id, None)
+        if entry is not None and not entry[3] and not self.is_busy():
+            self.busyChanged.emit(False)
@@ -3,6 +3,7 @@
 import sys
 from PySide6 import QtCore, QtGui, QtWidgets
 from ..utils.fileUtils import open_in_native_explorer
+from .actor_tree_model import ActorTreeModel
 from pathlib import Path # Import Path
 
 class sceneConstructor(QtWidgets.QWidget):
@@ -23,14 +24,16 @@ class sceneConstructor(QtWidgets.QWidget):
     
     #context menu signal
     openPathRequested = QtCore.Signal(str)
-    deleteShotAssetRequested = QtCore.Signal(QtWidgets.QTreeWidgetItem)
-    editItemRequested = QtCore.Signal(QtWidgets.QTreeWidgetItem, int)
+    deleteShotAssetRequested = QtCore.Signal(dict) # shot asset department record
+    editItemRequested = QtCore.Signal(QtCore.QModelIndex)
     
-    #signal to controller when shot changed
-    shotVersionChanged = QtCore.Signal(QtWidgets.QTreeWidgetItem, str)
+    #signal to controller when shot changed (record, new version text)
+    shotVersionChanged = QtCore.Signal(dict, str)
 
     # --- NEW SIGNAL ---
-    chooseVersionRequested = QtCore.Signal(QtWidgets.QTreeWidgetItem)
+    chooseVersionRequested = QtCore.Signal(str, dict) # 'preset' or 'shot', record
+
+    windowClosed = QtCore.Signal()
 
     def __init__(self, parent=None):
         super(sceneConstructor, self).__init__(parent)
@@ -39,6 +42,13 @@ class sceneConstructor(QtWidgets.QWidget):
 
         self.actor_types = ['camera', 'character', 'prop', 'set']
 
+        # both trees are views over record models: grouping and lazy row creation live there
+        self.preset_model = ActorTreeModel(self.actor_types, headers=('Asset', 'Info'))
+        self.shot_model = ActorTreeModel(
+            self.actor_types, headers=('Asset', 'Value'),
+            keep_sorted=False, editable_versions=True, fetch_batch=None
+        )
+
         self._build_ui()
         self._connect_signals()
 
@@ -52,7 +62,7 @@ class sceneConstructor(QtWidgets.QWidget):
                 color: #DDD;
                 font-size: 14px;
             }
-            QTreeWidget {
+            QTreeView {
                 background-color: #2b2b2b;
                 border: 1px solid #555;
             }
@@ -89,9 +99,12 @@ class sceneConstructor(QtWidgets.QWidget):
         preset_layout = QtWidgets.QVBoxLayout()
         preset_label = QtWidgets.QLabel('Assets')
 
-        self.preset_table = QtWidgets.QTreeWidget()
-        self.preset_table.setHeaderLabels(['Asset', 'Info'])
-        self.preset_table.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
+        self.preset_table = QtWidgets.QTreeView()
+        self.preset_table.setModel(self.preset_model)
+        self.preset_table.setUniformRowHeights(True) # lets the view skip measuring every row
+        self.preset_table.setIconSize(QtCore.QSize(20, 20)) # atlas thumbnails on asset rows, about a text line high
+        self.preset_table.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Interactive)
+        self.preset_table.header().resizeSection(0, 260)
         self.preset_table.header().setStretchLastSection(True)
         self.preset_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.preset_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
@@ -125,8 +138,9 @@ class sceneConstructor(QtWidgets.QWidget):
         shot_layout = QtWidgets.QVBoxLayout()
         shot_label = QtWidgets.QLabel('Construct')
 
-        self.shot_table = QtWidgets.QTreeWidget()
-        self.shot_table.setHeaderLabels(['Asset', 'Value'])
+        self.shot_table = QtWidgets.QTreeView()
+        self.shot_table.setModel(self.shot_model)
+        self.shot_table.setUniformRowHeights(True)
         self.shot_table.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
         self.shot_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.shot_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
@@ -146,10 +160,18 @@ class sceneConstructor(QtWidgets.QWidget):
 
         self.shotButton = QtWidgets.QPushButton('Publish Shots')
 
+        # Indeterminate bar shown while the model waits on background requests
+        self.busy_bar = QtWidgets.QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setMaximumHeight(6)
+        self.busy_bar.hide()
+
         shot_layout.addWidget(shot_label)
         shot_layout.addLayout(sceneSel_layout)
         shot_layout.addLayout(shotSel_layout)
         shot_layout.addWidget(self.shot_table)
+        shot_layout.addWidget(self.busy_bar)
         shot_layout.addWidget(self.shotButton)
 
         # ---- Transfer button ----
@@ -181,27 +203,70 @@ class sceneConstructor(QtWidgets.QWidget):
         self.shot_table.customContextMenuRequested.connect(self._on_open_context_menu_shots)
 
         #actor select
-        self.preset_table.itemSelectionChanged.connect(self._on_actor_selection_changed)
+        self.preset_table.selectionModel().selectionChanged.connect(self._on_actor_selection_changed)
 
-        #shot item changed (for version)
-        self.shot_table.itemChanged.connect(self._on_shot_item_changed)
+        #shot version edited in place
+        self.shot_model.versionEdited.connect(self.shotVersionChanged.emit)
+
+    def closeEvent(self, event):
+        self.windowClosed.emit()
+        super(sceneConstructor, self).closeEvent(event)
 
     #public slots
 
     @QtCore.Slot(list)
     def update_actor_tree(self, actor_data: list):
         """Populates the asset preset tree."""
-        self._populate_tree_widget(actor_data, self.preset_table)
-        self.preset_table.expandAll()
+        self.preset_model.set_records(actor_data)
+        self._expand_type_groups(self.preset_table, self.preset_model)
+
+    @QtCore.Slot()
+    def clear_actor_tree(self):
+        """Empties the asset preset tree, leaving only the type groups."""
+        self.preset_model.clear()
+        self._expand_type_groups(self.preset_table, self.preset_model)
+
+    @QtCore.Slot(list)
+    def append_actor_batch(self, actor_data: list):
+        """Adds a batch of actors to the preset tree, keeping assets and departments sorted."""
+        self.preset_model.add_records(actor_data)
+
+    @QtCore.Slot(dict)
+    def upsert_actor(self, item_data: dict):
+        """Adds an actor to the preset tree, or updates it in place if it is already listed."""
+        self.update_asset_item_version(item_data, reselect=False)
+
+    @QtCore.Slot(str, str)
+    def remove_actor(self, asset_name: str, department: str):
+        """Removes an asset department from the preset tree (and its asset group once empty)."""
+        self.preset_model.remove(asset_name, department)
         
-    @QtCore.Slot(dict, str)
-    def update_shot_tree(self, shot_data_cache: dict, current_shot_name: str):
-        """Populates the shot constructor tree."""
-        shot_key = current_shot_name.casefold()
-        shot_items = shot_data_cache.get(shot_key, [])
-        self._populate_tree_widget(shot_items, self.shot_table)
+    @QtCore.Slot(list)
+    def update_shot_tree(self, shot_items: list):
+        """Populates the shot constructor tree from the shot's asset departments."""
+        self.shot_model.set_records(shot_items)
         self.shot_table.expandAll()
-        
+
+    @QtCore.Slot(dict)
+    def add_shot_item(self, item_data: dict):
+        """Appends one asset department to the shot tree."""
+        self.shot_model.upsert(item_data)
+        dept_index = self.shot_model.index_for(item_data.get('name'), item_data.get('department'))
+        if dept_index.isValid():
+            self.shot_table.expand(dept_index.parent().parent())
+            self.shot_table.expand(dept_index.parent())
+            self.shot_table.expand(dept_index)
+
+    @QtCore.Slot(dict)
+    def update_shot_item(self, item_data: dict):
+        """Refreshes the rows of one shot asset department (after a version change)."""
+        self.shot_model.upsert(item_data)
+
+    @QtCore.Slot(str, str)
+    def remove_shot_item(self, asset_name: str, department: str):
+        """Removes one asset department from the shot tree."""
+        self.shot_model.remove(asset_name, department)
+
     @QtCore.Slot(list)
     def update_scene_dropdown(self, scenes: list):
         self.construct_scene_dropdown.blockSignals(True)
@@ -228,11 +293,11 @@ class sceneConstructor(QtWidgets.QWidget):
         self.construct_shot_dropdown.setCurrentText(shot_name)
         self.construct_shot_dropdown.blockSignals(False)
         
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem, int)
-    def start_item_edit(self, item: QtWidgets.QTreeWidgetItem, column: int):
-        """Puts a tree widget item into edit mode."""
-        if item:
-            item.treeWidget().editItem(item, column)
+    @QtCore.Slot(QtCore.QModelIndex)
+    def start_item_edit(self, index: QtCore.QModelIndex):
+        """Puts a shot tree cell into edit mode."""
+        if index.isValid():
+            self.shot_table.edit(index)
 
     @QtCore.Slot(str)
     def open_path_in_explorer(self, path: str):
@@ -253,143 +318,58 @@ class sceneConstructor(QtWidgets.QWidget):
                 QtCore.Qt.SmoothTransformation
             ))
 
+    def show_snapshot_loading(self):
+        """Placeholder while a snapshot thumbnail is decoded."""
+        self.snapshot_label.setPixmap(QtGui.QPixmap())
+        self.snapshot_label.setText("Loading snapshot...")
+
     @QtCore.Slot(str)
     def update_actor_notes(self, note_text: str):
         """Displays the loaded actor notes."""
         self.notes_display.setText(note_text or "No notes found.")
         
+    @QtCore.Slot(bool)
+    def set_busy(self, busy: bool):
+        """Shows or hides the busy indicator."""
+        self.busy_bar.setVisible(busy)
+
     @QtCore.Slot(str)
     def show_error_message(self, message: str):
         """Shows a warning message box."""
         QtWidgets.QMessageBox.warning(self, "Error", message)
 
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem, dict)
-    def update_shot_item_version(self, item: QtWidgets.QTreeWidgetItem, new_data: dict):
-        """
-        Updates a shot item in the tree with new version data from the Controller.
-        'item' is the 'version' attribute item.
-        """
-        dept_item = item.parent()
-        if not dept_item:
-            return
-            
-        new_version = new_data.get('version')
-        new_path = new_data.get('path')
-        department = new_data.get('department')
-
-        self.shot_table.blockSignals(True)
-        
-        dept_item.setData(0, QtCore.Qt.UserRole, new_data)
-        dept_item.setText(0, f"{department}") 
-        item.setText(1, new_version)
-        
-        for i in range(dept_item.childCount()):
-            child = dept_item.child(i)
-            if child.text(0) == 'path':
-                child.setText(1, new_path)
-                break
-        
-        self.shot_table.blockSignals(False)
-
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem, dict)
-    def update_asset_item_version(self, item: QtWidgets.QTreeWidgetItem, new_data: dict):
+    @QtCore.Slot(dict)
+    def update_asset_item_version(self, new_data: dict, reselect: bool = True):
         """
-        Updates an asset item in the preset tree. Does not save.
-        'item' is the 'version' attribute item.
+        Updates an asset department in the preset tree. Does not save.
         """
-        dept_item = item.parent()
-        if not dept_item:
+        self.preset_model.upsert(new_data)
+        dept_index = self.preset_model.index_for(new_data.get('name'), new_data.get('department'))
+        if not dept_index.isValid():
             return
-            
-        new_version = new_data.get('version')
-        new_path = new_data.get('path')
 
-        self.preset_table.blockSignals(True)
-        
-        # Update data stored on dept item
-        dept_item.setData(0, QtCore.Qt.UserRole, new_data)
-        
-        # Update version item text
-        item.setText(1, new_version)
-        
-        # Find and update path item
-        for i in range(dept_item.childCount()):
-            child = dept_item.child(i)
-            if child.text(0) == 'path':
-                child.setText(1, new_path)
-                break
-        
-        self.preset_table.blockSignals(False)
-        
         # Reselect the item to trigger metadata refresh
-        self.preset_table.setCurrentItem(dept_item)
-
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem, str)
-    def revert_shot_item_version(self, item: QtWidgets.QTreeWidgetItem, old_version: str):
-        """Reverts the text of a version item if the new version was invalid."""
-        self.shot_table.blockSignals(True)
-        item.setText(1, old_version)
-        self.shot_table.blockSignals(False)
+        selection = self.preset_table.selectionModel()
+        if reselect:
+            self.preset_table.setCurrentIndex(dept_index)
+            self._on_actor_selection_changed()
+        elif selection.isRowSelected(dept_index.row(), dept_index.parent()):
+            self._on_actor_selection_changed()
 
     #internal helpers
-    
-    def _populate_tree_widget(self, data, tree_widget):
-        tree_widget.clear()
-        
-        category_items = {}
-        for type_name in self.actor_types:
-            typeGroup = QtWidgets.QTreeWidgetItem([type_name])
-            tree_widget.addTopLevelItem(typeGroup)
-            category_items[type_name] = typeGroup
-
-        asset_name_items = {} 
-
-        for item_data in data:
-            item_type = item_data.get('type')
-            asset_name = item_data.get('name')
-            department = item_data.get('department', 'unknown')
-
-            parent_category = category_items.get(item_type)
-            if not parent_category: 
-                continue
-
-            asset_key = (item_type, asset_name)
-            parent_asset_item = asset_name_items.get(asset_key)
-
-            if not parent_asset_item:
-                parent_asset_item = QtWidgets.QTreeWidgetItem([asset_name])
-                parent_asset_item.setData(0, QtCore.Qt.UserRole, {"is_group": True, "name": asset_name})
-                parent_asset_item.setFlags(parent_asset_item.flags() & ~QtCore.Qt.ItemIsEditable)
-                parent_category.addChild(parent_asset_item)
-                asset_name_items[asset_key] = parent_asset_item
-
-            dept_item_name = f"{department}"
-            dept_item = QtWidgets.QTreeWidgetItem([dept_item_name])
-            dept_item.setData(0, QtCore.Qt.UserRole, item_data) 
-            dept_item.setFlags(dept_item.flags() & ~QtCore.Qt.ItemIsEditable)
-            parent_asset_item.addChild(dept_item)
-
-            keys_to_display = ['version', 'path']
-            for key in keys_to_display:
-                val = item_data.get(key)
-                if val is not None:
-                    attr_child = QtWidgets.QTreeWidgetItem([key, str(val)])
-                    
-                    if tree_widget == self.shot_table and key == 'version':
-                        attr_child.setFlags(attr_child.flags() | QtCore.Qt.ItemIsEditable)
-                    else:
-                        attr_child.setFlags(attr_child.flags() & ~QtCore.Qt.ItemIsEditable)
-                    
-                    dept_item.addChild(attr_child)
 
+    @staticmethod
+    def _expand_type_groups(tree_view, model):
+        """Type groups start expanded; assets expand on demand (their rows are fetched lazily)."""
+        for type_name in model.actor_types:
+            tree_view.expand(model.type_index(type_name))
 
     def _on_transfer_clicked(self):
         """Gathers data from selected actors and emits signal."""
         selected_items_data = []
-        selectedActors = self.preset_table.selectedItems()
 
-        for item in selectedActors:
-            item_data = self._get_data_from_item(item)
+        for index in self.preset_table.selectionModel().selectedRows(0):
+            item_data = self._get_data_from_index(self.preset_model, index)
             
             if item_data and not item_data.get("is_group"):
                 if item_data not in selected_items_data:
@@ -398,55 +378,21 @@ class sceneConstructor(QtWidgets.QWidget):
         if selected_items_data:
             self.transferClicked.emit(selected_items_data)
 
-    def get_all_data_from_tree(self, tree_widget: QtWidgets.QTreeWidget) -> list:
-        """Helper to convert a tree widget back into a list of asset dicts."""
-        output_data = []
-        
-        for i in range(tree_widget.topLevelItemCount()): # character, prop
-            type_item = tree_widget.topLevelItem(i)
-            
-            for j in range(type_item.childCount()): # Bob, Apple
-                asset_item = type_item.child(j)
-                
-                for k in range(asset_item.childCount()): # RIG, GEO
-                    dept_item = asset_item.child(k)
-                    
-                    item_data = dept_item.data(0, QtCore.Qt.UserRole)
-                    if item_data and not item_data.get("is_group"):
-                        output_data.append(item_data)
-                        
-        return output_data
-
-    def _get_data_from_item(self, item: QtWidgets.QTreeWidgetItem) -> dict | None:
-        """Helper to get the asset data from a selected item or its parent."""
-        if not item:
+    @staticmethod
+    def _get_data_from_index(model, index: QtCore.QModelIndex) -> dict | None:
+        """Helper to get the asset data of a row: its own department record, or its group's."""
+        if not index.isValid():
             return None
-        
-        actor_data = item.data(0, QtCore.Qt.UserRole)
-        if actor_data and not actor_data.get("is_group"):
-            return actor_data
-        
-        if item.parent():
-            actor_data = item.parent().data(0, QtCore.Qt.UserRole)
-            if actor_data and not actor_data.get("is_group"):
-                return actor_data
-        
-        if item.parent(): 
-            actor_data = item.data(0, QtCore.Qt.UserRole)
-            if actor_data and actor_data.get("is_group"):
-                return actor_data
-                
-        return None 
-
-    def _on_actor_selection_changed(self):
+        return model.actor_data(index.siblingAtColumn(0))
+
+    def _on_actor_selection_changed(self, *args):
         """Emits the data of the selected asset department."""
-        selected_items = self.preset_table.selectedItems()
-        if not selected_items:
+        selected_rows = self.preset_table.selectionModel().selectedRows(0)
+        if not selected_rows:
             self.actorSelected.emit({}) 
             return
         
-        item = selected_items[0]
-        actor_data = self._get_data_from_item(item)
+        actor_data = self._get_data_from_index(self.preset_model, selected_rows[0])
         
         if not actor_data or actor_data.get("is_group"):
             self.actorSelected.emit({})
@@ -456,23 +402,24 @@ class sceneConstructor(QtWidgets.QWidget):
     # --- Context Menu Handlers ---
     
     def _on_open_context_menu_presets(self, position):
-        item = self.preset_table.itemAt(position)
-        if not item: return
+        index = self.preset_table.indexAt(position).siblingAtColumn(0)
+        if not index.isValid(): return
 
         menu = QtWidgets.QMenu(self.preset_table)
-        actor_data = self._get_data_from_item(item)
+        actor_data = self._get_data_from_index(self.preset_model, index)
         if not actor_data: return
+        attribute = self.preset_model.attribute_key(index)
 
         #"Choose Version" for 'version' items
-        if item.text(0).lower() == "version" and item.parent() is not None:
+        if attribute == "version":
             menu.addAction("Choose Version").triggered.connect(
-                lambda: self.chooseVersionRequested.emit(item)
+                lambda: self.chooseVersionRequested.emit('preset', actor_data)
             )
 
         #"Open" for 'path' items
-        if item.text(0).lower() == "path" and item.parent() is not None:
+        if attribute == "path":
             menu.addAction("Open File Location").triggered.connect(
-                lambda: self.openPathRequested.emit(item.text(1))
+                lambda: self.openPathRequested.emit(actor_data.get("path"))
             )
 
         #"Open Publish Directory" for department items
@@ -485,43 +432,37 @@ class sceneConstructor(QtWidgets.QWidget):
             menu.exec_(self.preset_table.viewport().mapToGlobal(position))
 
     def _on_open_context_menu_shots(self, position):
-        item = self.shot_table.itemAt(position)
-        if not item: return
+        index = self.shot_table.indexAt(position).siblingAtColumn(0)
+        if not index.isValid(): return
         
         menu = QtWidgets.QMenu(self.shot_table)
-        actor_data = self._get_data_from_item(item)
+        actor_data = self._get_data_from_index(self.shot_model, index)
         if not actor_data or actor_data.get("is_group"): return
+        attribute = self.shot_model.attribute_key(index)
 
         #"Choose Version" for 'version' items
-        if item.text(0).lower() == "version" and item.parent() is not None:
+        if attribute == "version":
             menu.addAction("Choose Version").triggered.connect(
-                lambda: self.chooseVersionRequested.emit(item)
+                lambda: self.chooseVersionRequested.emit('shot', actor_data)
             )
 
         #"Edit Version" for 'version' items
-        if item.text(0).lower() == "version" and item.parent() is not None:
+        if attribute == "version":
             menu.addAction("Edit Version").triggered.connect(
-                lambda: self.editItemRequested.emit(item, 1) # Edit column 1
+                lambda: self.editItemRequested.emit(index.siblingAtColumn(1)) # Edit column 1
             )
 
         #"Open" for 'path' items
-        if item.text(0).lower() == "path" and item.parent() is not None:
+        if attribute == "path":
             menu.addAction("Open File Location").triggered.connect(
-                lambda: self.openPathRequested.emit(item.text(1))
+                lambda: self.openPathRequested.emit(actor_data.get("path"))
             )
 
-        #"Delete" for department items (item itself is the dept item)
-        if item.parent() and item.parent().parent():
+        #"Delete" for department items
+        if self.shot_model.index_kind(index) == 'dept':
              menu.addAction("Delete Asset").triggered.connect(
-                 lambda: self.deleteShotAssetRequested.emit(item)
+                 lambda: self.deleteShotAssetRequested.emit(actor_data)
              )
 
         if menu.actions():
             menu.exec_(self.shot_table.viewport().mapToGlobal(position))
-            
-    def _on_shot_item_changed(self, item, column):
-        """
-        Emits a signal when an item in the shot tree is edited.
-        """
-        if item.text(0) == 'version' and column == 1:
-            self.shotVersionChanged.emit(item, item.text(1))
\ No newline at end of file
@@ -5,6 +5,8 @@ from pathlib import Path
 from PySide6 import QtWidgets, QtCore, QtGui
 from sceneConstructorPackage.ui.sceneConstructorUI import sceneConstructor
 from sceneConstructorPackage.ui.scene_constructor_model import SceneConstructorModel
+from sceneConstructorPackage.ui.thumbnail_cache import ThumbnailAtlasCache, ThumbnailCache
+from sceneConstructorPackage.utils.thumbnailUtils import THUMBNAIL_META_KEYS, placeholder_image, thumbnail_path
 
 class SceneConstructorController:
     """
@@ -14,6 +16,10 @@ class SceneConstructorController:
     def __init__(self):
         self.model = SceneConstructorModel()
         self.view = sceneConstructor()
+        self.thumbnails = ThumbnailCache(parent=self.view)
+        self.atlas = ThumbnailAtlasCache(parent=self.view) # asset icons, one file per actor type
+        self.view.preset_model.decoration_provider = self._asset_icon
+        self._snapshot_path = None # snapshot the view is waiting for
 
         self._connect_signals()
 
@@ -44,54 +50,59 @@ class SceneConstructorController:
         # --- NEW CONNECTION ---
         self.view.chooseVersionRequested.connect(self.on_choose_version)
 
+        self.view.windowClosed.connect(self.model.shutdown)
+
         # --- Model -> View ---
-        self.model.actorsReloaded.connect(self.view.update_actor_tree)
+        self.model.actorsLoadStarted.connect(self.view.clear_actor_tree)
+        self.model.actorsBatchLoaded.connect(self.view.append_actor_batch)
+        self.model.actorAdded.connect(self.view.upsert_actor)
+        self.model.actorUpdated.connect(self.view.upsert_actor)
+        self.model.actorRemoved.connect(self.view.remove_actor)
         self.model.scenesReloaded.connect(self.on_scenes_reloaded)
         self.model.shotsReloaded.connect(self.on_shots_reloaded)
         self.model.shotDataLoaded.connect(self.on_shot_data_loaded)
+        self.model.shotItemAdded.connect(self.view.add_shot_item)
+        self.model.shotItemUpdated.connect(self.view.update_shot_item)
+        self.model.shotItemRemoved.connect(self.view.remove_shot_item)
         
         self.model.versionUpdateFailed.connect(self.view.show_error_message)
+        self.model.shotSaveFailed.connect(self.view.show_error_message)
+        self.model.busyChanged.connect(self.view.set_busy)
+
+        self.thumbnails.thumbnailReady.connect(self.on_thumbnail_ready)
+        self.atlas.atlasLoaded.connect(self.view.preset_model.refresh_decorations)
+        self.model.actorAdded.connect(self.on_actor_published)
+        self.model.actorUpdated.connect(self.on_actor_published)
 
         
     # --- Controller Slots (Handling View Signals) ---
 
     def on_save_shots(self):
-        """Get data from shot tree and tell model to save."""
-        shot_data = self.view.get_all_data_from_tree(self.view.shot_table)
-        self.model.save_shot_data(shot_data)
+        """Tell the model to save the current shot document."""
+        self.model.save_shot_data()
 
     def on_transfer_actors(self, assets_to_transfer: list):
-        """Adds selected assets to the current shot data and updates the view."""
-        shot_key = self.model.current_shot_name.casefold()
-        current_shot_items = self.model.current_shot_data_cache.get(shot_key, [])
-        
-        existing_ids = set()
-        for item in current_shot_items:
-            existing_ids.add( (item.get('name'), item.get('department')) )
-
-        for asset_data in assets_to_transfer:
-            asset_id = (asset_data.get('name'), asset_data.get('department'))
-            if asset_id not in existing_ids:
-                current_shot_items.append(asset_data.copy()) # Add a copy
-        
-        self.model.current_shot_data_cache[shot_key] = current_shot_items
-        self.view.update_shot_tree(self.model.current_shot_data_cache, self.model.current_shot_name)
+        """Adds selected assets to the current shot; the view follows through shotItemAdded."""
+        self.model.add_shot_items([asset_data.copy() for asset_data in assets_to_transfer])
 
-    def on_delete_shot_asset(self, item: QtWidgets.QTreeWidgetItem):
-        """Removes an asset (a department item) from the shot tree."""
-        (item.parent() or self.view.shot_table.invisibleRootItem()).removeChild(item)
-        self.on_save_shots() # Persist the change
+    def on_delete_shot_asset(self, actor_data: dict):
+        """Removes an asset department from the shot and persists the change."""
+        if not actor_data or actor_data.get("is_group"):
+            return
+        self.model.remove_shot_item(actor_data.get('name'), actor_data.get('department'))
 
     @QtCore.Slot(dict)
     def on_actor_selected(self, actor_data: dict):
         """Called when an actor is selected in the View. Loads and displays metadata."""
         
         if not actor_data or actor_data.get("is_group"):
+            self._snapshot_path = None
             self.view.update_snapshot(QtGui.QPixmap()) # Send null pixmap
             self.view.update_actor_notes("")
             return
 
-        snapshot_path = actor_data.get('snapshot')
+        # the medium thumbnail written at publish time when there is one, else the full snapshot
+        snapshot_path = thumbnail_path(actor_data, 'medium') or actor_data.get('snapshot')
 
         notes_list = []
         publish_note = actor_data.get('note')
@@ -99,7 +110,8 @@ class SceneConstructorController:
             notes_list.append(f"Publish Note:\n{publish_note}")
         
         other_metadata = []
-        excluded_keys = ['type', 'name', 'department', 'snapshot', 'path', 'version', 'note', 'is_group']
+        excluded_keys = ['type', 'name', 'department', 'snapshot', 'path', 'version', 'note', 'is_group',
+                         *THUMBNAIL_META_KEYS]
         
         for key, val in actor_data.items():
             if key not in excluded_keys:
@@ -114,25 +126,33 @@ class SceneConstructorController:
         else:
             note_text = "\n\n".join(notes_list)
 
-        # 1. Load Snapshot
-        pixmap = QtGui.QPixmap()
-        if snapshot_path and Path(snapshot_path).exists():
-            pixmap.load(snapshot_path)
-        self.view.update_snapshot(pixmap)
+        # 1. Load Snapshot (a cached thumbnail, or decoded in the background)
+        self._snapshot_path = snapshot_path or None
+        if not snapshot_path:
+            self.view.update_snapshot(QtGui.QPixmap())
+        else:
+            image = self.thumbnails.request(snapshot_path)
+            if image is not None:
+                self.view.update_snapshot(QtGui.QPixmap.fromImage(image))
+            else:
+                # until the thumbnail is decoded: the atlas tile, else the blurred placeholder from the meta
+                pixmap = self.atlas.tile(actor_data.get('type'), actor_data.get('name'), actor_data.get('department'))
+                if pixmap is None:
+                    pixmap = QtGui.QPixmap.fromImage(placeholder_image(actor_data.get('placeholder')))
+                if not pixmap.isNull():
+                    self.view.update_snapshot(pixmap)
+                else:
+                    self.view.show_snapshot_loading()
 
         # 2. Load Notes
         self.view.update_actor_notes(note_text)
 
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem, str)
-    def on_shot_version_changed(self, version_item, new_version_str):
+    @QtCore.Slot(dict, str)
+    def on_shot_version_changed(self, actor_data: dict, new_version_str: str):
         """
         Called when the user edits a version in the shot list.
-        Tells the Model to validate it and updates the View.
+        Tells the Model to validate it in the background; the View follows through shotItemUpdated.
         """
-        dept_item = version_item.parent()
-        if not dept_item: return
-        
-        actor_data = dept_item.data(0, QtCore.Qt.UserRole)
         if not actor_data: return
             
         asset_name = actor_data.get('name')
@@ -142,32 +162,16 @@ class SceneConstructorController:
         if new_version_str == old_version:
             return
 
-        # 1. Ask the Model to find this new version
-        new_data = self.model.get_new_version_data(
-            asset_name, department, new_version_str
-        )
-        
-        # 2. Update the View based on the result
-        if new_data:
-            # SUCCESS
-            self.view.update_shot_item_version(version_item, new_data)
-            self.on_save_shots() # Auto-save the change
-        else:
-            # FAILED
-            self.view.revert_shot_item_version(version_item, old_version)
+        # An unknown version leaves the document (and so the tree) unchanged
+        self.model.set_shot_item_version(asset_name, department, new_version_str)
 
     # --- NEW SLOT ---
-    @QtCore.Slot(QtWidgets.QTreeWidgetItem)
-    def on_choose_version(self, version_item: QtWidgets.QTreeWidgetItem):
+    @QtCore.Slot(str, dict)
+    def on_choose_version(self, tree_name: str, actor_data: dict):
         """
-        Called when "Choose Version" is clicked in either tree.
-        Fetches all versions and shows a selection dialog.
+        Called when "Choose Version" is clicked in either tree ('preset' or 'shot').
+        Fetches all versions in the background, then shows a selection dialog.
         """
-        dept_item = version_item.parent()
-        if not dept_item:
-            return
-            
-        actor_data = dept_item.data(0, QtCore.Qt.UserRole)
         if not actor_data or actor_data.get("is_group"):
             return
             
@@ -177,15 +181,24 @@ class SceneConstructorController:
         if not asset_name or not department:
             return
             
-        #get all available versions from the Model
-        all_versions = self.model.get_all_versions(asset_name, department)
+        # the versions are fetched in the background, the dialog opens once they arrive
+        self.model.request_all_versions(
+            asset_name, department,
+            lambda all_versions: self._show_version_dialog(tree_name, actor_data, all_versions)
+        )
+
+    def _show_version_dialog(self, tree_name: str, actor_data: dict, all_versions: list):
+        """Lets the user pick one of all_versions and applies it to the tree it was asked from."""
+        asset_name = actor_data.get('name')
+        department = actor_data.get('department')
+
         if not all_versions:
             self.view.show_error_message(f"No other versions found for {asset_name} {department}.")
             return
             
-        all_versions.sort(reverse=True) # Show newest first
+        all_versions = list(reversed(all_versions)) # Show newest first
         
-        current_version = version_item.text(1)
+        current_version = actor_data.get('version')
         
         #show the dialog
         new_version_str, ok = QtWidgets.QInputDialog.getItem(
@@ -201,35 +214,54 @@ class SceneConstructorController:
         if not ok or new_version_str == current_version:
             return #user cancelled or didn't change the version
             
-        #decide which tree to update
-        tree_widget = version_item.treeWidget()
-        
-        if tree_widget == self.view.shot_table:
+        if tree_name == 'shot':
             # Right-side tree: Use the existing logic to update and save
-            self.on_shot_version_changed(version_item, new_version_str)
+            self.on_shot_version_changed(actor_data, new_version_str)
             
-        elif tree_widget == self.view.preset_table:
-            # Left-side tree: Just update the view, don't save
-            new_data = self.model.get_new_version_data(asset_name, department, new_version_str)
-            if new_data:
-                self.view.update_asset_item_version(version_item, new_data)
-            else:
-                # This should be rare since we got the version from the list
-                self.view.show_error_message(f"Could not load data for {new_version_str}")
+        else:
+            # Left-side tree: Just update the view, don't save.
+            # A version that can't be loaded is reported through versionUpdateFailed.
+            self.model.request_version_data(
+                asset_name, department, new_version_str,
+                self.view.update_asset_item_version,
+                channel="preset_version"
+            )
+
+    def _asset_icon(self, records: list):
+        """Icon of an asset row in the preset tree: the atlas tile of its first department that has one."""
+        for record in records:
+            pixmap = self.atlas.tile(record.get('type'), record.get('name'), record.get('department'))
+            if pixmap is not None:
+                return pixmap
+        return None
+
+    @QtCore.Slot(dict)
+    def on_actor_published(self, actor_data: dict):
+        # the atlas of its type is (or will be) repainted by the publisher
+        self.atlas.invalidate(actor_data.get('type'))
+
+    @QtCore.Slot(str, QtGui.QImage)
+    def on_thumbnail_ready(self, snapshot_path: str, image: QtGui.QImage):
+        if snapshot_path != self._snapshot_path:
+            return # the selection moved on
+        self.view.update_snapshot(QtGui.QPixmap.fromImage(image))
 
     # --- Controller Slots (Handling Model Signals) ---
     
     def on_scenes_reloaded(self, scenes: list):
         self.view.update_scene_dropdown(scenes)
         if scenes:
-            self.view.set_scene_dropdown(scenes[0])
+            # keep the current scene selected on refreshes
+            current = self.model.current_scene_name
+            self.view.set_scene_dropdown(current if current in scenes else scenes[0])
             
     def on_shots_reloaded(self, shots: list):
         self.view.update_shot_dropdown(shots)
         if shots:
-            self.view.set_shot_dropdown(shots[0])
+            current = self.model.current_shot_name
+            self.view.set_shot_dropdown(current if current in shots else shots[0])
         else:
-            self.view.update_shot_tree({}, "")
+            self.view.update_shot_tree([])
 
     def on_shot_data_loaded(self, json_path: str, shot_data: dict):
-        self.view.update_shot_tree(shot_data, self.model.current_shot_name)
\ No newline at end of file
+        self.view.update_shot_tree(self.model.get_shot_items())
\ No newline at end of file
@@ -1,5 +1,55 @@
+import time
 from PySide6 import QtCore
+from sceneConstructorPackage import config
 from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.core.shot_cache import file_key
+from sceneConstructorPackage.core.shot_document import ShotDocument
+from sceneConstructorPackage.core.shot_edit_log import log_path
+from sceneConstructorPackage.ui.request_pool import RequestPool
+from sceneConstructorPackage.ui.scene_constructor_watcher import SceneConstructorWatcher
+
+
+class ActorStreamThread(QtCore.QThread):
+    """
+    Runs DataManager.iter_actors() off the GUI thread and
+    emits the records in batches as they are found.
+    """
+
+    batchReady = QtCore.Signal(list)
+    scanFinished = QtCore.Signal(list) # all actors, sorted
+
+    def __init__(self, data_manager, batch_size=200, batch_interval=0.25, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval # seconds, so slow scans still trickle in
+
+    def run(self):
+        all_actors = []
+        batch = []
+        last_emit = time.monotonic()
+
+        actors = self.data_manager.iter_actors()
+        try:
+            for actor in actors:
+                if self.isInterruptionRequested():
+                    return
+                batch.append(actor)
+                all_actors.append(actor)
+
+                if len(batch) >= self.batch_size or time.monotonic() - last_emit >= self.batch_interval:
+                    self.batchReady.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+        finally:
+            actors.close()
+
+        if batch:
+            self.batchReady.emit(batch)
+        self.scanFinished.emit(
+            sorted(all_actors, key=lambda x: (x.get('name', ''), x.get('department', '')))
+        )
+
 
 class SceneConstructorModel(QtCore.QObject):
     """
@@ -8,12 +58,28 @@ class SceneConstructorModel(QtCore.QObject):
     """
     
     # Signals to notify the View/Controller
-    actorsReloaded = QtCore.Signal(list)
+    actorsLoadStarted = QtCore.Signal()
+    actorsBatchLoaded = QtCore.Signal(list) # partial results while scanning
+    actorsReloaded = QtCore.Signal(list) # full list once the scan is done
+    actorAdded = QtCore.Signal(dict) # a new asset department appeared
+    actorUpdated = QtCore.Signal(dict) # an actor got a new latest version
+    actorRemoved = QtCore.Signal(str, str) # name, department
+    versionAdded = QtCore.Signal(str, str, str) # name, department, version
     scenesReloaded = QtCore.Signal(list)
     shotsReloaded = QtCore.Signal(list)
     shotDataLoaded = QtCore.Signal(str, dict) # shot_json_path, shot_data
+    shotItemAdded = QtCore.Signal(dict) # row-level edits of the current shot document
+    shotItemUpdated = QtCore.Signal(dict)
+    shotItemRemoved = QtCore.Signal(str, str) # name, department
+    shotDirtyChanged = QtCore.Signal(bool) # unsaved edits in the current shot
     shotDataSaved = QtCore.Signal()
+    shotSaveFailed = QtCore.Signal(str) # error message
+    shotDataChanged = QtCore.Signal(str, str) # scene, shot: JSON changed on disk
     versionUpdateFailed = QtCore.Signal(str) # Signal to send error messages
+    busyChanged = QtCore.Signal(bool) # DataManager requests running in the background
+
+    # emitted from the save queue's writer thread, delivered on the GUI thread
+    _shotFileWritten = QtCore.Signal(object, int, str) # ShotDocument, saved revision, error ('' on success)
 
     def __init__(self):
         super().__init__()
@@ -27,52 +93,306 @@ class SceneConstructorModel(QtCore.QObject):
         self.current_scene_name = ""
         self.current_shot_name = ""
         self.current_shot_json_path = ""
-        self.current_shot_data_cache = {} # Caches loaded shot data
+        self.shot_document = ShotDocument() # source of truth for the shot tree
+
+        self._actor_thread = None
+        self._reconciling = False
+
+        # DataManager calls run here, so network I/O never blocks the GUI thread
+        self.requests = RequestPool(parent=self)
+        self.requests.busyChanged.connect(self.busyChanged)
+
+        # Tail the shared publish journal instead of rescanning the publish root
+        self._journal_timer = QtCore.QTimer(self)
+        self._journal_timer.setInterval(config.JOURNAL_POLL_INTERVAL_MS)
+        self._journal_timer.timeout.connect(self.poll_publishes)
+        self._journal_timer.start()
+
+        # Incremental updates from the filesystem, started once the first scan is done
+        self._shot_file_key = None # file keys of the shot JSON and its edit log as last loaded/saved
+        self.watcher = SceneConstructorWatcher(self.data_manager, parent=self)
+        self.watcher.actorAdded.connect(self._on_watcher_actor_added)
+        self.watcher.actorChanged.connect(self._on_watcher_actor_changed)
+        self.watcher.versionAdded.connect(self.versionAdded)
+        self.watcher.scenesChanged.connect(self.refresh_scenes)
+        self.watcher.shotsChanged.connect(self._on_watcher_shots_changed)
+        self.watcher.shotDataChanged.connect(self._on_watcher_shot_data_changed)
+
+        self._shotFileWritten.connect(self._on_shot_file_written)
 
     # --- Public Methods (called by Controller) ---
 
     def load_actors(self):
-        """Loads actors from DataManager and emits signal."""
-        self.current_actors = self.data_manager.load_actors()
+        """
+        Starts a background actor scan.
+        Results arrive through actorsBatchLoaded, then actorsReloaded with the full list.
+        """
+        self._stop_actor_thread()
+        self.current_actors = []
+        self.actorsLoadStarted.emit()
+        self._start_actor_thread(reconcile=False)
+
+    def reconcile_actors(self):
+        """
+        Full rescan in the background that only reports differences
+        (actorUpdated/actorRemoved), so the tree is not rebuilt.
+        """
+        self._start_actor_thread(reconcile=True)
+
+    @QtCore.Slot()
+    def poll_publishes(self):
+        """Applies new publish journal entries, or reconciles if a full scan is due."""
+        if self._actor_thread is not None:
+            return # a scan is running, it will pick the journal up when done
+        if self.requests.is_pending('journal'):
+            return # the previous poll is still reading
+        self.requests.submit('journal', self._read_publish_journal,
+                             on_result=self._on_publish_journal_read, background=True)
+
+    def _read_publish_journal(self):
+        """Runs on the request pool. None means a full reconcile is due."""
+        if self.data_manager.reconcile_due():
+            return None
+        return self.data_manager.poll_publish_journal()
+
+    def _on_publish_journal_read(self, actors: list | None):
+        if actors is None:
+            if self._actor_thread is None:
+                self.reconcile_actors()
+            return
+        for actor in actors:
+            self._replace_current_actor(actor)
+            self.actorUpdated.emit(actor)
+
+    def shutdown(self):
+        """Stops background work. Called when the window closes."""
+        self.data_manager.flush_shot_saves() # don't lose edits still in the save queue
+        self._journal_timer.stop()
+        self.watcher.stop()
+        self._stop_actor_thread()
+        self.requests.cancel_all()
+        self.requests.wait()
+
+    def _start_actor_thread(self, reconcile: bool):
+        self._stop_actor_thread()
+        self._reconciling = reconcile
+
+        self._actor_thread = ActorStreamThread(self.data_manager, parent=self)
+        self._actor_thread.batchReady.connect(self._on_actor_batch)
+        self._actor_thread.scanFinished.connect(self._on_actor_scan_finished)
+        self._actor_thread.finished.connect(self._actor_thread.deleteLater)
+        self._actor_thread.start()
+
+    def _stop_actor_thread(self):
+        if self._actor_thread is not None:
+            self._actor_thread.requestInterruption()
+            self._actor_thread.wait()
+            self._actor_thread = None
+
+    def _replace_current_actor(self, actor: dict):
+        key = (actor.get('name'), actor.get('department'))
+        for i, current in enumerate(self.current_actors):
+            if (current.get('name'), current.get('department')) == key:
+                self.current_actors[i] = actor
+                return
+        self.current_actors.append(actor)
+
+    @QtCore.Slot(list)
+    def _on_actor_batch(self, actors: list):
+        if self.sender() is not self._actor_thread or self._reconciling:
+            return # batch from a cancelled scan, or a reconcile that only reports the diff
+        self.current_actors.extend(actors)
+        self.actorsBatchLoaded.emit(actors)
+
+    @QtCore.Slot(list)
+    def _on_actor_scan_finished(self, actors: list):
+        if self.sender() is not self._actor_thread:
+            return
+        self._actor_thread = None
+
+        if self._reconciling:
+            old = {(a.get('name'), a.get('department')): a for a in self.current_actors}
+            new = {(a.get('name'), a.get('department')): a for a in actors}
+            for key in old.keys() - new.keys():
+                self.actorRemoved.emit(*key)
+            for key, actor in new.items():
+                if old.get(key) != actor:
+                    self.actorUpdated.emit(actor)
+
+        self.current_actors = actors
         self.actorsReloaded.emit(self.current_actors)
 
+        # (re)collect watched paths now that the version index is filled
+        self.watcher.start()
+
+    # --- Watcher Slots ---
+
+    @QtCore.Slot(dict)
+    def _on_watcher_actor_added(self, actor: dict):
+        self._replace_current_actor(actor)
+        self.actorAdded.emit(actor)
+
+    @QtCore.Slot(dict)
+    def _on_watcher_actor_changed(self, actor: dict):
+        self._replace_current_actor(actor)
+        self.actorUpdated.emit(actor)
+
+    @QtCore.Slot(str)
+    def _on_watcher_shots_changed(self, scene_name: str):
+        if scene_name != self.current_scene_name:
+            return
+        self.requests.submit('shots', self.data_manager.get_shots_in_scene, scene_name,
+                             on_result=lambda shots: self._on_shots_loaded(scene_name, shots, keep_shot=True))
+
+    @QtCore.Slot(str, str)
+    def _on_watcher_shot_data_changed(self, scene_name: str, shot_name: str):
+        if (scene_name, shot_name) != (self.current_scene_name, self.current_shot_name):
+            return
+        if self._stat_shot_file() == self._shot_file_key:
+            return # our own save, or nothing that affects the JSON
+        if self.data_manager.save_queue.pending(self.current_shot_json_path) is not None:
+            return # our queued save is being written, and will win anyway
+        if self.shot_document.dirty:
+            print(f"[WARN] {shot_name} changed on disk, keeping the unsaved edits.")
+            return
+        self.shotDataChanged.emit(scene_name, shot_name)
+        self.load_shot_data()
+
+    def _stat_shot_file(self):
+        if not self.current_shot_json_path:
+            return None
+        # the edit log counts too: with SHOT_EDIT_LOG a save only appends to it
+        return (file_key(self.current_shot_json_path), file_key(log_path(self.current_shot_json_path)))
+
     def load_scenes(self):
-        """Loads scene list from DataManager and emits signal."""
-        self.current_scenes = self.data_manager.get_scenes()
+        """Loads the scene list in the background; scenesReloaded follows, and the first scene is selected."""
+        self.requests.submit('scenes', self.data_manager.get_scenes,
+                             on_result=lambda scenes: self._on_scenes_loaded(scenes, keep_scene=False))
+
+    def refresh_scenes(self):
+        """Re-reads the scene list, keeping the current scene selected if it still exists."""
+        self.requests.submit('scenes', self.data_manager.get_scenes,
+                             on_result=lambda scenes: self._on_scenes_loaded(scenes, keep_scene=True))
+
+    def _on_scenes_loaded(self, scenes: list, keep_scene: bool):
+        self.current_scenes = scenes
         self.scenesReloaded.emit(self.current_scenes)
-        
-        if self.current_scenes:
-            self.set_current_scene(self.current_scenes[0])
+
+        if keep_scene and self.current_scene_name in self.current_scenes:
+            return
+        self.set_current_scene(self.current_scenes[0] if self.current_scenes else "")
 
     def load_shots_for_scene(self, scene_name: str):
-        """Loads shot list for a specific scene and emits signal."""
-        self.current_shots = self.data_manager.get_shots_in_scene(scene_name)
+        """Loads the shot list of a scene in the background; shotsReloaded follows."""
+        self.requests.cancel('shot_data') # a shot of the previous scene is no longer wanted
+        self.requests.submit('shots', self.data_manager.get_shots_in_scene, scene_name,
+                             on_result=lambda shots: self._on_shots_loaded(scene_name, shots, keep_shot=False))
+
+    def _on_shots_loaded(self, scene_name: str, shots: list, keep_shot: bool):
+        if scene_name != self.current_scene_name:
+            return
+        self.current_shots = shots
+        if not keep_shot:
+            self.current_shot_name = "" # new scene: the view should not keep the old shot selected
         self.shotsReloaded.emit(self.current_shots)
-        
-        if self.current_shots:
-            self.set_current_shot(self.current_shots[0])
-        else:
-            self.set_current_shot("")
+
+        if keep_shot and self.current_shot_name in self.current_shots:
+            return
+        self.set_current_shot(self.current_shots[0] if self.current_shots else "")
 
     def load_shot_data(self):
-        """Loads data for the currently active scene and shot."""
+        """(Re)loads data for the currently active scene and shot in the background."""
         if not self.current_scene_name or not self.current_shot_name:
+            self.requests.cancel('shot_data')
             self.current_shot_json_path = ""
-            self.current_shot_data_cache = {}
+            self._set_shot_document(ShotDocument())
             self.shotDataLoaded.emit("", {})
             return
 
-        path, data = self.data_manager.load_shot_data(
-            self.current_scene_name, 
-            self.current_shot_name
+        self._request_shot_data(self.current_scene_name, self.current_shot_name, reload=True)
+
+    def _request_shot_data(self, scene_name: str, shot_name: str, reload: bool):
+        self.requests.submit(
+            'shot_data', self.data_manager.load_shot_data, scene_name, shot_name,
+            on_result=lambda result: self._on_shot_data_read(scene_name, shot_name, *result, reload=reload)
         )
-        
+
+    def _on_shot_data_read(self, scene_name: str, shot_name: str, path: str, data: dict, reload: bool):
+        if scene_name != self.current_scene_name:
+            return
+        if reload:
+            if shot_name != self.current_shot_name:
+                return
+            if self.shot_document.dirty:
+                print(f"[WARN] {shot_name} was edited while reloading, keeping the unsaved edits.")
+                return
+        elif path == self.current_shot_json_path:
+            return # same shot file selected again
+        else:
+            self.data_manager.flush_shot_saves(self.current_shot_json_path, wait=False)
+            self.current_shot_name = shot_name
+        self._apply_shot_data(path, data)
+
+    def _apply_shot_data(self, path: str, data: dict):
         self.current_shot_json_path = path
-        self.current_shot_data_cache = data
+        self._set_shot_document(ShotDocument(self.current_shot_name, data))
+        self._shot_file_key = self._stat_shot_file()
         self.shotDataLoaded.emit(path, data)
 
-    def save_shot_data(self, shot_data_list: list):
-        """Saves data for the currently active shot."""
+    def _set_shot_document(self, document: ShotDocument):
+        was_dirty = self.shot_document.dirty
+        self.shot_document = document
+        if was_dirty != document.dirty:
+            self.shotDirtyChanged.emit(document.dirty)
+
+    def get_shot_items(self) -> list[dict]:
+        """The current shot's asset departments, in file order."""
+        return self.shot_document.items()
+
+    def add_shot_items(self, items: list) -> list[dict]:
+        """Adds asset departments that are not in the shot yet. Returns the ones added."""
+        was_dirty = self.shot_document.dirty
+        added = []
+        for item in items:
+            if self.shot_document.add(item):
+                added.append(item)
+                self.shotItemAdded.emit(dict(item))
+        if added and not was_dirty:
+            self.shotDirtyChanged.emit(True)
+        return added
+
+    def remove_shot_item(self, asset_name: str, department: str, save: bool = True):
+        """Removes an asset department from the shot and (by default) saves."""
+        if self.shot_document.remove(asset_name, department) is None:
+            return
+        self.shotItemRemoved.emit(asset_name, department)
+        self.shotDirtyChanged.emit(True)
+        if save:
+            self.save_shot_data()
+
+    def set_shot_item_version(self, asset_name: str, department: str, version_str: str, save: bool = True):
+        """
+        Switches a shot asset department to another published version, looked up in the background.
+        The view follows through shotItemUpdated; versionUpdateFailed is emitted if the version can't be found.
+        """
+        document = self.shot_document
+        self.request_version_data(
+            asset_name, department, version_str,
+            lambda new_data: self._on_shot_version_data(document, new_data, save),
+            channel=f"shot_version:{asset_name}/{department}"
+        )
+
+    def _on_shot_version_data(self, document: ShotDocument, new_data: dict, save: bool):
+        if document is not self.shot_document:
+            return # the shot was switched meanwhile
+        if self.shot_document.replace(new_data):
+            self.shotItemUpdated.emit(dict(new_data))
+            self.shotDirtyChanged.emit(True)
+            if save:
+                self.save_shot_data()
+
+    def save_shot_data(self):
+        """Saves the current shot document."""
         if not self.current_shot_json_path:
             print("[ERROR] Cannot save shot: Shot JSON path is not set.")
             return
@@ -81,14 +401,28 @@ class SceneConstructorModel(QtCore.QObject):
             print("[ERROR] Cannot save shot: No shot is selected.")
             return
 
-        # The data manager expects the full dict, keyed by shot name
-        shot_key = self.current_shot_name.casefold()
-        self.current_shot_data_cache[shot_key] = shot_data_list
-        
-        self.data_manager.save_shot_data(
+        document = self.shot_document
+        revision = document.revision
+
+        # Coalesced with other edits and written on the save queue's thread
+        self.data_manager.queue_shot_save(
             self.current_shot_json_path, 
-            self.current_shot_data_cache
+            document.to_dict(),
+            on_done=lambda path, data, error: self._shotFileWritten.emit(
+                document, revision, str(error) if error else ""
+            )
         )
+
+    @QtCore.Slot(object, int, str)
+    def _on_shot_file_written(self, document: ShotDocument, revision: int, error: str):
+        if error:
+            self.shotSaveFailed.emit(f"Could not save shot {document.shot_name}:\n{error}")
+            return
+        if document is not self.shot_document:
+            return # written after switching shots
+        self._shot_file_key = self._stat_shot_file()
+        document.mark_clean(revision)
+        self.shotDirtyChanged.emit(document.dirty)
         self.shotDataSaved.emit()
 
     def get_new_version_data(self, asset_name: str, department: str, version_str: str) -> dict | None:
@@ -114,19 +448,49 @@ class SceneConstructorModel(QtCore.QObject):
             """
             return self.data_manager.get_all_versions_for_asset(asset_name, department)
 
+    def request_version_data(self, asset_name: str, department: str, version_str: str, callback,
+                             channel: str = "version_data"):
+        """
+        Background get_new_version_data(): callback(new_data) is called on the GUI thread,
+        or versionUpdateFailed is emitted if the version can't be found.
+        A newer request on the same channel replaces this one.
+        """
+        def on_result(new_data):
+            if new_data is None:
+                self.versionUpdateFailed.emit(
+                    f"Could not find version '{version_str}' for {asset_name} {department}."
+                )
+                return
+            callback(new_data)
+
+        self.requests.submit(
+            channel, self.data_manager.get_asset_version_details, asset_name, department, version_str,
+            on_result=on_result,
+            on_error=lambda error: self.versionUpdateFailed.emit(
+                f"Could not load version '{version_str}' for {asset_name} {department}:\n{error}"
+            )
+        )
+
+    def request_all_versions(self, asset_name: str, department: str, callback):
+        """Background get_all_versions(): callback(versions) is called on the GUI thread."""
+        self.requests.submit('all_versions', self.get_all_versions, asset_name, department,
+                             on_result=callback)
+
     # --- State Setters ---
 
     def set_current_scene(self, scene_name: str):
-        """Sets the active scene and triggers a shot load."""
+        """Sets the active scene and triggers a shot load (cancelling a shot load still in flight)."""
         if scene_name != self.current_scene_name:
+            self.data_manager.flush_shot_saves(wait=False) # start writing the shot we leave
             self.current_scene_name = scene_name
             self.load_shots_for_scene(scene_name)
 
     def set_current_shot(self, shot_name: str):
-        """Sets the active shot and triggers a shot data load."""
-        # We check path as well, in case shot name is same but scene changed
-        new_path, _ = self.data_manager.load_shot_data(self.current_scene_name, shot_name)
-        
-        if new_path != self.current_shot_json_path:
+        """Sets the active shot and triggers a background shot data load."""
+        # We check path as well, in case shot name is same but scene changed (see _on_shot_data_read).
+        if not self.current_scene_name or not shot_name:
             self.current_shot_name = shot_name
-            self.load_shot_data()
\ No newline at end of file
+            self.load_shot_data()
+            return
+
+        self._request_shot_data(self.current_scene_name, shot_name, reload=False)
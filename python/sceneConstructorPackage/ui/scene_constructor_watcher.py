@@ -0,0 +1,341 @@
+# Path: python/sceneConstructorPackage/ui/scene_constructor_watcher.py
+
+import os
+import threading
+from pathlib import Path
+from PySide6 import QtCore
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.shot_edit_log import log_path
+from sceneConstructorPackage.ui.request_pool import RequestPool
+
+# Filesystems where native change notifications are unreliable or missing
+NETWORK_FILESYSTEMS = ('cifs', 'smb', 'smb2', 'smbfs', 'smb3', 'nfs', 'nfs4', 'afpfs', 'fuse.sshfs', '9p')
+
+
+def is_network_path(path) -> bool:
+    """True if path lives on a network mount (SMB/NFS...)."""
+    storage = QtCore.QStorageInfo(str(path))
+    fs_type = storage.fileSystemType().data().decode(errors="ignore").lower()
+    return fs_type in NETWORK_FILESYSTEMS
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def collect_watch_paths(data_manager) -> list[str]:
+    """
+    The directories (and shot JSON files) whose changes matter:
+    - ASSET_PUBLISH_ROOT, every asset dir and every known department's PUBLISH dir.
+    - SCENE_ROOT, every scene and shot dir, and each shot's SceneConstructor dir and JSON
+      (taken from the data manager's scene index).
+    Stats every shot, so the watcher runs it on its request pool.
+    """
+    paths = []
+
+    publish_root = config.ASSET_PUBLISH_ROOT
+    if publish_root.exists():
+        paths.append(str(publish_root))
+        assets = set()
+        for asset_name, department in data_manager.version_index.departments():
+            if asset_name not in assets:
+                assets.add(asset_name)
+                paths.append(str(publish_root / asset_name))
+            paths.append(str(publish_root / asset_name / department / "PUBLISH"))
+
+    scene_root = config.SCENE_ROOT
+    if scene_root.exists():
+        paths.append(str(scene_root))
+        scene_index = data_manager.scene_index
+        for scene_name in scene_index.scenes():
+            paths.append(str(scene_root / scene_name))
+            for shot_name in scene_index.shots(scene_name):
+                shot_dir = scene_root / scene_name / shot_name
+                paths.append(str(shot_dir))
+                info = scene_index.shot_info(scene_name, shot_name)
+                if info and info['json_path']:
+                    paths.append(str(shot_dir / 'SceneConstructor'))
+                    paths.append(info['json_path'])
+                    if log_path(info['json_path']).exists():
+                        paths.append(str(log_path(info['json_path'])))
+                elif (shot_dir / 'SceneConstructor').is_dir():
+                    paths.append(str(shot_dir / 'SceneConstructor'))
+    return paths
+
+
+def classify_path(path) -> tuple | None:
+    """
+    Maps a changed path to what it means for the app:
+    ('publish_root',), ('asset', asset), ('department', asset, department),
+    ('scene_root',), ('scene', scene), ('shot', scene, shot) or None.
+    """
+    path = Path(path)
+    for root, kind in ((config.ASSET_PUBLISH_ROOT, 'publish'), (config.SCENE_ROOT, 'scene')):
+        try:
+            parts = path.relative_to(root).parts
+        except ValueError:
+            continue
+
+        if kind == 'publish':
+            if not parts:
+                return ('publish_root',)
+            if len(parts) >= 3 and parts[2] == "PUBLISH":
+                return ('department', parts[0], parts[1])
+            return ('asset', parts[0])
+
+        if not parts:
+            return ('scene_root',)
+        if len(parts) == 1:
+            return ('scene', parts[0])
+        return ('shot', parts[0], parts[1])
+    return None
+
+
+class _PollingThread(QtCore.QThread):
+    """Stats the watched paths every interval and reports the ones that changed."""
+
+    pathsChanged = QtCore.Signal(list)
+
+    def __init__(self, interval_ms, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._paths = []
+
+    def set_paths(self, paths):
+        with self._lock:
+            self._paths = list(paths)
+
+    def run(self):
+        snapshot = {}
+        while not self.isInterruptionRequested():
+            with self._lock:
+                paths = list(self._paths)
+
+            changed = []
+            for path in paths:
+                key = _stat_key(path)
+                if path in snapshot and snapshot[path] != key:
+                    changed.append(path)
+                snapshot[path] = key
+            if changed:
+                self.pathsChanged.emit(changed)
+
+            # sleep in small steps so stop() does not wait a whole interval
+            for _ in range(max(1, self.interval_ms // 100)):
+                if self.isInterruptionRequested():
+                    return
+                self.msleep(100)
+
+
+class SceneConstructorWatcher(QtCore.QObject):
+    """
+    Watches SCENE_ROOT and ASSET_PUBLISH_ROOT and turns directory events into
+    fine-grained signals.
+    - Native notifications (QFileSystemWatcher) on local disks, polling on network mounts.
+    - Events are collected until WATCHER_DEBOUNCE_MS of quiet, and coalesced per
+      department/shot, so one publish writing several files gives one update.
+    - Collecting the paths and refreshing departments runs on a RequestPool; the
+      results come back as signals on the GUI thread.
+    """
+
+    actorAdded = QtCore.Signal(dict) # a new asset department was published
+    actorChanged = QtCore.Signal(dict) # latest version meta of a known department changed
+    versionAdded = QtCore.Signal(str, str, str) # name, department, version
+    scenesChanged = QtCore.Signal()
+    shotsChanged = QtCore.Signal(str) # scene
+    shotDataChanged = QtCore.Signal(str, str) # scene, shot
+
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.mode = None
+
+        self._pending = set()
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(config.WATCHER_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._flush)
+
+        self._native = None
+        self._poller = None
+
+        # one thread: path collection and department refreshes never overlap
+        self.requests = RequestPool(max_threads=1, parent=self)
+
+    def is_running(self) -> bool:
+        return self.mode is not None
+
+    def start(self):
+        """Picks a backend and starts watching (in the background). Call again to re-collect paths."""
+        self.requests.submit('paths', self._collect_paths, self.mode is None,
+                             on_result=self._on_paths_collected, background=True)
+
+    def stop(self):
+        self._debounce.stop()
+        self.requests.cancel_all()
+        self.requests.wait()
+        if self._poller is not None:
+            self._poller.requestInterruption()
+            self._poller.wait()
+            self._poller = None
+        if self._native is not None:
+            self._native.deleteLater()
+            self._native = None
+        self.mode = None
+
+    def _collect_paths(self, choose_mode: bool) -> tuple:
+        """Runs on the request pool: (paths, backend to use or None if one is running)."""
+        paths = collect_watch_paths(self.data_manager)
+        return paths, (self._choose_mode(paths) if choose_mode else None)
+
+    def _on_paths_collected(self, collected: tuple):
+        paths, mode = collected
+        if self.mode is None:
+            if mode in (None, 'off'):
+                return
+            self.mode = mode
+            print(f"[INFO] Watching for changes ({self.mode}).")
+        self._set_paths(paths)
+
+    def _choose_mode(self, paths) -> str:
+        mode = config.WATCHER_MODE
+        if mode != 'auto':
+            return mode
+        if len(paths) > config.WATCHER_MAX_NATIVE_PATHS:
+            return 'poll'
+        roots = (config.ASSET_PUBLISH_ROOT, config.SCENE_ROOT)
+        if any(root.exists() and is_network_path(root) for root in roots):
+            return 'poll'
+        return 'native'
+
+    def _set_paths(self, paths):
+        if self.mode == 'poll':
+            if self._poller is None:
+                self._poller = _PollingThread(config.WATCHER_POLL_INTERVAL_MS, parent=self)
+                self._poller.pathsChanged.connect(self._queue_paths)
+                self._poller.set_paths(paths)
+                self._poller.start()
+            else:
+                self._poller.set_paths(paths)
+            return
+
+        if self._native is None:
+            self._native = QtCore.QFileSystemWatcher(self)
+            self._native.directoryChanged.connect(self._queue_path)
+            self._native.fileChanged.connect(self._queue_path)
+
+        # files replaced by a rename drop out of the watcher, so re-add every time
+        watched = set(self._native.directories()) | set(self._native.files())
+        wanted = set(paths)
+        stale = [p for p in watched if p not in wanted]
+        if stale:
+            self._native.removePaths(stale)
+        missing = [p for p in wanted if p not in watched]
+        if missing:
+            self._native.addPaths(missing)
+
+    @QtCore.Slot(str)
+    def _queue_path(self, path: str):
+        self._queue_paths([path])
+
+    @QtCore.Slot(list)
+    def _queue_paths(self, paths: list):
+        self._pending.update(paths)
+        self._debounce.start() # restart: wait for the burst to settle
+
+    @QtCore.Slot()
+    def _flush(self):
+        if self.requests.is_pending('changes'):
+            return # the previous batch is still being read, _on_changes_read flushes again
+
+        pending, self._pending = self._pending, set()
+
+        publish_root_changed = False
+        assets = set()
+        departments = set()
+        scenes = set()
+        shots = set()
+        scene_root_changed = False
+
+        for path in pending:
+            change = classify_path(path)
+            if change is None:
+                continue
+            kind = change[0]
+            if kind == 'publish_root':
+                publish_root_changed = True
+            elif kind == 'asset':
+                assets.add(change[1])
+            elif kind == 'department':
+                departments.add((change[1], change[2]))
+            elif kind == 'scene_root':
+                scene_root_changed = True
+            elif kind == 'scene':
+                scenes.add(change[1])
+            elif kind == 'shot':
+                shots.add((change[1], change[2]))
+
+        if scene_root_changed:
+            self.scenesChanged.emit()
+        for scene_name in sorted(scenes):
+            self.shotsChanged.emit(scene_name)
+        for scene_name, shot_name in sorted(shots):
+            self.shotDataChanged.emit(scene_name, shot_name)
+
+        # new scene/shot dirs need watching too
+        rewatch = scene_root_changed or bool(scenes) or bool(shots)
+        if publish_root_changed or assets or departments or rewatch:
+            self.requests.submit('changes', self._read_changes, publish_root_changed, assets, departments, rewatch,
+                                 on_result=self._on_changes_read, on_error=self._on_changes_failed, background=True)
+
+    def _read_changes(self, publish_root_changed: bool, assets: set, departments: set, rewatch: bool) -> tuple:
+        """
+        Runs on the request pool: refreshes the changed departments and returns
+        ([(asset, department, new_versions, meta, was_known)], paths to watch or None).
+        """
+        if publish_root_changed:
+            assets = assets | set(self.data_manager.list_new_assets())
+        departments = set(departments)
+        for asset_name in assets:
+            for department in self.data_manager.list_departments(asset_name):
+                departments.add((asset_name, department))
+
+        refreshed = []
+        for asset_name, department in sorted(departments):
+            try:
+                new_versions, meta, was_known = self.data_manager.refresh_department(asset_name, department)
+            except Exception as e:
+                print(f"[ERROR] Could not refresh {asset_name}/{department}: {e}")
+                continue
+            refreshed.append((asset_name, department, new_versions, meta, was_known))
+
+        # new asset/department dirs need watching too
+        paths = collect_watch_paths(self.data_manager) if assets or rewatch else None
+        return refreshed, paths
+
+    def _on_changes_read(self, changes: tuple):
+        refreshed, paths = changes
+        for asset_name, department, new_versions, meta, was_known in refreshed:
+            for version_str in new_versions:
+                self.versionAdded.emit(asset_name, department, version_str)
+
+            if meta is None:
+                continue
+            if not was_known:
+                self.actorAdded.emit(meta)
+            elif new_versions:
+                self.actorChanged.emit(meta)
+
+        if paths is not None and self.mode is not None:
+            self._set_paths(paths)
+        if self._pending:
+            self._debounce.start() # events that came in while this batch was read
+
+    def _on_changes_failed(self, error: str):
+        if self._pending:
+            self._debounce.start()
@@ -0,0 +1,227 @@
+# Path: python/sceneConstructorPackage/ui/thumbnail_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from PySide6 import QtCore, QtGui
+from sceneConstructorPackage import config
+from sceneConstructorPackage.ui.request_pool import RequestPool
+from sceneConstructorPackage.utils.thumbnailAtlas import read_atlas_index, tile_key
+from sceneConstructorPackage.utils.thumbnailUtils import load_scaled_image
+
+
+class ThumbnailDiskCache:
+    """
+    Pre-scaled thumbnails on the local disk, keyed by source path + mtime + size,
+    so a re-written source gets a new entry. Safe to use from several threads.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, source: str, st: os.stat_result) -> Path:
+        key = f"{os.path.normcase(os.path.abspath(source))}|{st.st_mtime_ns}|{st.st_size}|{self.max_size}"
+        return self.cache_dir / (hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def load(self, source: str) -> QtGui.QImage:
+        """The thumbnail of source, decoded from the cache or (then cached) from the source."""
+        try:
+            st = os.stat(source)
+        except OSError:
+            return QtGui.QImage()
+
+        entry = self.entry_path(source, st)
+        if entry.exists():
+            image = QtGui.QImage(str(entry))
+            if not image.isNull():
+                return image
+
+        image = load_scaled_image(source, self.max_size)
+        if not image.isNull():
+            self._store(entry, image)
+        return image
+
+    def _store(self, entry: Path, image: QtGui.QImage):
+        tmp_path = entry.with_name(f".{entry.stem}.{os.getpid()}.{threading.get_ident()}.png")
+        try:
+            if image.save(str(tmp_path), 'PNG'):
+                os.replace(tmp_path, entry)
+        except OSError as e:
+            print(f"[WARN] Could not cache thumbnail {entry.name}: {e}")
+        finally:
+            if tmp_path.exists():
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def prune(self):
+        """Deletes the least recently written thumbnails until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class ThumbnailCache(QtCore.QObject):
+    """
+    Snapshot thumbnails for the browser.
+    - request(path) answers from an in-memory LRU of QImages (bounded in bytes) right away,
+      or decodes in the background and emits thumbnailReady(path, image).
+    - Background decodes go through the local disk cache, and only the latest request is
+      decoded when several are queued (arrowing through a tree).
+    """
+
+    thumbnailReady = QtCore.Signal(str, QtGui.QImage) # source path, image (null if unreadable)
+
+    def __init__(self, max_size=None, memory_bytes=None, cache_dir=None, disk_bytes=None, parent=None):
+        super().__init__(parent)
+        self.disk_cache = ThumbnailDiskCache(
+            cache_dir or config.THUMBNAIL_CACHE_DIR,
+            max_size or config.THUMBNAIL_SIZE,
+            disk_bytes if disk_bytes is not None else config.THUMBNAIL_DISK_CACHE_MB * 1024 * 1024,
+        )
+        self.memory_bytes = memory_bytes if memory_bytes is not None else config.THUMBNAIL_MEMORY_MB * 1024 * 1024
+        self._images = OrderedDict() # source path -> QImage, least recently used first
+        self._bytes = 0
+
+        self.requests = RequestPool(max_threads=2, parent=self)
+        self.requests.submit('prune', self.disk_cache.prune, background=True)
+
+    def get(self, path: str) -> QtGui.QImage | None:
+        """The thumbnail if it is in memory, else None. Never touches the disk."""
+        image = self._images.get(path)
+        if image is not None:
+            self._images.move_to_end(path)
+        return image
+
+    def request(self, path: str) -> QtGui.QImage | None:
+        """
+        Returns the thumbnail if it is in memory. Otherwise decodes it in the background
+        (replacing a previous request that has not started yet) and returns None.
+        """
+        image = self.get(path)
+        if image is not None:
+            return image
+
+        self.requests.submit('decode', self.disk_cache.load, path,
+                             on_result=lambda image: self._on_decoded(path, image))
+        return None
+
+    def clear(self):
+        self._images.clear()
+        self._bytes = 0
+
+    def _on_decoded(self, path: str, image: QtGui.QImage):
+        if not image.isNull():
+            self._insert(path, image)
+        self.thumbnailReady.emit(path, image)
+
+    def _insert(self, path: str, image: QtGui.QImage):
+        old = self._images.pop(path, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._images[path] = image
+        self._bytes += image.sizeInBytes()
+
+        while self._bytes > self.memory_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._bytes -= evicted.sizeInBytes()
+
+
+def read_atlas(actor_type: str, root=None) -> tuple[dict, QtGui.QImage] | None:
+    """The index and image of a type's thumbnail atlas, or None if there is none."""
+    root = Path(root or config.ATLAS_ROOT)
+    for _ in range(2): # the image may be replaced between reading the index and opening it
+        index = read_atlas_index(actor_type, root)
+        if index is None:
+            return None
+        image = QtGui.QImage(str(root / index['image']))
+        if not image.isNull():
+            return index, image
+    print(f"[WARN] Could not read the {actor_type} thumbnail atlas image.")
+    return None
+
+
+class ThumbnailAtlasCache(QtCore.QObject):
+    """
+    Thumbnail tiles cropped in memory from the per-type atlases (utils/thumbnailAtlas.py),
+    so a browser with thousands of rows opens one file per actor type.
+    - An atlas is read in the background the first time one of its tiles is asked for;
+      atlasLoaded(type) is emitted when it arrives.
+    - invalidate(type) re-reads it on next use, serving the current one meanwhile.
+    """
+
+    atlasLoaded = QtCore.Signal(str) # actor type
+
+    def __init__(self, root=None, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self._atlases = {} # type -> (index, QImage), or None when the type has no atlas
+        self._tiles = {} # (type, tile key) -> cropped QPixmap
+        self._stale = set()
+        self.requests = RequestPool(max_threads=2, parent=self)
+
+    def tile(self, actor_type: str, asset_name: str, department: str) -> QtGui.QPixmap | None:
+        """The tile of an asset department, or None if it is not (yet) available."""
+        if actor_type not in self._atlases or actor_type in self._stale:
+            self._load(actor_type)
+        atlas = self._atlases.get(actor_type)
+        if atlas is None:
+            return None
+
+        key = tile_key(asset_name, department)
+        pixmap = self._tiles.get((actor_type, key))
+        if pixmap is None:
+            index, image = atlas
+            tile = index['tiles'].get(key)
+            if tile is None:
+                return None
+            pixmap = QtGui.QPixmap.fromImage(image.copy(tile['x'], tile['y'], tile['width'], tile['height']))
+            self._tiles[(actor_type, key)] = pixmap
+        return pixmap
+
+    def invalidate(self, actor_type: str):
+        if actor_type in self._atlases:
+            self._stale.add(actor_type)
+
+    def _load(self, actor_type: str):
+        channel = f"atlas:{actor_type}"
+        if self.requests.is_pending(channel):
+            return
+        self._stale.discard(actor_type)
+        self.requests.submit(channel, read_atlas, actor_type, self.root,
+                             on_result=lambda atlas: self._on_loaded(actor_type, atlas),
+                             background=True)
+
+    def _on_loaded(self, actor_type: str, atlas):
+        old = self._atlases.get(actor_type)
+        self._atlases[actor_type] = atlas
+        if old is not None and atlas is not None and old[0].get('generation') == atlas[0].get('generation'):
+            return # unchanged
+        for key in [key for key in self._tiles if key[0] == actor_type]:
+            del self._tiles[key]
+        self.atlasLoaded.emit(actor_type)
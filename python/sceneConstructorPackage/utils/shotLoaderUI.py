@@ -1,14 +1,19 @@
 import maya.cmds as cmds
 import os
 import json
+from pathlib import Path
 
 # Path: sceneConstructorPackage/python/sceneConstructorPackage/utils/shotLoaderUI.py
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.asset_cache import LocalAssetCache
 from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.core.import_plan import ImportExecutor, file_size, plan_imports
 
 class ShotLoaderUI(object):
     def __init__(self):
         #hardcoded paths removed
         self.data_manager = DataManager()
+        self.asset_cache = LocalAssetCache() if config.ASSET_CACHE_ENABLED else None
         self.window = "shotLoader"
         
         self.build_ui()
@@ -102,34 +107,41 @@ class ShotLoaderUI(object):
 
         shot_items = shot_data_dict.get(current_selected_shot.casefold(), [])
 
-        for item in shot_items:
-            path_to_import = item.get("path")
-            actor_name = item.get("name", "UnknownActor")
-            actor_type = item.get("type", "asset")
-
-            if not path_to_import:
-                print(f"[WARN] Actor {actor_name} is missing a path. Skipping.")
-                continue
-
-            # determine maya file type and namespace
-            file_type = "file" 
-            if path_to_import.lower().endswith(('.usd', '.usda', '.usdc')):
-                file_type = "USD Import"
-            #TODO:add other format detection here (e.g., .fbx, .obj)
-
-            namespace = f"{current_selected_shot}_{actor_name}"
-            
-            #execute the Maya import command
-            try:
-                cmds.file(
-                    path_to_import,
-                    i=True, 
-                    type=file_type,
-                    ignoreVersion=True,
-                    mergeNamespacesOnClash=False,
-                    namespace=namespace,
-                    options="v=0;p=17;f=0" 
-                )
-                print(f"[SUCCESS] Imported {actor_name} into namespace {namespace}")
-            except Exception as e:
-                print(f"[ERROR] Failed to import {actor_name} from {path_to_import}: {e}")
\ No newline at end of file
+        # plan first (pure python), then fetch to the local cache while importing
+        plan = plan_imports(current_selected_shot, shot_items, size_of=file_size)
+        for actor_name, reason in plan.skipped:
+            print(f"[WARN] Actor {actor_name}: {reason}. Skipping.")
+        print(f"[INFO] Import plan for {current_selected_shot}: {plan.summary()}")
+
+        result = MayaImportExecutor(self.asset_cache).run(plan)
+        if result["failed"]:
+            cmds.warning(f"{len(result['failed'])} actors failed to import, see the script editor.")
+
+
+class MayaImportExecutor(ImportExecutor):
+    """Imports with cmds.file, fetching the files through the local asset cache (if any)."""
+
+    def __init__(self, asset_cache=None):
+        super().__init__(workers=config.ASSET_CACHE_WORKERS)
+        self.asset_cache = asset_cache
+
+    def fetch(self, path, digest):
+        if self.asset_cache is None:
+            return path
+        return self.asset_cache.get(path, digest)
+
+    def import_step(self, step, local_path):
+        cmds.file(
+            local_path,
+            i=True, 
+            type=step.file_type,
+            ignoreVersion=True,
+            mergeNamespacesOnClash=False,
+            namespace=step.namespace,
+            options="v=0;p=17;f=0" 
+        )
+        print(f"[SUCCESS] Imported {step.name} into namespace {step.namespace}")
+
+    def finish(self, local_paths):
+        if self.asset_cache is not None:
+            self.asset_cache.prune(keep={Path(p) for p in local_paths.values()})
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+from pathlib import Path
+from PySide6 import QtCore, QtGui
+
+from .. import config
+from ..core.utils import DirectoryLock, atomic_write_json
+from .thumbnailUtils import load_scaled_image, thumbnail_path
+
+# Path: sceneConstructorPackage/python/sceneConstructorPackage/utils/thumbnailAtlas.py
+
+ATLAS_INDEX_VERSION = 1
+ATLAS_BACKGROUND = QtGui.QColor(43, 43, 43) # the tree background, so letterboxing disappears
+
+
+def tile_key(asset_name: str, department: str) -> str:
+    return f"{asset_name}/{department}"
+
+
+def atlas_index_path(actor_type: str, root=None) -> Path:
+    return Path(root or config.ATLAS_ROOT) / f"{actor_type}_atlas.json"
+
+
+def read_atlas_index(actor_type: str, root=None) -> dict | None:
+    """
+    The JSON index of an atlas: 'image' (file name next to the index), 'cell', 'columns'
+    and 'tiles' {"<asset>/<department>": {"x", "y", "width", "height", "slot", "version", "source"}}.
+    Returns None if there is no readable index.
+    """
+    try:
+        with open(atlas_index_path(actor_type, root), 'r') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[WARN] Could not read {actor_type} thumbnail atlas index: {e}")
+        return None
+    if index.get('version') != ATLAS_INDEX_VERSION:
+        return None
+    return index
+
+
+def tile_source(actor: dict) -> str:
+    """The image a tile is made from: the small publish thumbnail, else the snapshot."""
+    return thumbnail_path(actor, 'small') or actor.get('snapshot') or ""
+
+
+def update_atlas(actor_type: str, actors: list, root=None, force: bool = False) -> dict | None:
+    """
+    Brings the atlas of actor_type in line with actors (the latest actor records of that type).
+    Unchanged tiles keep their place and are not decoded again; tiles whose source changed are
+    repainted in place, new ones fill freed slots first. force=True repaints everything.
+    Returns the index, or None if nothing could be written.
+    """
+    wanted = {}
+    for actor in actors:
+        source = tile_source(actor)
+        if source:
+            wanted[tile_key(actor.get('name'), actor.get('department'))] = (source, actor.get('version'))
+    return _apply(actor_type, wanted, root, replace_all=True, force=force)
+
+
+def update_atlas_tile(actor: dict, root=None) -> dict | None:
+    """Repaints (or adds) the tile of one newly published actor. Called by the publisher."""
+    source = tile_source(actor)
+    if not source or not actor.get('type'):
+        return None
+    key = tile_key(actor.get('name'), actor.get('department'))
+    return _apply(actor['type'], {key: (source, actor.get('version'))}, root, replace_all=False)
+
+
+def _apply(actor_type: str, wanted: dict, root, replace_all: bool, force: bool = False) -> dict | None:
+    root = Path(root or config.ATLAS_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    cell = config.ATLAS_CELL_SIZE
+    columns = config.ATLAS_COLUMNS
+
+    with DirectoryLock(root / f".{actor_type}_atlas.lock", timeout=60.0):
+        index = None if force else read_atlas_index(actor_type, root)
+        image = QtGui.QImage()
+        if index is not None and (index.get('cell'), index.get('columns')) == (cell, columns):
+            image = QtGui.QImage(str(root / index['image']))
+        if image.isNull():
+            index = None # no (usable) atlas yet: every tile is painted
+        if index is None:
+            index = {'version': ATLAS_INDEX_VERSION, 'type': actor_type, 'cell': cell,
+                     'columns': columns, 'generation': 0, 'image': "", 'tiles': {}}
+        tiles = index['tiles']
+
+        removed = [key for key in tiles if key not in wanted] if replace_all else []
+        changed = [
+            key for key, (source, version) in wanted.items()
+            if key not in tiles or (tiles[key].get('source'), tiles[key].get('version')) != (source, version)
+        ]
+        if not removed and not changed:
+            return index
+
+        # slots: removed tiles free theirs, changed tiles keep theirs, new tiles take the lowest free one
+        freed = [tiles.pop(key)['slot'] for key in removed]
+        used = {tile['slot'] for tile in tiles.values()}
+        # the slots freed now, plus holes left by earlier removals or skipped tiles
+        free = sorted(set(freed).union(range(max(used, default=-1) + 1)) - used)
+        max_slots = (65535 // cell) * columns # JPEG height limit
+
+        painter_jobs = []
+        for key in sorted(changed):
+            if key in tiles:
+                slot = tiles[key]['slot']
+            elif free:
+                slot = free.pop(0)
+            else:
+                slot = max(used, default=-1) + 1
+            if slot >= max_slots:
+                print(f"[WARN] {actor_type} thumbnail atlas is full, skipping {key}.")
+                continue
+            used.add(slot)
+            painter_jobs.append((key, slot))
+
+        rows = (max(used, default=-1) + 1 + columns - 1) // columns
+        size = QtCore.QSize(columns * cell, max(rows, 1) * cell)
+        if image.size() != size:
+            grown = QtGui.QImage(size, QtGui.QImage.Format_RGB32)
+            grown.fill(ATLAS_BACKGROUND)
+            if not image.isNull():
+                painter = QtGui.QPainter(grown)
+                painter.drawImage(0, 0, image)
+                painter.end()
+            image = grown
+
+        painter = QtGui.QPainter(image)
+        for slot in freed:
+            if slot not in used:
+                painter.fillRect(_cell_rect(slot, cell, columns), ATLAS_BACKGROUND)
+        for key, slot in painter_jobs:
+            source, version = wanted[key]
+            cell_rect = _cell_rect(slot, cell, columns)
+            painter.fillRect(cell_rect, ATLAS_BACKGROUND)
+            tile = load_scaled_image(source, cell)
+            if tile.isNull():
+                tiles.pop(key, None)
+                continue
+            x = cell_rect.x() + (cell - tile.width()) // 2
+            y = cell_rect.y() + (cell - tile.height()) // 2
+            painter.drawImage(x, y, tile)
+            tiles[key] = {'slot': slot, 'x': x, 'y': y, 'width': tile.width(), 'height': tile.height(),
+                          'version': version, 'source': source}
+        painter.end()
+
+        # a new image file per generation: readers holding the previous index still find its image
+        previous = index.get('image')
+        index['generation'] = index.get('generation', 0) + 1
+        index['image'] = f"{actor_type}_atlas.{index['generation']}.jpg"
+        image_path = root / index['image']
+        tmp_path = root / f".{index['image']}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if not image.save(str(tmp_path), 'JPG', config.ATLAS_JPEG_QUALITY):
+            print(f"[ERROR] Could not write thumbnail atlas {image_path}")
+            if tmp_path.exists():
+                os.remove(tmp_path)
+            return None
+        os.replace(tmp_path, image_path)
+        atomic_write_json(atlas_index_path(actor_type, root), index, indent=None)
+        _remove_old_generations(root, actor_type, keep={index['image'], previous})
+
+    print(f"[OK] {actor_type} thumbnail atlas: {len(painter_jobs)} tiles painted, {len(removed)} removed, {len(tiles)} total.")
+    return index
+
+
+def _cell_rect(slot: int, cell: int, columns: int) -> QtCore.QRect:
+    return QtCore.QRect((slot % columns) * cell, (slot // columns) * cell, cell, cell)
+
+
+def _remove_old_generations(root: Path, actor_type: str, keep: set):
+    prefix = f"{actor_type}_atlas."
+    for entry in os.scandir(root):
+        if entry.name.startswith(prefix) and entry.name.endswith('.jpg') and entry.name not in keep:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,153 @@
+import base64
+import json
+import os
+import threading
+from pathlib import Path
+from PySide6 import QtCore, QtGui
+
+from .. import config
+from ..core.utils import atomic_write_json
+
+# Path: sceneConstructorPackage/python/sceneConstructorPackage/utils/thumbnailUtils.py
+
+# meta keys written by write_thumbnails()
+THUMBNAIL_META_KEYS = ("snapshot_size", "thumbnails", "placeholder")
+
+
+def load_scaled_image(path: str, max_size: int) -> QtGui.QImage:
+    """
+    Decodes an image straight to at most max_size pixels on its longest edge.
+    QImageReader scales while decoding (JPEG) or right after, so the full-size
+    image never has to be converted or kept. Returns a null QImage on failure.
+    """
+    reader = QtGui.QImageReader(str(path))
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > max_size:
+        reader.setScaledSize(size.scaled(max_size, max_size, QtCore.Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        print(f"[WARN] Could not read image {path}: {reader.errorString()}")
+    return image
+
+
+def _fit(image: QtGui.QImage, max_size: int) -> QtGui.QImage:
+    if max(image.width(), image.height()) <= max_size:
+        return image
+    return image.scaled(max_size, max_size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+
+
+def _save_image(image: QtGui.QImage, path: Path, quality: int) -> bool:
+    """Writes through a temp file, so readers never see a partial thumbnail."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if not image.save(str(tmp_path), 'JPG', quality):
+            print(f"[WARN] Could not write thumbnail {path}")
+            return False
+        os.replace(tmp_path, path)
+        return True
+    finally:
+        if tmp_path.exists():
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def placeholder_data_uri(image: QtGui.QImage, size: int | None = None) -> str:
+    """A few hundred bytes of tiny JPEG, shown blurred (upscaled) until the real thumbnail arrives."""
+    tiny = _fit(image, size or config.THUMBNAIL_PLACEHOLDER_SIZE)
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    tiny.save(buffer, 'JPG', 50)
+    buffer.close()
+    return "data:image/jpeg;base64," + base64.b64encode(bytes(data)).decode('ascii')
+
+
+def placeholder_image(data_uri: str) -> QtGui.QImage:
+    """Decodes placeholder_data_uri() output. Returns a null QImage if it is not one."""
+    header, _, payload = (data_uri or "").partition(',')
+    if not header.startswith("data:image/") or not payload:
+        return QtGui.QImage()
+    try:
+        return QtGui.QImage.fromData(base64.b64decode(payload))
+    except ValueError:
+        return QtGui.QImage()
+
+
+def write_thumbnails(snapshot_path, output_dir, base_name: str, recorded_dir=None) -> dict:
+    """
+    Writes the config.THUMBNAIL_SIZES thumbnails of a snapshot to output_dir
+    as {base_name}_thumb_{size name}.jpg.
+    Returns the meta fields describing them (see THUMBNAIL_META_KEYS), or {} if the
+    snapshot can't be read. The snapshot is decoded once, at the largest size.
+    Paths are recorded under recorded_dir when the files are moved there later (staged publish).
+    """
+    reader = QtGui.QImageReader(str(snapshot_path))
+    snapshot_size = reader.size()
+    image = load_scaled_image(snapshot_path, max(config.THUMBNAIL_SIZES.values()))
+    if image.isNull():
+        return {}
+    if not snapshot_size.isValid():
+        snapshot_size = image.size()
+
+    thumbnails = {}
+    smallest = image
+    # largest first, so each size is scaled from the previous one
+    for size_name, max_size in sorted(config.THUMBNAIL_SIZES.items(), key=lambda kv: -kv[1]):
+        smallest = _fit(smallest, max_size)
+        thumb_path = Path(output_dir) / f"{base_name}_thumb_{size_name}.jpg"
+        if not _save_image(smallest, thumb_path, config.THUMBNAIL_JPEG_QUALITY):
+            continue
+        thumbnails[size_name] = {
+            "path": str(Path(recorded_dir or output_dir) / thumb_path.name),
+            "width": smallest.width(),
+            "height": smallest.height(),
+        }
+
+    return {
+        "snapshot_size": [snapshot_size.width(), snapshot_size.height()],
+        "thumbnails": thumbnails,
+        "placeholder": placeholder_data_uri(smallest),
+    }
+
+
+def thumbnail_path(meta: dict, size_name: str) -> str:
+    """The path of a thumbnail recorded in a publish meta, or '' if there is none."""
+    return ((meta.get("thumbnails") or {}).get(size_name) or {}).get("path", "")
+
+
+def backfill_meta(meta_path: str, force: bool = False) -> tuple[str, dict | None]:
+    """
+    Adds thumbnails to an existing publish from its snapshot, and rewrites its meta.
+    Returns (status, meta): status is 'done', 'skipped' (already has them, or no snapshot)
+    or 'failed'; meta is the updated meta when status is 'done'.
+    """
+    meta_path = Path(meta_path)
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+    except Exception as e:
+        print(f"[ERROR] Could not read {meta_path}: {e}")
+        return 'failed', None
+
+    if not force and all(thumbnail_path(meta, name) for name in config.THUMBNAIL_SIZES):
+        return 'skipped', None
+
+    snapshot = meta.get("snapshot")
+    if not snapshot or not os.path.exists(snapshot):
+        return 'skipped', None
+
+    base_name = meta_path.name[:-len("_meta.json")]
+    fields = write_thumbnails(snapshot, meta_path.parent, base_name)
+    if not fields:
+        return 'failed', None
+
+    meta.update(fields)
+    try:
+        atomic_write_json(meta_path, meta, indent=4)
+    except OSError as e:
+        print(f"[ERROR] Could not write {meta_path}: {e}")
+        return 'failed', None
+    return 'done', meta
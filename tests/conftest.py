@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the 'python' directory containing sceneConstructorPackage to sys.path, as the bin scripts do
+package_path = str(Path(__file__).resolve().parent.parent / 'python')
+if package_path not in sys.path:
+    sys.path.insert(0, package_path)
+
+# config creates its roots on import: point them at a throwaway dir unless the environment sets them
+_test_root = Path(tempfile.mkdtemp(prefix="sceneConstructor_tests_"))
+os.environ.setdefault('SCENE_CONSTRUCTOR_ROOT', str(_test_root))
+os.environ.setdefault('SCENE_DATA_ROOT', str(_test_root / 'scene'))
+os.environ.setdefault('ASSET_PUBLISH_ROOT', str(_test_root / 'assets'))
+os.environ.setdefault('AUTHORS_ROOT', str(_test_root / 'userPrefs'))
+os.environ.setdefault('SCENE_CONSTRUCTOR_CACHE', str(_test_root / 'cache'))
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+import pytest
+
+from sceneConstructorPackage.core.asset_catalog import AssetCatalog
+from sceneConstructorPackage.core.publish_scanner import PublishScanner
+
+
+def publish(root, asset, department, version, loadable=True, meta=True):
+    version_dir = root / asset / department / "PUBLISH" / version
+    version_dir.mkdir(parents=True)
+    asset_file = version_dir / f"{asset}_{department.lower()}_{version}.ma"
+    if loadable:
+        asset_file.write_text("//Maya ASCII")
+    if meta:
+        with open(version_dir / f"{asset}_{department.lower()}_{version}_meta.json", "w") as f:
+            json.dump({"type": "prop", "department": department, "version": version, "path": str(asset_file)}, f)
+    # the catalog tracks directory mtimes: make every change visible, however fast the test runs
+    bump = time.time() + len(os.listdir(version_dir.parent))
+    for path in (version_dir.parent, root / asset):
+        os.utime(path, (bump, bump))
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "assets"
+    publish(root, "chair", "GEO", "v001")
+    publish(root, "chair", "GEO", "v002")
+    publish(root, "chair", "RIG", "v001", loadable=False)
+    publish(root, "lamp", "GEO", "v009")
+    publish(root, "lamp", "GEO", "v010")
+    publish(root, "table", "GEO", "v001", meta=False)
+    (root / "table" / "WORK").mkdir()
+    (root / ".publish_journal.jsonl").write_text("")
+    return root
+
+
+def catalog_actors(catalog, root):
+    catalog.refresh(root)
+    return sorted(catalog.get_actors(), key=lambda x: (x.get('name', ''), x.get('department', '')))
+
+
+def test_catalog_matches_the_uncached_scan(tmp_path, root):
+    scanned = PublishScanner(max_workers=4).scan(root)
+    assert [(a["name"], a["department"], a["version"]) for a in scanned] == [
+        ("chair", "GEO", "v002"), ("lamp", "GEO", "v010")
+    ]
+
+    catalog = AssetCatalog(tmp_path / "catalog.db")
+    assert catalog_actors(catalog, root) == scanned
+    assert catalog_actors(catalog, root) == scanned # second, incremental refresh
+
+    # a reopened catalog (next session) still gives the same answer
+    catalog.close()
+    catalog = AssetCatalog(tmp_path / "catalog.db")
+    assert catalog_actors(catalog, root) == scanned
+    catalog.close()
+
+
+def test_meta_that_is_not_an_object_only_skips_its_version(tmp_path, root):
+    meta_path = root / "lamp" / "GEO" / "PUBLISH" / "v010" / "lamp_geo_v010_meta.json"
+    meta_path.write_text('["not", "a", "meta"]')
+    scanned = PublishScanner().scan(root)
+    assert [(a["name"], a["version"]) for a in scanned] == [("chair", "v002")]
+
+    catalog = AssetCatalog(tmp_path / "catalog.db")
+    assert catalog_actors(catalog, root) == scanned
+    catalog.close()
+
+
+def test_catalog_follows_changes_on_disk(tmp_path, root):
+    catalog = AssetCatalog(tmp_path / "catalog.db")
+    catalog.refresh(root)
+
+    publish(root, "chair", "GEO", "v003")
+    publish(root, "cup", "MDL", "v001")
+    publish(root, "table", "GEO", "v002")
+    assert catalog_actors(catalog, root) == PublishScanner().scan(root)
+    assert catalog.get_versions("chair", "GEO") == ["v001", "v002", "v003"]
+    assert catalog.get_versions("lamp", "GEO") == ["v009", "v010"]
+    catalog.close()
+
+
+def test_bulk_version_lookup(tmp_path, root):
+    catalog = AssetCatalog(tmp_path / "catalog.db")
+    catalog.refresh(root)
+    keys = [("chair", "GEO", "v002"), ("lamp", "GEO", "v010"), ("chair", "GEO", "v001"), ("nope", "GEO", "v001")]
+    metas = catalog.get_version_metas(keys * 200) # more keys than one query may bind
+    assert set(metas) == {("chair", "GEO", "v002"), ("lamp", "GEO", "v010")} # only the latest is read by a scan
+    assert metas[("lamp", "GEO", "v010")] == catalog.get_version_meta("lamp", "GEO", "v010")
+    catalog.close()
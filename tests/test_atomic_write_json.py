@@ -0,0 +1,27 @@
+import json
+import threading
+
+from sceneConstructorPackage.core.utils import atomic_write_json
+
+
+def test_concurrent_writers_in_one_process(tmp_path):
+    path = tmp_path / "shot.json"
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(30):
+                atomic_write_json(path, {"writer": n, "i": i, "items": list(range(200))})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with open(path) as f:
+        assert json.load(f)["i"] == 29
+    assert [p.name for p in tmp_path.iterdir()] == ["shot.json"] # no temp file left behind
@@ -0,0 +1,37 @@
+import os
+import stat
+
+import pytest
+
+from sceneConstructorPackage.core.blob_store import BlobStore
+
+
+@pytest.mark.skipif(os.name == "nt" or os.geteuid() == 0, reason="root ignores write permissions")
+def test_published_links_are_read_only(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    source = tmp_path / "chair.ma"
+    source.write_bytes(b"chair geometry")
+
+    digest, stored = store.put(source)
+    assert stored
+    assert store.put(source) == (digest, False)
+
+    v001, v002 = tmp_path / "v001.ma", tmp_path / "v002.ma"
+    store.link(digest, v001)
+    store.link(digest, v002)
+    with pytest.raises(PermissionError):
+        with open(v001, "wb") as f:
+            f.write(b"saved in place")
+    assert v002.read_bytes() == b"chair geometry"
+
+
+def test_blobs_and_links_are_write_protected(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    source = tmp_path / "chair.ma"
+    source.write_bytes(b"chair geometry")
+    digest, _ = store.put(source)
+    store.link(digest, tmp_path / "v001.ma")
+
+    for path in (store.blob_path(digest), tmp_path / "v001.ma"):
+        assert not os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+    assert [p.name for p in store.blob_path(digest).parent.iterdir()] == [digest] # no temp left
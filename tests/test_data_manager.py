@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from sceneConstructorPackage import config
+from sceneConstructorPackage.core.data_manager import DataManager
+from sceneConstructorPackage.core.shot_edit_log import log_path
+
+
+def item(name, version="v001"):
+    return {"name": name, "department": "MDL", "version": version, "path": f"/pub/{name}_{version}.ma",
+            "note": "padding " * 10}
+
+
+@pytest.fixture
+def data_manager(monkeypatch):
+    monkeypatch.setattr(config, "SHOT_PARTIAL_IO_BYTES", 2000)
+    monkeypatch.setattr(config, "SHOT_FILE_FORMAT", "full")
+    data_manager = DataManager(use_catalog=False)
+    yield data_manager
+    data_manager.save_queue.close()
+
+
+def multi_shot_file(data_manager, scene):
+    path = data_manager.find_shot_json(scene, "sh010")
+    path.parent.mkdir(parents=True)
+    data = {"sh010": [item(f"a{i}") for i in range(20)], "sh020": [item(f"b{i}") for i in range(5)]}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+    assert path.stat().st_size > config.SHOT_PARTIAL_IO_BYTES
+    return path, data
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_other_shots_survive_saves_that_shrink_the_file(data_manager, monkeypatch):
+    monkeypatch.setattr(config, "SHOT_EDIT_LOG", False)
+    path, original = multi_shot_file(data_manager, "partial_io")
+
+    json_path, data = data_manager.load_shot_data("partial_io", "sh010")
+    assert list(data) == ["sh010"] # only the shot that was asked for
+
+    data["sh010"] = [item("a0", "v002")]
+    data_manager.save_shot_data(json_path, data)
+    assert path.stat().st_size < config.SHOT_PARTIAL_IO_BYTES
+    assert read(path) == {"sh010": [item("a0", "v002")], "sh020": original["sh020"]}
+
+    data["sh010"].append(item("c0"))
+    data_manager.save_shot_data(json_path, data)
+    assert read(path) == {"sh010": [item("a0", "v002"), item("c0")], "sh020": original["sh020"]}
+
+
+def test_compacting_a_partial_read_keeps_other_shots(data_manager, monkeypatch):
+    monkeypatch.setattr(config, "SHOT_EDIT_LOG", True)
+    path, original = multi_shot_file(data_manager, "partial_log")
+
+    json_path, data = data_manager.load_shot_data("partial_log", "sh010")
+    data["sh010"] = [item("a0", "v002")]
+    data_manager.save_shot_data(json_path, data)
+    assert log_path(path).exists()
+
+    data_manager.edit_log.compact(json_path)
+    assert not log_path(path).exists()
+    written = read(path)
+    assert written["sh010"] == [item("a0", "v002")]
+    assert written["sh020"] == original["sh020"]
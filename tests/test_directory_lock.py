@@ -0,0 +1,70 @@
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from sceneConstructorPackage.core.utils import DirectoryLock
+
+
+def test_lock_is_exclusive_and_released(tmp_path):
+    lock_path = tmp_path / "x.lock"
+    with DirectoryLock(lock_path):
+        assert (lock_path / DirectoryLock.OWNER_FILE).exists()
+        with pytest.raises(TimeoutError):
+            DirectoryLock(lock_path, timeout=0.1).acquire()
+    assert not lock_path.exists()
+
+
+def test_long_hold_is_not_broken(tmp_path):
+    lock_path = tmp_path / "x.lock"
+    holder = DirectoryLock(lock_path, stale_after=0.2)
+    holder.acquire()
+    try:
+        time.sleep(0.5) # well past stale_after, kept fresh by the heartbeat
+        with pytest.raises(TimeoutError):
+            DirectoryLock(lock_path, timeout=0.3, stale_after=0.2).acquire()
+    finally:
+        holder.release()
+
+
+def test_lock_of_a_dead_process_is_broken(tmp_path):
+    if os.name == "nt":
+        pytest.skip("owner liveness is not checked on Windows")
+    lock_path = tmp_path / "x.lock"
+    lock_path.mkdir()
+    with open(lock_path / DirectoryLock.OWNER_FILE, "w") as f:
+        # a pid above the default pid_max, so no process has it
+        json.dump({"host": socket.gethostname(), "pid": 2 ** 22 + 1}, f)
+    with DirectoryLock(lock_path, timeout=1.0):
+        pass
+
+
+def test_abandoned_lock_is_broken_after_stale_after(tmp_path):
+    lock_path = tmp_path / "x.lock"
+    lock_path.mkdir()
+    old = time.time() - 10
+    os.utime(lock_path, (old, old))
+    with DirectoryLock(lock_path, timeout=1.0, stale_after=5.0):
+        pass
+
+
+def test_threads_take_turns(tmp_path):
+    lock_path = tmp_path / "x.lock"
+    inside = []
+
+    def worker():
+        for _ in range(5):
+            with DirectoryLock(lock_path, timeout=10.0):
+                inside.append(1)
+                assert len(inside) == 1
+                inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not lock_path.exists()
@@ -0,0 +1,94 @@
+import pytest
+
+from sceneConstructorPackage.core.import_plan import (
+    ImportExecutor, StubImportExecutor, TYPE_ORDER, file_type_for, plan_imports
+)
+
+
+def item(name, path, actor_type="prop", **extra):
+    return dict(name=name, path=path, type=actor_type, **extra)
+
+
+def test_duplicates_are_imported_once():
+    plan = plan_imports("sh010", [
+        item("chair", "/pub/chair_v001.ma"),
+        item("chair", "/pub/chair_v001.ma"),
+        {"name": "ghost"},
+    ])
+    assert [step.namespace for step in plan.steps] == ["sh010_chair"]
+    assert plan.skipped == [("chair", "duplicate"), ("ghost", "missing path")]
+    assert plan.files["/pub/chair_v001.ma"]["users"] == 1
+
+
+def test_same_name_different_files_get_suffixed_namespaces():
+    plan = plan_imports("sh010", [
+        item("chair", "/pub/chair_v001.ma"),
+        item("chair", "/pub/chair_v002.ma"),
+        item("chair", "/pub/chair_v003.ma"),
+    ])
+    assert [step.namespace for step in plan.steps] == ["sh010_chair", "sh010_chair_2", "sh010_chair_3"]
+
+
+def test_shared_files_are_counted_once():
+    plan = plan_imports("sh010", [
+        item("chair", "/pub/chair.ma"),
+        item("chair_b", "/pub/chair.ma"),
+    ], size_of=lambda path: 100)
+    assert len(plan.steps) == 2
+    assert all(step.shared for step in plan.steps)
+    assert plan.total_bytes == 100
+
+
+def test_steps_follow_type_order_keeping_shot_order():
+    plan = plan_imports("sh010", [
+        item("cam", "/pub/cam.abc", "camera"),
+        item("bob", "/pub/bob.ma", "character"),
+        item("misc", "/pub/misc.obj", "asset"),
+        item("city", "/pub/city.usd", "set"),
+        item("cup", "/pub/cup.ma", "prop"),
+        item("ann", "/pub/ann.ma", "character"),
+    ])
+    assert [step.name for step in plan.steps] == ["city", "bob", "ann", "cup", "cam", "misc"]
+    ranks = [TYPE_ORDER.index(step.actor_type) for step in plan.steps if step.actor_type in TYPE_ORDER]
+    assert ranks == sorted(ranks)
+
+
+def test_file_types():
+    assert file_type_for("/a/b.MA") == "mayaAscii"
+    assert file_type_for("/a/b.usdc") == "USD Import"
+    assert file_type_for("/a/b.xyz") == "file"
+
+
+def test_stub_executor_runs_the_whole_plan():
+    plan = plan_imports("sh010", [
+        item("cup", "/pub/cup.ma"),
+        item("city", "/pub/city.usd", "set"),
+        item("cup_b", "/pub/cup.ma"),
+    ])
+    executor = StubImportExecutor(workers=2)
+    result = executor.run(plan)
+    assert result == {"imported": ["sh010_city", "sh010_cup", "sh010_cup_b"], "failed": []}
+    assert sorted(executor.fetched) == ["/pub/city.usd", "/pub/cup.ma"] # each file fetched once
+    assert executor.imported == [
+        ("sh010_city", "/pub/city.usd", "USD Import"),
+        ("sh010_cup", "/pub/cup.ma", "mayaAscii"),
+        ("sh010_cup_b", "/pub/cup.ma", "mayaAscii"),
+    ]
+
+
+def test_failed_import_does_not_stop_the_run():
+    class FailingExecutor(StubImportExecutor):
+        def import_step(self, step, local_path):
+            if step.name == "bad":
+                raise RuntimeError("boom")
+            super().import_step(step, local_path)
+
+    plan = plan_imports("sh010", [item("bad", "/pub/bad.ma"), item("good", "/pub/good.ma")])
+    result = FailingExecutor().run(plan)
+    assert result["imported"] == ["sh010_good"]
+    assert result["failed"] == [("sh010_bad", "boom")]
+
+
+def test_executor_requires_import_step():
+    with pytest.raises(TypeError):
+        ImportExecutor()
@@ -0,0 +1,40 @@
+from sceneConstructorPackage.core.publish_journal import PublishJournal
+
+
+def test_readers_only_get_what_was_appended(tmp_path):
+    journal = PublishJournal(tmp_path / ".publish_journal.jsonl")
+    assert journal.read_since(0) == ([], 0, False)
+
+    journal.append({"asset": "chair", "version": "v001"})
+    records, offset, truncated = journal.read_since(0)
+    assert [r["asset"] for r in records] == ["chair"] and not truncated
+
+    journal.append({"asset": "lamp", "version": "v001"})
+    records, offset, _ = journal.read_since(offset)
+    assert [r["asset"] for r in records] == ["lamp"]
+    assert journal.read_since(offset) == ([], offset, False)
+
+
+def test_line_in_progress_is_left_for_next_time(tmp_path):
+    journal = PublishJournal(tmp_path / ".publish_journal.jsonl")
+    journal.append({"asset": "chair"})
+    with open(journal.path, "ab") as f:
+        f.write(b'{"asset": "la')
+    records, offset, _ = journal.read_since(0)
+    assert [r["asset"] for r in records] == ["chair"]
+
+    with open(journal.path, "ab") as f:
+        f.write(b'mp"}\n')
+    records, _, _ = journal.read_since(offset)
+    assert [r["asset"] for r in records] == ["lamp"]
+
+
+def test_replaced_journal_is_read_from_the_start(tmp_path):
+    journal = PublishJournal(tmp_path / ".publish_journal.jsonl")
+    journal.append({"asset": "chair", "note": "a long note to make the first journal bigger"})
+    _, offset, _ = journal.read_since(0)
+
+    journal.path.unlink()
+    journal.append({"asset": "lamp"})
+    records, _, truncated = journal.read_since(offset)
+    assert truncated and [r["asset"] for r in records] == ["lamp"]
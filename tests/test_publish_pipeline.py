@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from sceneConstructorPackage.core.publish_manifest import (
+    STATUS_DAMAGED, STATUS_OK, check_files, read_manifest, version_status
+)
+from sceneConstructorPackage.core.publish_pipeline import PublishTransaction, file_checksum
+from sceneConstructorPackage.core.version_allocator import VersionAllocator
+
+
+@pytest.fixture
+def scratch_root(tmp_path, monkeypatch):
+    from sceneConstructorPackage import config
+    monkeypatch.setattr(config, "PUBLISH_SCRATCH_ROOT", tmp_path / "scratch")
+    monkeypatch.setattr(config, "PUBLISH_DEDUPLICATE", False)
+    return tmp_path / "scratch"
+
+
+def stage(allocator, scratch_root, content=b"geo"):
+    reservation = allocator.reserve("chair", "GEO")
+    transaction = PublishTransaction(reservation, f"chair_geo_{reservation.version}")
+    transaction.scratch_path(f"chair_geo_{reservation.version}.ma").write_bytes(content)
+    return transaction
+
+
+def test_commit_publishes_files_manifest_and_meta(tmp_path, scratch_root):
+    allocator = VersionAllocator(tmp_path / "assets")
+    transaction = stage(allocator, scratch_root)
+    meta = transaction.commit({"name": "chair", "department": "GEO", "version": "v001"})
+
+    version_dir = tmp_path / "assets" / "chair" / "GEO" / "PUBLISH" / "v001"
+    assert sorted(p.name for p in version_dir.iterdir()) == [
+        "chair_geo_v001.ma", "chair_geo_v001_manifest.json", "chair_geo_v001_meta.json"
+    ]
+    assert meta["checksums"] == {"chair_geo_v001.ma": file_checksum(version_dir / "chair_geo_v001.ma")}
+    with open(version_dir / "chair_geo_v001_meta.json") as f:
+        assert json.load(f)["checksums"] == meta["checksums"]
+    assert allocator.next_version("chair", "GEO") == 2 # reservation released, version counted
+    assert not transaction.scratch_dir.exists()
+
+    manifest = read_manifest(version_dir)
+    problems, to_hash = check_files(version_dir, manifest)
+    assert version_status(True, manifest, problems) == STATUS_OK and to_hash == ["chair_geo_v001.ma"]
+    (version_dir / "chair_geo_v001.ma").write_bytes(b"other size")
+    problems, _ = check_files(version_dir, manifest)
+    assert version_status(True, manifest, problems) == STATUS_DAMAGED
+
+
+def test_commit_refuses_to_replace_an_existing_version(tmp_path, scratch_root):
+    allocator = VersionAllocator(tmp_path / "assets")
+    transaction = stage(allocator, scratch_root)
+    transaction.final_dir.mkdir() # created by someone who did not reserve it
+
+    with pytest.raises(FileExistsError):
+        transaction.commit({"name": "chair"})
+    assert list(transaction.final_dir.iterdir()) == []
+    assert transaction.scratch_dir.exists() # the export is kept
+    assert not transaction.reservation.marker.exists()
+
+
+def test_abort_gives_the_version_back(tmp_path, scratch_root):
+    allocator = VersionAllocator(tmp_path / "assets")
+    transaction = stage(allocator, scratch_root)
+    assert allocator.next_version("chair", "GEO") == 2
+    transaction.abort()
+    assert allocator.next_version("chair", "GEO") == 1
+    assert not transaction.scratch_dir.exists()
@@ -0,0 +1,37 @@
+import threading
+
+from sceneConstructorPackage.core.save_queue import SaveQueue
+
+
+def test_burst_of_saves_is_written_once_with_the_latest_payload():
+    written = []
+    queue = SaveQueue(lambda key, payload: written.append((key, payload)), delay=0.05)
+    data = {"sh010": []}
+    for i in range(10):
+        data["sh010"].append(i)
+        queue.submit("shot.json", data)
+    data["sh010"].append("not submitted") # the queue keeps its own copy
+
+    assert queue.pending("shot.json") == {"sh010": list(range(10))}
+    assert queue.flush()
+    assert written == [("shot.json", {"sh010": list(range(10))})]
+    assert queue.pending("shot.json") is None and queue.is_idle()
+    assert queue.close()
+
+
+def test_flush_writes_now_and_reports_errors():
+    done = []
+    started = threading.Event()
+
+    def writer(key, payload):
+        started.set()
+        if key == "bad":
+            raise OSError("disk full")
+
+    queue = SaveQueue(writer, delay=60.0)
+    queue.submit("good", 1, on_done=lambda key, payload, error: done.append((key, error)))
+    queue.submit("bad", 2, on_done=lambda key, payload, error: done.append((key, str(error))))
+    assert queue.flush(timeout=5.0)
+    assert started.is_set()
+    assert sorted(done) == [("bad", "disk full"), ("good", None)]
+    queue.close()
@@ -0,0 +1,37 @@
+import json
+
+from sceneConstructorPackage.core.shot_cache import ShotDocumentCache
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_cached_document_is_served_until_the_file_changes(tmp_path):
+    path = tmp_path / "sh010.json"
+    write(path, {"sh010": []})
+    cache = ShotDocumentCache()
+    cache.put("sc01", "sh010", str(path), {"sh010": []})
+
+    _, data = cache.get("sc01", "sh010")
+    data["sh010"].append("edited by the caller")
+    assert cache.get("sc01", "sh010") == (str(path), {"sh010": []})
+
+    write(path, {"sh010": ["changed on disk, different size"]})
+    assert cache.get("sc01", "sh010") is None
+
+
+def test_least_recently_used_entry_is_dropped(tmp_path):
+    cache = ShotDocumentCache(max_entries=2)
+    for shot in ("sh010", "sh020", "sh030"):
+        write(tmp_path / shot, {})
+    cache.put("sc01", "sh010", str(tmp_path / "sh010"), {})
+    cache.put("sc01", "sh020", str(tmp_path / "sh020"), {})
+    cache.get("sc01", "sh010")
+    cache.put("sc01", "sh030", str(tmp_path / "sh030"), {})
+    assert cache.get("sc01", "sh020") is None
+    assert cache.get("sc01", "sh010") is not None
+    assert cache.get("sc01", "sh030") is not None
+    cache.put("sc01", "sh040", str(tmp_path / "missing"), {}) # nothing on disk: not cached
+    assert cache.get("sc01", "sh040") is None
@@ -0,0 +1,135 @@
+import json
+
+from sceneConstructorPackage.core.shot_cache import file_key
+from sceneConstructorPackage.core.shot_edit_log import (
+    SEQ_KEY, ShotEditLog, apply_edit, diff_shot_data, log_path, read_log, replay
+)
+from sceneConstructorPackage.core.utils import atomic_write_json
+
+
+def chair(version="v001", **extra):
+    return dict(name="chair", department="MDL", version=version, **extra)
+
+
+def lamp(version="v001"):
+    return dict(name="lamp", department="MDL", version=version)
+
+
+class Files:
+    """read_snapshot / write_snapshot over plain JSON files, counting the reads."""
+
+    def __init__(self):
+        self.reads = []
+
+    def read(self, path, keys=None):
+        self.reads.append(keys)
+        with open(path) as f:
+            data = json.load(f)
+        return data if keys is None else {k: v for k, v in data.items() if k in keys}
+
+    def write(self, path, data, partial=False):
+        if partial:
+            with open(path) as f:
+                full = json.load(f)
+            data = dict(full, **data)
+        atomic_write_json(path, data, indent=4)
+
+
+def make_log(tmp_path, data, compact_after=200):
+    path = tmp_path / "x_scene_data.json"
+    atomic_write_json(path, data, indent=4)
+    files = Files()
+    return path, files, ShotEditLog(files.read, files.write, compact_after=compact_after)
+
+
+def test_diff_then_replay_gives_the_new_data():
+    old = {"sh010": [chair(), lamp()], "sh020": [lamp()]}
+    new = {"sh010": [chair("v002"), dict(name="cup", department="MDL")], "sh030": []}
+    records = diff_shot_data(old, new)
+    assert {r["op"] for r in records} == {"replace", "remove", "add", "set", "unset"}
+
+    data = json.loads(json.dumps(old))
+    for record in records:
+        apply_edit(data, record)
+    assert data == new
+
+
+def test_reordered_list_is_set_whole():
+    old = {"sh010": [chair(), lamp()]}
+    new = {"sh010": [lamp(), chair()]}
+    assert diff_shot_data(old, new) == [{"op": "set", "key": "sh010", "value": new["sh010"]}]
+
+
+def test_replay_skips_records_already_in_the_snapshot():
+    records = [{"seq": 1, "op": "add", "key": "sh010", "item": chair()},
+               {"seq": 2, "op": "add", "key": "sh010", "item": lamp()}]
+    data = replay({"sh010": [chair()], SEQ_KEY: 1}, records)
+    assert data == {"sh010": [chair(), lamp()]}
+
+
+def test_saves_append_and_load_replays(tmp_path):
+    path, files, edit_log = make_log(tmp_path, {"sh010": [chair()]})
+    data = edit_log.load(path, files.read(path))
+
+    data["sh010"].append(lamp())
+    assert edit_log.save(path, data) == 1
+    data["sh010"][0] = chair("v002")
+    assert edit_log.save(path, data) == 1
+    assert edit_log.save(path, data) == 0 # nothing changed
+
+    with open(path) as f:
+        assert json.load(f) == {"sh010": [chair()]} # the snapshot is not rewritten
+    assert [r["seq"] for r in read_log(log_path(path))] == [1, 2]
+    assert ShotEditLog(files.read, files.write).load(path, files.read(path)) == {"sh010": [chair("v002"), lamp()]}
+
+
+def test_first_save_after_load_does_not_read_the_snapshot_again(tmp_path):
+    path, files, edit_log = make_log(tmp_path, {"sh010": [chair()], SEQ_KEY: 7})
+    snapshot_key = file_key(path)
+    data = edit_log.load(path, files.read(path), snapshot_key=snapshot_key)
+    files.reads.clear()
+
+    data["sh010"].append(lamp())
+    edit_log.save(path, data)
+    assert files.reads == []
+    assert [r["seq"] for r in read_log(log_path(path))] == [8] # continues after the snapshot's seq
+
+
+def test_compaction_folds_the_log_into_the_snapshot(tmp_path):
+    path, files, edit_log = make_log(tmp_path, {"sh010": [chair()], "sh020": [lamp()]})
+    data = edit_log.load(path, files.read(path))
+    data["sh010"].append(lamp())
+    edit_log.save(path, data)
+    data["sh010"].pop(0)
+    edit_log.save(path, data)
+
+    edit_log.compact(path)
+    assert not log_path(path).exists()
+    with open(path) as f:
+        assert json.load(f) == {"sh010": [lamp()], "sh020": [lamp()], SEQ_KEY: 2}
+
+    # the next edit continues the sequence, so replay does not skip it as already folded in
+    data["sh020"] = []
+    edit_log.save(path, data)
+    assert [r["seq"] for r in read_log(log_path(path))] == [3]
+    assert ShotEditLog(files.read, files.write).load(path, files.read(path)) == {"sh010": [lamp()], "sh020": []}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path, files, edit_log = make_log(tmp_path, {"sh010": []})
+    data = edit_log.load(path, files.read(path))
+    data["sh010"].append(chair())
+    edit_log.save(path, data)
+    with open(log_path(path), "a") as f:
+        f.write('{"seq": 2, "op": "add", "key": "sh0')
+    assert ShotEditLog(files.read, files.write).load(path, files.read(path)) == {"sh010": [chair()]}
+
+
+def test_compaction_of_a_removed_key_rewrites_the_whole_file(tmp_path):
+    path, files, edit_log = make_log(tmp_path, {"sh010": [chair()], "sh020": [lamp()]})
+    data = edit_log.load(path, files.read(path))
+    del data["sh020"]
+    edit_log.save(path, data)
+    edit_log.compact(path)
+    with open(path) as f:
+        assert json.load(f) == {"sh010": [chair()], SEQ_KEY: 1}
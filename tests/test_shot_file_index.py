@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from sceneConstructorPackage.core.shot_file_index import ShotFileIndex, index_path, scan_top_level
+
+
+def item(name, **extra):
+    return dict(name=name, department="MDL", version="v001", path=f"/pub/{name}.ma", **extra)
+
+
+def shots(count):
+    return {f"sh{i:03d}": [item(f"asset{i}_{j}") for j in range(3)] for i in range(count)}
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def dumped(data):
+    return json.dumps(data, indent=4).encode("utf-8")
+
+
+def test_scan_finds_the_value_of_every_key():
+    data = {"a": [1, {"b": "}"}], "né": "x", "c": None}
+    raw = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+    spans, end = scan_top_level(raw)
+    assert {key: json.loads(raw[s:e]) for key, (s, e) in spans.items()} == data
+    assert raw[end:end + 1] == b"}"
+    with pytest.raises(ValueError):
+        scan_top_level(b"[1, 2]")
+
+
+def test_read_returns_only_the_requested_shots(tmp_path):
+    path = tmp_path / "scene_data.json"
+    data = shots(50)
+    write(path, data)
+    index = ShotFileIndex()
+    assert index.read(path, ["sh007", "missing"]) == {"sh007": data["sh007"]}
+    assert index_path(path).exists()
+    # a new index (next session) uses the sidecar
+    assert ShotFileIndex().read(path, ["sh049"]) == {"sh049": data["sh049"]}
+
+
+@pytest.mark.parametrize("values", [
+    {"sh010": []},
+    {"sh010": [item("chair", note="déjà vu")], "sh020": [item("lamp")]},
+    {"sh999": [item("new shot")]},
+    {"sh000": [item("first")], "sh049": [], "sh050": [item("appended")], "sh051": []},
+])
+def test_replace_matches_json_dump_byte_for_byte(tmp_path, values):
+    path = tmp_path / "scene_data.json"
+    data = shots(50)
+    write(path, data)
+    index = ShotFileIndex()
+    index.spans(path)
+
+    index.replace(path, values, indent=4)
+    data.update(values)
+    assert path.read_bytes() == dumped(data)
+
+    # the index written by replace() is right without a rescan
+    assert index.read(path, list(values)) == values
+    assert ShotFileIndex().read(path, ["sh001"]) == {"sh001": data["sh001"]}
+
+
+def test_replace_into_an_empty_file(tmp_path):
+    path = tmp_path / "scene_data.json"
+    write(path, {})
+    ShotFileIndex().replace(path, {"sh010": [item("chair")]}, indent=4)
+    assert path.read_bytes() == dumped({"sh010": [item("chair")]})
+
+
+def test_stale_sidecar_is_ignored(tmp_path):
+    path = tmp_path / "scene_data.json"
+    write(path, shots(5))
+    ShotFileIndex().spans(path)
+    write(path, {"other": [item("rewritten by another tool, without the index")]})
+    assert ShotFileIndex().read(path, ["other", "sh001"]) == {"other": [item("rewritten by another tool, without the index")]}
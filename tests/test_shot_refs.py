@@ -0,0 +1,51 @@
+from sceneConstructorPackage.core.shot_refs import (
+    FORMAT_KEY, FORMAT_REFS, compact_shot_data, expand_shot_data, file_format
+)
+
+METAS = {
+    ("chair", "MDL", "v003"): {"name": "chair", "department": "MDL", "version": "v003", "type": "prop",
+                               "path": "/pub/chair_v003.ma", "author": "ann", "note": "final"},
+    ("lamp", "MDL", "v001"): {"name": "lamp", "department": "MDL", "version": "v001", "type": "prop",
+                              "path": "/pub/lamp_v001.ma", "author": "bob", "note": ""},
+}
+
+
+def resolve(keys):
+    resolve.calls.append(list(keys))
+    return {key: dict(METAS[key]) for key in keys if key in METAS}
+
+
+def full_data():
+    return {
+        "sh010": [dict(METAS[("chair", "MDL", "v003")]),
+                  dict(METAS[("lamp", "MDL", "v001")], note="shot override")],
+        "sh020": [{"name": "ghost", "department": "MDL", "version": "v001", "path": "/old/ghost.ma"}],
+        "notes": "not a shot list",
+    }
+
+
+def test_round_trip_keeps_everything():
+    resolve.calls = []
+    full = full_data()
+    compact = compact_shot_data(full, resolve)
+    assert file_format(compact) == FORMAT_REFS
+    assert compact["sh010"] == [
+        {"name": "chair", "department": "MDL", "version": "v003"},
+        {"name": "lamp", "department": "MDL", "version": "v001", "note": "shot override"},
+    ]
+    assert compact["sh020"] == full["sh020"] # unresolvable: kept in full
+
+    resolve.calls = []
+    assert expand_shot_data(compact, resolve) == full
+    assert len(resolve.calls) == 1 # one bulk lookup for the whole file
+
+
+def test_full_format_is_read_unchanged():
+    full = full_data()
+    assert file_format(full) != FORMAT_REFS
+    assert expand_shot_data(full, resolve) is full
+
+
+def test_unresolved_reference_is_kept():
+    compact = {FORMAT_KEY: FORMAT_REFS, "sh010": [{"name": "gone", "department": "MDL", "version": "v001"}]}
+    assert expand_shot_data(compact, resolve) == {"sh010": [{"name": "gone", "department": "MDL", "version": "v001"}]}
@@ -0,0 +1,57 @@
+import json
+import os
+import socket
+import time
+
+import pytest
+
+from sceneConstructorPackage.core.utils import DirectoryLock
+from sceneConstructorPackage.core.version_allocator import VersionAllocator
+
+
+def leave_reservation(allocator, number, pid=None, age=0.0):
+    """A .vNNN.reserved marker as a crashed publish leaves it."""
+    marker = allocator.publish_dir("chair", "GEO") / f".v{number:03d}.reserved"
+    marker.mkdir(parents=True)
+    owner_path = marker / DirectoryLock.OWNER_FILE
+    with open(owner_path, "w") as f:
+        json.dump({"host": socket.gethostname(), "pid": os.getpid() if pid is None else pid}, f)
+    if age:
+        old = time.time() - age
+        os.utime(owner_path, (old, old))
+    return marker
+
+
+def test_live_reservation_is_skipped(tmp_path):
+    allocator = VersionAllocator(tmp_path)
+    with allocator.reserve("chair", "GEO") as first:
+        assert first.version == "v001"
+        with allocator.reserve("chair", "GEO") as second:
+            assert second.version == "v002"
+    assert allocator.next_version("chair", "GEO") == 1
+
+
+def test_reservation_of_a_dead_process_is_reused(tmp_path):
+    if os.name == "nt":
+        pytest.skip("owner liveness is not checked on Windows")
+    allocator = VersionAllocator(tmp_path)
+    # a pid above the default pid_max, so no process has it
+    marker = leave_reservation(allocator, 1, pid=2 ** 22 + 1)
+    assert allocator.next_version("chair", "GEO") == 1
+    with allocator.reserve("chair", "GEO") as reservation:
+        assert reservation.version == "v001"
+        assert marker.exists()
+    assert not marker.exists()
+
+
+def test_abandoned_reservation_is_reused_after_the_timeout(tmp_path, monkeypatch):
+    from sceneConstructorPackage import config
+    monkeypatch.setattr(config, "PUBLISH_RESERVATION_STALE_SECONDS", 5.0)
+    allocator = VersionAllocator(tmp_path)
+    leave_reservation(allocator, 1, age=1.0)
+    assert allocator.next_version("chair", "GEO") == 2 # still fresh
+
+    leave_reservation(allocator, 2, age=10.0)
+    assert allocator.next_version("chair", "GEO") == 2
+    with allocator.reserve("chair", "GEO") as reservation:
+        assert reservation.version == "v002"
@@ -0,0 +1,24 @@
+from sceneConstructorPackage.core.version_index import VersionIndex, parse_version, sort_versions
+
+
+def test_versions_sort_numerically():
+    assert sort_versions(["v1000", "v999", "v010", "v9", "backup"]) == ["backup", "v9", "v010", "v999", "v1000"]
+    assert parse_version("v012") == 12
+    assert parse_version("v012_old") is None
+
+
+def test_index_updates_without_relisting():
+    index = VersionIndex()
+    index.load({("chair", "GEO"): ["v002", "v010", "v001"]})
+    assert index.latest("chair", "GEO") == "v010"
+
+    index.add_version("chair", "GEO", "v011")
+    index.add_version("chair", "GEO", "v011")
+    assert index.get_versions("chair", "GEO") == ["v001", "v002", "v010", "v011"]
+
+    index.set_versions("chair", "RIG", ["v001"])
+    index.invalidate("chair", "GEO")
+    assert index.get_versions("chair", "GEO") is None
+    assert index.get_versions("chair", "RIG") == ["v001"]
+    index.invalidate("chair")
+    assert index.latest("chair", "RIG") is None